@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Activity Sampler Module
+Polls the pointer position at a fixed rate into a ring buffer and summarizes the movement
+"""
+import math
+import time
+from array import array
+from clock import SYSTEM_CLOCK
+from metrics import POSITION_LATENCY
+
+
+class PositionRingBuffer:
+    """Fixed-size ring buffer of (timestamp, x, y) samples backed by typed arrays"""
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize the buffer
+        :param capacity: Maximum number of samples kept (oldest overwritten first)
+        """
+        if capacity < 2:
+            raise ValueError("Ring buffer capacity must be at least 2")
+        self.capacity = capacity
+        self.times = array('d', [0.0]) * capacity
+        self.xs = array('l', [0]) * capacity
+        self.ys = array('l', [0]) * capacity
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, x, y):
+        """
+        Store a sample, overwriting the oldest one when full
+        :param timestamp: Monotonic timestamp of the sample
+        :param x: X coordinate
+        :param y: Y coordinate
+        """
+        i = self._next
+        self.times[i] = timestamp
+        self.xs[i] = x
+        self.ys[i] = y
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        """Forget all samples (storage is reused)"""
+        self._next = 0
+        self._count = 0
+
+    def _indices(self):
+        """Buffer indices from oldest to newest sample"""
+        start = (self._next - self._count) % self.capacity
+        return [(start + k) % self.capacity for k in range(self._count)]
+
+    def samples(self):
+        """
+        Get stored samples from oldest to newest
+        :return: List of (timestamp, x, y) tuples
+        """
+        return [(self.times[i], self.xs[i], self.ys[i]) for i in self._indices()]
+
+    def latest(self):
+        """
+        Get the newest sample
+        :return: Tuple (timestamp, x, y) or None when empty
+        """
+        if self._count == 0:
+            return None
+        i = (self._next - 1) % self.capacity
+        return (self.times[i], self.xs[i], self.ys[i])
+
+    def last_change_time(self):
+        """
+        Get the timestamp of the newest sample whose position differs from the sample before it
+        :return: Monotonic timestamp, or None if the position never changed
+        """
+        indices = self._indices()
+        xs, ys = self.xs, self.ys
+        for k in range(len(indices) - 1, 0, -1):
+            i, prev = indices[k], indices[k - 1]
+            if xs[i] != xs[prev] or ys[i] != ys[prev]:
+                return self.times[i]
+        return None
+
+    def stats(self, since=None):
+        """
+        Summarize movement over the stored samples, relative to the oldest one
+        :param since: Optional monotonic time; only movement after it is measured, relative to the
+                      newest sample taken at or before it
+        :return: Dictionary with samples, path_length, max_displacement, net_displacement and span_seconds
+        """
+        indices = self._indices()
+        if since is not None:
+            times = self.times
+            for k in range(len(indices) - 1, 0, -1):
+                if times[indices[k]] <= since:
+                    indices = indices[k:]
+                    break
+        if not indices:
+            return {'samples': 0, 'path_length': 0.0, 'max_displacement': 0.0,
+                    'net_displacement': 0.0, 'span_seconds': 0.0}
+
+        xs, ys = self.xs, self.ys
+        first = indices[0]
+        ref_x, ref_y = xs[first], ys[first]
+        prev_x, prev_y = ref_x, ref_y
+        path_length = 0.0
+        max_displacement_sq = 0
+        for i in indices:
+            x, y = xs[i], ys[i]
+            if x != prev_x or y != prev_y:
+                path_length += math.hypot(x - prev_x, y - prev_y)
+                displacement_sq = (x - ref_x) ** 2 + (y - ref_y) ** 2
+                if displacement_sq > max_displacement_sq:
+                    max_displacement_sq = displacement_sq
+                prev_x, prev_y = x, y
+
+        last = indices[-1]
+        return {
+            'samples': len(indices),
+            'path_length': path_length,
+            'max_displacement': math.sqrt(max_displacement_sq),
+            'net_displacement': math.hypot(xs[last] - ref_x, ys[last] - ref_y),
+            'span_seconds': self.times[last] - self.times[first]
+        }
+
+
+class ActivitySampler:
+    """Samples the pointer position at a configurable rate between activity checks"""
+
+    def __init__(self, backend, sample_rate=2.0, capacity=1024, clock=None):
+        """
+        Initialize the sampler
+        :param backend: PointerBackend to read positions from
+        :param sample_rate: Samples per second
+        :param capacity: Ring buffer capacity in samples
+        :param clock: Time source for sample timestamps (default: the system clock)
+        """
+        if sample_rate <= 0:
+            raise ValueError("Sample rate must be positive")
+        self.backend = backend
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.sample_rate = sample_rate
+        self.sample_interval = 1.0 / sample_rate
+        self.buffer = PositionRingBuffer(capacity)
+        self.total_samples = 0
+
+    def start_window(self, reference_pos):
+        """
+        Start a new observation window
+        :param reference_pos: Position tuple (x, y) the window is measured from
+        """
+        self.buffer.clear()
+        self.buffer.append(self.clock.monotonic(), reference_pos[0], reference_pos[1])
+
+    def resize(self, capacity):
+        """
+        Change the ring buffer capacity, keeping the newest samples of the current window
+        :param capacity: New capacity in samples
+        """
+        samples = self.buffer.samples()
+        self.buffer = PositionRingBuffer(capacity)
+        for timestamp, x, y in samples[-capacity:]:
+            self.buffer.append(timestamp, x, y)
+
+    def sample(self):
+        """
+        Take one position sample
+        :return: Position tuple (x, y)
+        """
+        started = time.perf_counter()
+        x, y = self.backend.position()
+        POSITION_LATENCY.observe(time.perf_counter() - started)
+        self.buffer.append(self.clock.monotonic(), x, y)
+        self.total_samples += 1
+        return (x, y)
+
+    def window_stats(self, horizon=None):
+        """
+        Summarize movement in the current window
+        :param horizon: Optional number of seconds; only the last horizon seconds of the window are measured
+        :return: Dictionary from PositionRingBuffer.stats()
+        """
+        if horizon is None:
+            return self.buffer.stats()
+        return self.buffer.stats(since=self.clock.monotonic() - horizon)
+
+    def last_movement_time(self):
+        """
+        Get the time the position last changed within the current window
+        :return: Monotonic timestamp (of the clock), or None if the pointer has not moved
+        """
+        return self.buffer.last_change_time()
+
+
+def window_capacity(check_interval_seconds, sample_rate, slack=2):
+    """
+    Ring buffer capacity that holds a whole check window
+    :param check_interval_seconds: Seconds between activity checks
+    :param sample_rate: Samples per second
+    :param slack: Extra samples (reference sample, rounding)
+    :return: Capacity in samples
+    """
+    return max(2, int(math.ceil(check_interval_seconds * sample_rate)) + slack)
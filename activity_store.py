@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Activity Store Module
+Bounded history of check outcomes (manual movement, auto-move, alarm, dings) with automatic
+per-minute/hour/day rollups, answering questions like "how idle was this desk between 2pm and
+4pm" without scanning logs.
+
+Raw events go into a ring buffer of typed arrays, and each event is also added to the current
+bucket of every rollup tier, itself a ring buffer. Memory therefore stays constant however long
+the mover runs, and a query uses the finest level that still covers the requested range.
+
+File layout (columnar, little-endian): a header (magic b'PMAS', format version, table count, UTC
+offset of the bucket boundaries) followed by tables; each table is its name, bucket seconds (0 for
+raw events), capacity, evicted row count, row count and column count, then each column as its name,
+array typecode, item size and the raw values of every row from oldest to newest.
+"""
+import os
+import struct
+import sys
+import time
+from array import array
+
+MAGIC = b'PMAS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHi')
+TABLE_HEADER = struct.Struct('<dIQIH')
+COLUMN_HEADER = struct.Struct('<cB')
+
+# Event kinds, in the order of their codes in the 'kind' column
+KINDS = ('manual', 'auto_move', 'alarm', 'dings')
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+EVENT_COLUMNS = (('time', 'd'), ('kind', 'B'), ('count', 'H'))
+BUCKET_COLUMNS = (('start', 'd'),) + tuple((kind, 'I') for kind in KINDS)
+
+DEFAULT_EVENT_CAPACITY = 20000
+# Rollup tiers as (name, bucket seconds, buckets kept): 2 days of minutes, 90 days of hours, 10 years of days
+TIERS = (
+    ('minute', 60, 2 * 1440),
+    ('hour', 3600, 90 * 24),
+    ('day', 86400, 3660),
+)
+# Seconds between saves of a store opened from a file, while a mover runs
+SAVE_INTERVAL_SECONDS = 600
+
+
+class ColumnRing:
+    """Fixed-size ring buffer of rows stored as one typed array per column"""
+
+    def __init__(self, columns, capacity):
+        """
+        Initialize the buffer
+        :param columns: Sequence of (name, array typecode)
+        :param capacity: Maximum number of rows kept (oldest overwritten first)
+        :raises ValueError: If capacity is less than 1
+        """
+        if capacity < 1:
+            raise ValueError("Ring capacity must be at least 1")
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self.arrays = {name: array(typecode, [0]) * capacity for name, typecode in self.columns}
+        self.evicted = 0
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, *values):
+        """
+        Store a row, overwriting the oldest one when full
+        :param values: One value per column, in column order
+        """
+        i = self._next
+        for (name, _), value in zip(self.columns, values):
+            self.arrays[name][i] = value
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self.evicted += 1
+
+    def last_index(self):
+        """
+        Array index of the newest row
+        :return: Index, or None when empty
+        """
+        if self._count == 0:
+            return None
+        return (self._next - 1) % self.capacity
+
+    def indices(self):
+        """Array indices from oldest to newest row"""
+        start = (self._next - self._count) % self.capacity
+        return [(start + k) % self.capacity for k in range(self._count)]
+
+    def oldest(self, name):
+        """
+        Value of a column in the oldest row
+        :param name: Column name
+        :return: Value, or None when empty
+        """
+        if self._count == 0:
+            return None
+        return self.arrays[name][(self._next - self._count) % self.capacity]
+
+    def column(self, name):
+        """
+        Values of a column from oldest to newest row
+        :param name: Column name
+        :return: array of the column's type
+        """
+        values = self.arrays[name]
+        return array(values.typecode, [values[i] for i in self.indices()])
+
+
+def _empty_totals():
+    return dict.fromkeys(KINDS, 0)
+
+
+class ActivityStore:
+    """Constant-memory activity history with minute/hour/day rollups"""
+
+    def __init__(self, event_capacity=DEFAULT_EVENT_CAPACITY, tiers=TIERS, utc_offset=None, path=None):
+        """
+        Initialize an empty store
+        :param event_capacity: Raw events kept
+        :param tiers: Sequence of (name, bucket seconds, buckets kept), finest first
+        :param utc_offset: Seconds east of UTC that bucket boundaries align to (default: the local time zone)
+        :param path: File used by save() without a path (see open())
+        """
+        self.utc_offset = time.localtime().tm_gmtoff if utc_offset is None else utc_offset
+        self.events = ColumnRing(EVENT_COLUMNS, event_capacity)
+        self.tiers = {name: (seconds, ColumnRing(BUCKET_COLUMNS, buckets)) for name, seconds, buckets in tiers}
+        self.path = path
+
+    def _bucket_start(self, timestamp, seconds):
+        local = timestamp + self.utc_offset
+        return local - local % seconds - self.utc_offset
+
+    def record(self, kind, timestamp, count=1):
+        """
+        Record an event
+        :param kind: 'manual', 'auto_move', 'alarm' or 'dings'
+        :param timestamp: Wall-clock time (Unix seconds)
+        :param count: Number of dings for 'dings', otherwise 1
+        :raises ValueError: If the kind is unknown
+        """
+        code = _KIND_CODES.get(kind)
+        if code is None:
+            raise ValueError(f"Unknown activity kind '{kind}' (available: {', '.join(KINDS)})")
+        self.events.append(timestamp, code, count)
+        for seconds, ring in self.tiers.values():
+            start = self._bucket_start(timestamp, seconds)
+            i = ring.last_index()
+            # Events from a clock that went backwards count towards the newest bucket
+            if i is None or start > ring.arrays['start'][i]:
+                ring.append(start, 0, 0, 0, 0)
+                i = ring.last_index()
+            ring.arrays[kind][i] += count
+
+    def resolution(self, start=None):
+        """
+        Finest level that still holds everything from start on
+        :param start: Wall-clock time, or None for the whole history
+        :return: 'events' or a tier name
+        """
+        events = self.events
+        if events.evicted == 0 or (start is not None and events.oldest('time') <= start):
+            return 'events'
+        for name, (_, ring) in self.tiers.items():
+            if ring.evicted == 0 or (start is not None and ring.oldest('start') <= start):
+                return name
+        return name
+
+    def totals(self, start=None, end=None):
+        """
+        Event counts between two times, from raw events where they reach back far enough and from the
+        finest covering rollup otherwise (buckets overlapping the range count in full)
+        :param start: Wall-clock time to count from (None = oldest data)
+        :param end: Wall-clock time to count until, exclusive (None = now)
+        :return: Dictionary with checks, manual, auto_move, alarm, dings, idle_fraction and resolution
+        """
+        level = self.resolution(start)
+        lower = float('-inf') if start is None else start
+        upper = float('inf') if end is None else end
+        totals = _empty_totals()
+        if level == 'events':
+            times, kinds, counts = (self.events.arrays[name] for name, _ in EVENT_COLUMNS)
+            for i in self.events.indices():
+                if lower <= times[i] < upper:
+                    totals[KINDS[kinds[i]]] += counts[i]
+        else:
+            seconds, ring = self.tiers[level]
+            starts = ring.arrays['start']
+            for i in ring.indices():
+                if starts[i] < upper and starts[i] + seconds > lower:
+                    for kind in KINDS:
+                        totals[kind] += ring.arrays[kind][i]
+        checks = totals['manual'] + totals['auto_move']
+        totals.update(checks=checks, idle_fraction=totals['auto_move'] / checks if checks else 0.0,
+                      resolution=level)
+        return totals
+
+    def buckets(self, tier, start=None, end=None):
+        """
+        Rollup buckets of one tier
+        :param tier: Tier name ('minute', 'hour', 'day')
+        :param start: Wall-clock time of the first bucket to include (None = oldest)
+        :param end: Wall-clock time to stop at, exclusive (None = newest)
+        :return: List of dictionaries (start plus one count per kind)
+        :raises ValueError: If the tier is unknown
+        """
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown tier '{tier}' (available: {', '.join(self.tiers)})")
+        seconds, ring = self.tiers[tier]
+        lower = float('-inf') if start is None else start
+        upper = float('inf') if end is None else end
+        rows = []
+        for i in ring.indices():
+            bucket_start = ring.arrays['start'][i]
+            if bucket_start < upper and bucket_start + seconds > lower:
+                rows.append({name: ring.arrays[name][i] for name, _ in BUCKET_COLUMNS})
+        return rows
+
+    def summary(self, start=None, end=None):
+        """Short human readable summary of totals()"""
+        totals = self.totals(start, end)
+        return (f"{totals['checks']} checks ({totals['manual']} manual, {totals['auto_move']} auto-moves, "
+                f"{100.0 * totals['idle_fraction']:.0f}% idle), {totals['alarm']} alarms, {totals['dings']} dings")
+
+    def _tables(self):
+        yield 'events', 0.0, self.events
+        for name, (seconds, ring) in self.tiers.items():
+            yield name, float(seconds), ring
+
+    def save(self, path=None):
+        """
+        Write the store to a columnar file (atomically replaced)
+        :param path: Output file (default: the path the store was opened from)
+        :raises ValueError: If no path is given or known
+        :raises OSError: If the file cannot be written
+        """
+        path = path if path is not None else self.path
+        if path is None:
+            raise ValueError("No activity file to save to")
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 1 + len(self.tiers), self.utc_offset))
+            for name, seconds, ring in self._tables():
+                encoded = name.encode('utf-8')
+                f.write(struct.pack('<B', len(encoded)) + encoded)
+                f.write(TABLE_HEADER.pack(seconds, ring.capacity, ring.evicted, len(ring), len(ring.columns)))
+                for column, typecode in ring.columns:
+                    values = ring.column(column)
+                    if sys.byteorder == 'big':
+                        values.byteswap()
+                    encoded = column.encode('utf-8')
+                    f.write(struct.pack('<B', len(encoded)) + encoded)
+                    f.write(COLUMN_HEADER.pack(typecode.encode('ascii'), values.itemsize))
+                    f.write(values.tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a store written by save()
+        :param path: Activity file
+        :return: ActivityStore (path set, so save() writes back to it)
+        :raises ValueError: If the file is not a valid activity file
+        :raises OSError: If the file cannot be read
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            magic, version, table_count, utc_offset = HEADER.unpack_from(data, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not an activity file")
+            if version != VERSION:
+                raise ValueError(f"{path}: unsupported activity file version {version}")
+            offset = HEADER.size
+            tables = []
+            for _ in range(table_count):
+                name, offset = _read_name(data, offset)
+                seconds, capacity, evicted, rows, column_count = TABLE_HEADER.unpack_from(data, offset)
+                offset += TABLE_HEADER.size
+                columns = []
+                for _ in range(column_count):
+                    column, offset = _read_name(data, offset)
+                    typecode, itemsize = COLUMN_HEADER.unpack_from(data, offset)
+                    offset += COLUMN_HEADER.size
+                    values = array(typecode.decode('ascii'))
+                    if values.itemsize != itemsize:
+                        raise ValueError(f"{path}: column {column} has {itemsize}-byte values, "
+                                         f"{values.itemsize} expected on this platform")
+                    values.frombytes(data[offset:offset + rows * itemsize])
+                    if len(values) != rows:
+                        raise ValueError(f"{path}: truncated column {column}")
+                    offset += rows * itemsize
+                    if sys.byteorder == 'big':
+                        values.byteswap()
+                    columns.append((column, values))
+                tables.append((name, seconds, capacity, evicted, columns))
+        except struct.error:
+            raise ValueError(f"{path}: truncated activity file")
+
+        events_table = tables[0]
+        store = cls(event_capacity=events_table[2],
+                    tiers=[(name, int(seconds), capacity) for name, seconds, capacity, _, _ in tables[1:]],
+                    utc_offset=utc_offset, path=path)
+        for (_, _, _, evicted, columns), (_, _, ring) in zip(tables, store._tables()):
+            if tuple(name for name, _ in columns) != tuple(name for name, _ in ring.columns):
+                raise ValueError(f"{path}: unexpected columns")
+            for row in zip(*(values for _, values in columns)):
+                ring.append(*row)
+            ring.evicted = evicted
+        return store
+
+    @classmethod
+    def open(cls, path):
+        """
+        Load a store from a file, or start an empty one that save() will write there
+        :param path: Activity file
+        :return: ActivityStore
+        :raises ValueError: If the file exists but is not a valid activity file
+        :raises OSError: If the file exists but cannot be read
+        """
+        if os.path.exists(path):
+            return cls.load(path)
+        return cls(path=path)
+
+
+def _read_name(data, offset):
+    """Read a length-prefixed UTF-8 name, returning it and the offset after it"""
+    length = data[offset]
+    offset += 1
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+def parse_time(text):
+    """
+    Parse a local time for queries
+    :param text: 'HH:MM' (today) or an ISO date/time such as '2026-10-16 14:00'
+    :return: Wall-clock time (Unix seconds)
+    :raises ValueError: If the text is not a time
+    """
+    from datetime import datetime
+    if len(text) <= 5 and ':' in text:
+        hours, minutes = (int(part) for part in text.split(':'))
+        return datetime.now().replace(hour=hours, minute=minutes, second=0, microsecond=0).timestamp()
+    return datetime.fromisoformat(text).timestamp()
+
+
+def main():
+    """Query an activity file written by auto_mouse_mover.py --activity-file"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Query an activity file written by auto_mouse_mover.py --activity-file',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # How idle was the desk between 2pm and 4pm today?
+  python activity_store.py ~/.auto_mouse_mover.activity --from 14:00 --to 16:00
+
+  # Hourly buckets of one day as CSV
+  python activity_store.py activity.pmas --from 2026-10-16 --to 2026-10-17 --buckets hour --csv
+        '''
+    )
+    parser.add_argument('file', help='Activity file')
+    parser.add_argument('--from', dest='start', default=None, help="Start time ('HH:MM' today, or ISO date/time)")
+    parser.add_argument('--to', dest='end', default=None, help="End time, exclusive ('HH:MM' today, or ISO date/time)")
+    parser.add_argument('--buckets', choices=[name for name, _, _ in TIERS], default=None,
+                        help='List the rollup buckets of this tier instead of totals')
+    parser.add_argument('--csv', action='store_true', help='Print buckets as CSV')
+    args = parser.parse_args()
+
+    try:
+        store = ActivityStore.load(args.file)
+        start = parse_time(args.start) if args.start is not None else None
+        end = parse_time(args.end) if args.end is not None else None
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.buckets is None:
+        totals = store.totals(start, end)
+        print(f"{store.summary(start, end)} [from {totals['resolution']}]")
+        return
+
+    rows = store.buckets(args.buckets, start, end)
+    if args.csv:
+        print(','.join(name for name, _ in BUCKET_COLUMNS))
+        for row in rows:
+            print(','.join(str(row[name]) for name, _ in BUCKET_COLUMNS))
+        return
+    for row in rows:
+        checks = row['manual'] + row['auto_move']
+        idle = f"{100.0 * row['auto_move'] / checks:3.0f}% idle" if checks else "   no checks"
+        print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(row['start']))}  {idle}  "
+              f"{row['manual']:>4} manual {row['auto_move']:>4} auto {row['alarm']:>3} alarms {row['dings']:>4} dings")
+
+
+if __name__ == "__main__":
+    main()
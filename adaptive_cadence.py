@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Adaptive Cadence Module
+Chooses check and sample intervals from recent activity so idle and busy desktops wake up less often
+"""
+
+
+class AdaptiveCadence:
+    """
+    Check/sample interval policy for AutoMouseMover.
+
+    - While the user is active, checks back off by BACKOFF_FACTOR per active check up to
+      max_check_interval (but always leave room to see manual movement before the alarm is due).
+      Sparse samples (max_sample_interval apart) keep track of the last movement, and sampling aims at
+      idle_deadline() so the mover can check early once the user has gone idle for min_check_interval.
+    - While idle, checks run at min_check_interval (the configured auto-move cadence), and
+      samples tighten from max_sample_interval towards min_sample_interval as the check nears.
+    """
+
+    BACKOFF_FACTOR = 1.5
+    # Share of the time left until the check used as the next sample interval
+    LEAD_FRACTION = 0.25
+
+    def __init__(self, min_check_interval, max_check_interval, min_sample_interval, max_sample_interval):
+        """
+        Initialize the policy
+        :param min_check_interval: Check interval while idle (seconds)
+        :param max_check_interval: Longest check interval while active (seconds)
+        :param min_sample_interval: Shortest sample interval (seconds)
+        :param max_sample_interval: Longest sample interval (seconds)
+        :raises ValueError: If a minimum exceeds its maximum
+        """
+        if min_check_interval > max_check_interval:
+            raise ValueError("min_check_interval must not exceed max_check_interval")
+        if min_sample_interval > max_sample_interval:
+            raise ValueError("min_sample_interval must not exceed max_sample_interval")
+        self.min_check_interval = min_check_interval
+        self.max_check_interval = max_check_interval
+        self.min_sample_interval = min_sample_interval
+        self.max_sample_interval = max_sample_interval
+        self.check_interval = min_check_interval
+        self.wakeups = 0
+        self.started_at = None
+        self.last_movement = None
+
+    @classmethod
+    def for_mover(cls, check_interval_seconds, sample_rate, max_check_factor=4.0, max_sample_interval=None):
+        """
+        Policy derived from a mover's fixed settings
+        :param check_interval_seconds: Fixed check interval, used as the idle check interval
+        :param sample_rate: Fixed sample rate, used as the fastest sample rate
+        :param max_check_factor: Longest active check interval as a multiple of the fixed one
+        :param max_sample_interval: Longest sample interval (default: a quarter of the check interval)
+        :return: AdaptiveCadence
+        """
+        min_sample_interval = 1.0 / sample_rate
+        if max_sample_interval is None:
+            max_sample_interval = max(min_sample_interval, check_interval_seconds / 4)
+        return cls(check_interval_seconds, check_interval_seconds * max_check_factor,
+                   min_sample_interval, max(min_sample_interval, max_sample_interval))
+
+    def start(self, now):
+        """
+        Start counting wakeups
+        :param now: Current monotonic time
+        """
+        self.started_at = now
+        self.wakeups = 0
+        self.check_interval = self.min_check_interval
+        self.last_movement = None
+
+    def idle_deadline(self):
+        """
+        Time by which the user has been idle for a whole idle check interval
+        :return: Monotonic time (last_movement + min_check_interval), or None before any movement was seen
+        """
+        if self.last_movement is None:
+            return None
+        return self.last_movement + self.min_check_interval
+
+    def next_check_interval(self, moved, now, alarm_deadline):
+        """
+        Interval until the next check
+        :param moved: Whether the check that just ran saw manual movement
+        :param now: Current monotonic time
+        :param alarm_deadline: Monotonic time the alarm is next due
+        :return: Seconds
+        """
+        if moved:
+            self.check_interval = min(self.max_check_interval, self.check_interval * self.BACKOFF_FACTOR)
+        else:
+            self.check_interval = self.min_check_interval
+            self.last_movement = None
+        interval = self.check_interval
+        # Backing off must not let the alarm fire before the next check could record manual movement
+        until_alarm = alarm_deadline - now - self.min_sample_interval
+        if interval > until_alarm:
+            interval = max(self.min_check_interval, until_alarm)
+        return interval
+
+    def next_sample_interval(self, window_active, until_check, until_idle=None):
+        """
+        Interval until the next sample
+        :param window_active: Whether the current window already shows manual movement
+        :param until_check: Seconds until the next check
+        :param until_idle: Optional seconds until idle_deadline(); sampling aims at it like at a check
+        :return: Seconds (>= until_check means no sample is needed before the check)
+        """
+        target = until_check
+        if until_idle is not None and 0 < until_idle < until_check:
+            target = until_idle
+        if window_active:
+            # Sparse samples keep noticing movement until the target
+            return min(self.max_sample_interval, max(self.min_sample_interval, target))
+        interval = min(self.max_sample_interval, max(self.min_sample_interval, target * self.LEAD_FRACTION))
+        return min(interval, target)
+
+    def fixed_wakeups(self, now, check_interval_seconds, sample_rate):
+        """
+        Wakeups the fixed cadence would have needed since start()
+        :param now: Current monotonic time
+        :param check_interval_seconds: Fixed check interval
+        :param sample_rate: Fixed sample rate
+        :return: Number of wakeups
+        """
+        if self.started_at is None:
+            return 0
+        elapsed = now - self.started_at
+        return int(elapsed * sample_rate) + int(elapsed / check_interval_seconds)
@@ -3,60 +3,155 @@
 Alarm Manager Module
 Handles timeout alarm and ding notifications for consecutive auto-move cycles
 """
-import time
-from sound_notifier import SoundNotifier
+import event_log
+from clock import SYSTEM_CLOCK
+from metrics import ALARMS
+
+# Slack when comparing elapsed time with the timeout, so an alarm scheduled exactly at its deadline fires
+ALARM_TOLERANCE_SECONDS = 0.001
 
 
 class AlarmManager:
     """Manages alarm timeout and ding notifications"""
     
-    def __init__(self, timeout_seconds=1800, check_interval_seconds=300, ding_duration=1.0):
+    def __init__(self, timeout_seconds=1800, check_interval_seconds=300, ding_duration=1.0,
+                 sound_dispatcher=None, sound_notifier=None, journal=None, clock=None,
+                 activity_store=None, name=None):
         """
         Initialize the alarm manager
         :param timeout_seconds: Time in seconds before playing alarm (default: 1800 = 30 minutes)
         :param check_interval_seconds: Time between position checks in seconds (for max ding calculation)
         :param ding_duration: Duration of each ding in seconds (default: 1.0)
+        :param sound_dispatcher: Optional callable(count) that queues count dings for playback elsewhere
+                                 instead of playing them here (blocking)
+        :param sound_notifier: SoundNotifier to share between alarm managers (default: a new one)
+        :param journal: Optional StateJournal that every state change is appended to (see restore_state)
+        :param clock: Time source (default: the system clock; a VirtualClock for simulations)
+        :param activity_store: Optional ActivityStore that alarms and ding cycles are recorded in
+        :param name: Optional session name, used to tag events when several sessions share a process
         """
         self.timeout_seconds = timeout_seconds
         self.check_interval_seconds = check_interval_seconds
         self.ding_duration = ding_duration
-        self.sound_notifier = SoundNotifier()
+        self.sound_dispatcher = sound_dispatcher
+        self.journal = journal
+        self.activity_store = activity_store
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.name = name
+        self._report_prefix = f"[{name}] " if name else ""
         
-        # Track time of last manual mouse movement
-        self.last_manual_movement_time = time.time()
+        # Track time of last manual mouse movement (monotonic, immune to wall-clock changes)
+        self.last_manual_movement_time = self.clock.monotonic()
         
         # Track consecutive auto-move cycles (for ding count) - only after alarm triggers
         self.consecutive_auto_move_count = 0
         
-        # Track when last alarm was played
-        self.last_alarm_time = 0
+        # Track when last alarm was played (None = not played since last reset)
+        self.last_alarm_time = None
         
         # Track if alarm has been triggered (dings only play after alarm)
         self.alarm_triggered = False
         
-        # Calculate maximum ding count
+        self.max_ding_count = self._calculate_max_ding_count()
+        
+        # Created on first use, so runs that never play a sound never load the sound subsystem
+        self._sound_notifier = sound_notifier
+    
+    @property
+    def sound_notifier(self):
+        """SoundNotifier used for alarms and dings (created on first access)"""
+        if self._sound_notifier is None:
+            from sound_notifier import SoundNotifier
+            # Ding sequences up to max_ding_count are pre-mixed once and reused
+            self._sound_notifier = SoundNotifier(max_sequence_count=self.max_ding_count)
+        return self._sound_notifier
+    
+    def _calculate_max_ding_count(self):
+        """
+        Maximum ding count for the current check interval
+        :return: Number of dings
+        """
         # Max dings = min(20, cycle_interval_seconds / ding_duration)
         # This ensures we don't play more dings than can fit in one cycle
-        calculated_max = int(check_interval_seconds / ding_duration)
-        self.max_ding_count = min(20, calculated_max)
+        calculated_max = int(self.check_interval_seconds / self.ding_duration)
+        return min(20, calculated_max)
+    
+    def update_settings(self, timeout_seconds=None, check_interval_seconds=None):
+        """
+        Change the timeout and/or check interval while running; alarm and ding state is kept
+        :param timeout_seconds: New alarm timeout in seconds (None = unchanged)
+        :param check_interval_seconds: New check interval in seconds (None = unchanged)
+        """
+        if timeout_seconds is not None:
+            self.timeout_seconds = timeout_seconds
+        if check_interval_seconds is not None:
+            self.check_interval_seconds = check_interval_seconds
+        self.max_ding_count = self._calculate_max_ding_count()
+        if self._sound_notifier is not None:
+            # Keep the longest sequence memoized
+            self._sound_notifier.max_sequence_count = max(self._sound_notifier.max_sequence_count,
+                                                          self.max_ding_count)
+    
+    def get_state(self):
+        """
+        Alarm state as a journal record. Monotonic times do not survive a restart, so they are
+        stored as ages together with the wall-clock time of the record.
+        :return: JSON-serializable dictionary
+        """
+        now = self.clock.monotonic()
+        return {
+            'wall_time': self.clock.time(),
+            'manual_age': now - self.last_manual_movement_time,
+            'alarm_age': None if self.last_alarm_time is None else now - self.last_alarm_time,
+            'consecutive_auto_moves': self.consecutive_auto_move_count,
+            'alarm_triggered': self.alarm_triggered,
+        }
+    
+    def restore_state(self, state):
+        """
+        Continue from a state saved by get_state() (e.g. before a restart); time spent offline counts
+        as time without manual movement
+        :param state: Dictionary from get_state()
+        """
+        offline = max(0.0, self.clock.time() - state['wall_time'])
+        now = self.clock.monotonic()
+        self.last_manual_movement_time = now - state['manual_age'] - offline
+        self.last_alarm_time = None if state['alarm_age'] is None else now - state['alarm_age'] - offline
+        self.consecutive_auto_move_count = state['consecutive_auto_moves']
+        self.alarm_triggered = state['alarm_triggered']
     
-    def reset(self):
-        """Reset all counters to initial state"""
-        self.last_manual_movement_time = time.time()
+    def _journal_state(self):
+        """Append the current state to the journal (if any)"""
+        if self.journal is not None:
+            self.journal.append(self.get_state())
+    
+    def reset(self, moved_at=None):
+        """
+        Reset all counters to initial state
+        :param moved_at: Monotonic time of the manual movement (default: now)
+        """
+        self.last_manual_movement_time = self.clock.monotonic() if moved_at is None else moved_at
         if self.consecutive_auto_move_count > 0 or self.alarm_triggered:
             msg_parts = []
             if self.alarm_triggered:
                 msg_parts.append("alarm triggered")
             if self.consecutive_auto_move_count > 0:
                 msg_parts.append(f"{self.consecutive_auto_move_count} consecutive auto-moves")
-            print(f"   ↻ Resetting alarm counters ({', '.join(msg_parts)})")
+            event_log.emit('alarm.reset',
+                           f"{self._report_prefix}   ↻ Resetting alarm counters ({', '.join(msg_parts)})",
+                           session=self.name, alarm_triggered=self.alarm_triggered,
+                           consecutive_auto_moves=self.consecutive_auto_move_count)
         self.consecutive_auto_move_count = 0
-        self.last_alarm_time = 0
+        self.last_alarm_time = None
         self.alarm_triggered = False  # Reset alarm trigger flag
+        self._journal_state()
     
-    def on_manual_movement(self):
-        """Called when manual mouse movement is detected"""
-        self.reset()
+    def on_manual_movement(self, moved_at=None):
+        """
+        Called when manual mouse movement is detected
+        :param moved_at: Monotonic time the movement was seen, if earlier than now
+        """
+        self.reset(moved_at)
     
     def on_auto_move(self):
         """Called when auto-move happens"""
@@ -67,6 +162,7 @@ class AlarmManager:
         if self.alarm_triggered:
             # Increment consecutive auto-move count (only after alarm)
             self.consecutive_auto_move_count += 1
+            self._journal_state()
             
             # Calculate how many dings to play (capped at max)
             # Dings increase: 1st cycle after alarm = 1 ding, 2nd = 2 dings, 3rd = 3 dings, etc.
@@ -80,29 +176,30 @@ class AlarmManager:
     
     def _play_dings(self, count):
         """
-        Play multiple dings with 1 second gap between each
+        Play multiple dings with ding_duration seconds between the start of each
         :param count: Number of dings to play
         """
         if count == 0:
             return
         
-        print(f"   🔔 Playing {count} ding(s) after auto-move cycle #{self.consecutive_auto_move_count}...")
+        event_log.emit('ding.start',
+                       f"{self._report_prefix}   🔔 Playing {count} ding(s) after auto-move cycle "
+                       f"#{self.consecutive_auto_move_count}...",
+                       session=self.name, count=count, cycle=self.consecutive_auto_move_count)
+        if self.activity_store is not None:
+            self.activity_store.record('dings', self.clock.time(), count)
         
-        all_success = True
-        for i in range(count):
-            if i > 0:
-                # Wait 1 second between dings (except before first ding)
-                time.sleep(self.ding_duration)
-            
-            success = self.sound_notifier.play_notification()
-            if not success:
-                all_success = False
-                print(f"      ✗ Ding #{i+1} failed to play")
-            else:
-                print(f"      ✓ Ding #{i+1} played")
+        if self.sound_dispatcher is not None:
+            self.sound_dispatcher(count)
+            return
         
-        if all_success:
-            print(f"   ✓ All {count} ding(s) played successfully")
+        # One pre-mixed playback with exact spacing instead of count separate sounds
+        if self.sound_notifier.play_ding_sequence(count, self.ding_duration):
+            event_log.emit('ding.played', f"{self._report_prefix}   ✓ All {count} ding(s) played successfully",
+                           session=self.name, count=count)
+        else:
+            event_log.emit('ding.failed', f"{self._report_prefix}   ✗ Failed to play {count} ding(s)",
+                           session=self.name, count=count)
     
     def _check_and_play_alarm(self):
         """
@@ -110,28 +207,40 @@ class AlarmManager:
         Alarm plays once when timeout is reached
         Returns True if alarm was just triggered, False otherwise
         """
-        current_time = time.time()
+        current_time = self.clock.monotonic()
         elapsed_since_manual = current_time - self.last_manual_movement_time
         
         # Check if timeout reached and enough time passed since last alarm
-        time_since_last_alarm = current_time - self.last_alarm_time if self.last_alarm_time > 0 else elapsed_since_manual
+        time_since_last_alarm = (current_time - self.last_alarm_time if self.last_alarm_time is not None
+                                 else elapsed_since_manual)
+        threshold = self.timeout_seconds - ALARM_TOLERANCE_SECONDS
         
-        if elapsed_since_manual >= self.timeout_seconds and time_since_last_alarm >= self.timeout_seconds:
+        if elapsed_since_manual >= threshold and time_since_last_alarm >= threshold:
             # Alarm timeout reached
             timeout_minutes = self.timeout_seconds / 60
             timeout_minutes_str = f"{timeout_minutes:.2f}" if timeout_minutes < 1 else f"{timeout_minutes:.1f}"
             elapsed_minutes = elapsed_since_manual / 60
             elapsed_minutes_str = f"{elapsed_minutes:.2f}" if elapsed_minutes < 1 else f"{elapsed_minutes:.1f}"
             
-            print(f"\n🚨 ALARM: No manual mouse movement for {elapsed_minutes_str} minutes "
-                  f"(timeout: {timeout_minutes_str} minutes)")
-            print("   Playing alarm sound...")
+            event_log.emit('alarm.fired',
+                           f"\n{self._report_prefix}🚨 ALARM: No manual mouse movement for {elapsed_minutes_str} "
+                           f"minutes (timeout: {timeout_minutes_str} minutes)\n   Playing alarm sound...",
+                           session=self.name, elapsed_seconds=round(elapsed_since_manual, 3),
+                           timeout_seconds=self.timeout_seconds)
+            ALARMS.inc()
+            if self.activity_store is not None:
+                self.activity_store.record('alarm', self.clock.time())
             
-            success = self.sound_notifier.play_notification()
-            if success:
-                print("   ✓ Alarm sound played successfully")
+            if self.sound_dispatcher is not None:
+                self.sound_dispatcher(1)
             else:
-                print("   ✗ Failed to play alarm sound")
+                success = self.sound_notifier.play_notification()
+                if success:
+                    event_log.emit('alarm.played', f"{self._report_prefix}   ✓ Alarm sound played successfully",
+                                   session=self.name)
+                else:
+                    event_log.emit('alarm.failed', f"{self._report_prefix}   ✗ Failed to play alarm sound",
+                                   session=self.name)
             
             # Mark alarm as triggered (this enables dings to start/continue playing)
             # Do NOT reset ding counter here; it must continue increasing up to the cap
@@ -139,10 +248,28 @@ class AlarmManager:
             
             # Update last alarm time (but don't reset manual movement time)
             self.last_alarm_time = current_time
+            self._journal_state()
             return True
         
         return False
     
+    def check_alarm(self):
+        """
+        Play the alarm if its deadline has passed (call at next_alarm_deadline())
+        :return: True if alarm was just triggered, False otherwise
+        """
+        return self._check_and_play_alarm()
+    
+    def next_alarm_deadline(self):
+        """
+        Monotonic time at which the alarm is next due
+        :return: Monotonic time (of the clock)
+        """
+        deadline = self.last_manual_movement_time + self.timeout_seconds
+        if self.last_alarm_time is not None:
+            deadline = max(deadline, self.last_alarm_time + self.timeout_seconds)
+        return deadline
+    
     def get_status_info(self):
         """
         Get status information for display
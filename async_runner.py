@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Async Runner Module
+Runs AutoMouseMover on an asyncio event loop with sampling, checks, alarms and sound as separate tasks
+"""
+import asyncio
+import signal
+import sys
+import time
+import event_log
+from metrics import CHECK_DRIFT, CHECK_DURATION, REGISTRY
+
+
+class AsyncRunner:
+    """Event loop runtime for AutoMouseMover and its AlarmManager"""
+
+    def __init__(self, mover):
+        """
+        Initialize the runner
+        :param mover: AutoMouseMover to drive
+        """
+        self.mover = mover
+        self.alarm_manager = mover.alarm_manager
+        self.moving = False
+        self._alarm_events = None
+        self._ding_requests = None
+
+    def run(self):
+        """Run until Ctrl+C / SIGTERM, then print final statistics"""
+        try:
+            asyncio.run(self._main())
+        except KeyboardInterrupt:
+            # Platforms without loop signal handlers (Windows) still get KeyboardInterrupt
+            print("\n\nReceived interrupt signal...")
+        finally:
+            self.mover.save_activity()
+            self.mover._print_summary()
+
+    def _stop(self, main_task):
+        """Handle interrupt signals by cancelling the main task"""
+        print("\n\nStopping auto mouse mover...")
+        self.mover.running = False
+        main_task.cancel()
+
+    def _install_signal_handlers(self, loop, main_task):
+        """Route SIGINT/SIGTERM through the event loop where supported"""
+        signals = [signal.SIGINT, signal.SIGTERM]
+        if sys.platform == 'win32':
+            signals.append(signal.SIGBREAK)
+        for signum in signals:
+            try:
+                loop.add_signal_handler(signum, self._stop, main_task)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    async def _main(self):
+        loop = asyncio.get_running_loop()
+        self._install_signal_handlers(loop, asyncio.current_task())
+
+        mover = self.mover
+        self._alarm_events = asyncio.Queue()
+        self._ding_requests = asyncio.Queue()
+        self.alarm_manager.sound_dispatcher = self._ding_requests.put_nowait
+        REGISTRY.register_collector(mover.status_metrics)
+
+        previous_pos = mover.backend.position()
+        mover._print_banner(previous_pos)
+        mover.check_count = 0
+        mover.sampler.start_window(previous_pos)
+
+        try:
+            await asyncio.gather(
+                self._sample_loop(),
+                self._check_loop(previous_pos),
+                self._alarm_loop(),
+                self._sound_loop()
+            )
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.alarm_manager.sound_dispatcher = None
+            REGISTRY.unregister_collector(mover.status_metrics)
+
+    async def _sample_loop(self):
+        """Poll the pointer position at the sampler rate (paused while auto-moving)"""
+        loop = asyncio.get_running_loop()
+        sampler = self.mover.sampler
+        next_sample = loop.time()
+        while True:
+            next_sample += sampler.sample_interval
+            await asyncio.sleep(max(0.0, next_sample - loop.time()))
+            if not self.moving:
+                sampler.sample()
+            if next_sample < loop.time():
+                # Fell behind - resume from now instead of bursting
+                next_sample = loop.time()
+
+    async def _check_loop(self, previous_pos):
+        """
+        Evaluate the sample window on a fixed cadence and auto-move when idle
+        :param previous_pos: Position tuple (x, y) the first window starts from
+        """
+        loop = asyncio.get_running_loop()
+        mover = self.mover
+        interval = mover.check_interval
+        next_check = loop.time() + interval
+        while True:
+            await asyncio.sleep(max(0.0, next_check - loop.time()))
+            CHECK_DRIFT.observe(loop.time() - next_check)
+            # Absolute cadence: a slow move never pushes back later checks
+            next_check += interval
+            while next_check <= loop.time():
+                next_check += interval
+
+            started = time.perf_counter()
+            current_pos = mover.sampler.sample()
+            mover.check_count += 1
+            window = mover.sampler.window_stats()
+
+            moved = mover._has_moved(window)
+            mover._record_check(moved, window, previous_pos, current_pos)
+            if moved:
+                self._alarm_events.put_nowait('manual')
+                previous_pos = current_pos
+                CHECK_DURATION.observe(time.perf_counter() - started)
+            else:
+                CHECK_DURATION.observe(time.perf_counter() - started)
+                self.moving = True
+                try:
+                    await asyncio.to_thread(mover._move_to_random_location, current_pos)
+                finally:
+                    self.moving = False
+                self._alarm_events.put_nowait('auto')
+                previous_pos = mover.backend.position()
+
+            mover.sampler.start_window(previous_pos)
+
+    async def _alarm_loop(self):
+        """Feed check outcomes to the alarm manager and fire the alarm at its deadline"""
+        loop = asyncio.get_running_loop()
+        alarm_manager = self.alarm_manager
+        while True:
+            # loop.time() is time.monotonic(), the clock AlarmManager deadlines use
+            timeout = max(0.0, alarm_manager.next_alarm_deadline() - loop.time())
+            try:
+                event = await asyncio.wait_for(self._alarm_events.get(), timeout)
+            except asyncio.TimeoutError:
+                # During an auto-move the window holds the move itself, not user activity
+                if self.moving or not self.mover.defer_alarm_for_activity():
+                    alarm_manager.check_alarm()
+                continue
+            if event == 'manual':
+                alarm_manager.on_manual_movement()
+            else:
+                alarm_manager.on_auto_move()
+
+    async def _sound_loop(self):
+        """Play queued ding requests without blocking checks"""
+        alarm_manager = self.alarm_manager
+        while True:
+            count = await self._ding_requests.get()
+            success = await asyncio.to_thread(alarm_manager.sound_notifier.play_ding_sequence,
+                                              count, alarm_manager.ding_duration)
+            prefix = self.mover._report_prefix
+            if success:
+                event_log.emit('ding.played', f"{prefix}   ✓ {count} ding(s) played successfully",
+                               session=self.mover.name, count=count)
+            else:
+                event_log.emit('ding.failed', f"{prefix}   ✗ Failed to play {count} ding(s)",
+                               session=self.mover.name, count=count)
@@ -4,22 +4,47 @@ Automatic Mouse Mover
 Monitors mouse position and moves it smoothly to a random location if it hasn't moved much.
 Useful for keeping system awake or preventing screensaver.
 """
-import pyautogui
-import time
 import math
+import os
 import random
 import signal
+import socket
 import sys
+import time
+import event_log
+from activity_sampler import ActivitySampler, window_capacity
+from activity_store import SAVE_INTERVAL_SECONDS, ActivityStore
+from adaptive_cadence import AdaptiveCadence
 from alarm_manager import AlarmManager
-
-# Disable pyautogui failsafe for smoother operation
-pyautogui.FAILSAFE = True  # You can move mouse to top-left corner to stop
+from calibration import DEFAULT_PROFILE_PATH, load_profile
+from clock import SYSTEM_CLOCK
+from metrics import AUTO_MOVES, CHECK_DRIFT, CHECK_DURATION, MANUAL_MOVES, REGISTRY, start_exporters
+from patterns import translate
+from playback import DEFAULT_FRAME_RATE, ScheduledPlayback, TrajectoryPlayer, frames_for_duration
+from pointer_backend import BACKENDS, PyAutoGUIBackend, create_backend
+from pointer_trace import TraceLibrary, resample_offsets
+from scheduler import Scheduler
+from screen_geometry import DEFAULT_CORNER_SIZE, ScreenGeometry, parse_rect
+from trajectory_cache import default_cache
 
 class AutoMouseMover:
     """Automatically moves mouse if it hasn't moved much"""
     
+    # Path length (as a multiple of delta_threshold) that counts as activity even without displacement
+    PATH_LENGTH_FACTOR = 4
+    
+    # Auto-move strategies: uniform random jumps, or segments replayed from a trace library
+    MOVE_STRATEGIES = ('random', 'trace')
+    
+    # Path shapes for random moves: straight line, or curved minimum-jerk path with overshoot
+    PATH_STYLES = ('line', 'human')
+    
     def __init__(self, check_interval_seconds=300, delta_threshold=10, min_distance=100, 
-                 max_distance=500, timeout_seconds=1800):
+                 max_distance=500, timeout_seconds=1800, backend=None, cache=None, sample_rate=2.0,
+                 name=None, sound_notifier=None, install_signal_handlers=True, move_strategy='random',
+                 trace_library=None, path_style='line', adaptive=None, exclusions=(),
+                 corner_size=DEFAULT_CORNER_SIZE, state_journal=None, clock=None, activity_store=None,
+                 tuning=None):
         """
         Initialize the auto mouse mover
         :param check_interval_seconds: Time in seconds between position checks (default: 300 = 5 minutes)
@@ -27,31 +52,165 @@ class AutoMouseMover:
         :param min_distance: Minimum distance for random movement (default: 100)
         :param max_distance: Maximum distance for random movement (default: 500)
         :param timeout_seconds: Time in seconds before playing alarm if no manual movement (default: 1800 = 30 minutes)
+        :param backend: PointerBackend to monitor and drive (default: pyautogui with failsafe enabled)
+        :param cache: TrajectoryCache for movement paths (default: process-wide shared cache)
+        :param sample_rate: Position samples per second taken between checks (default: 2.0)
+        :param name: Optional session name prefixed to check reports (used by fleet mode)
+        :param sound_notifier: SoundNotifier to share between movers (default: a new one)
+        :param install_signal_handlers: Handle SIGINT/SIGTERM by stopping this mover (default: True)
+        :param move_strategy: 'random' (straight line to a random target) or 'trace' (replay a random
+                              segment of recorded human movement from trace_library)
+        :param trace_library: TraceLibrary to draw segments from (required for the 'trace' strategy)
+        :param path_style: Shape of random moves, 'line' or 'human' (curved, minimum-jerk, small overshoot)
+        :param adaptive: Optional AdaptiveCadence that stretches check/sample intervals while the user is
+                         active and tightens them as an auto-move or the alarm nears (scheduler runtime only)
+        :param exclusions: (x, y, width, height) rectangles random targets must avoid (e.g. taskbars)
+        :param corner_size: Side of the square excluded at each monitor corner, covering hot corners
+                            and the pyautogui failsafe corner (0 = none)
+        :param state_journal: Optional StateJournal; alarm state is restored from its newest record and
+                              every later change is appended, so a restart keeps the alarm escalation
+        :param clock: Time source for sampling, checks and the alarm (default: the system clock); with a
+                      VirtualClock, start() runs through simulated time without waiting
+        :param activity_store: Optional ActivityStore that every check outcome, alarm and ding cycle is
+                               recorded in; one opened from a file is saved there periodically (scheduler
+                               runtime) and when the mover stops
+        :param tuning: Optional TuningProfile of the backend (see calibration.py); sets the frame rate of
+                       auto-move paths and the backend's timing knobs
         """
+        if move_strategy not in self.MOVE_STRATEGIES:
+            raise ValueError(f"Unknown move strategy '{move_strategy}' "
+                             f"(available: {', '.join(self.MOVE_STRATEGIES)})")
+        if move_strategy == 'trace' and trace_library is None:
+            raise ValueError("The 'trace' move strategy needs a trace_library")
+        if path_style not in self.PATH_STYLES:
+            raise ValueError(f"Unknown path style '{path_style}' (available: {', '.join(self.PATH_STYLES)})")
         self.check_interval = check_interval_seconds
         self.delta_threshold = delta_threshold
         self.min_distance = min_distance
         self.max_distance = max_distance
         self.running = True
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.check_count = 0
+        self.previous_pos = None
+        self.moving = False
+        self.paused = False
+        self.scheduler = None
+        self.sound_player = None
+        self._alarm_call = None
+        self._check_call = None
+        self.name = name
+        self.move_strategy = move_strategy
+        self.trace_library = trace_library
+        self.path_style = path_style
+        self.adaptive = adaptive
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.activity_store = activity_store
+        self._sample_call = None
+        self._next_check_deadline = None
+        self._report_prefix = f"[{name}] " if name else ""
+        
+        if backend is None:
+            # Keep pyautogui failsafe on - you can move mouse to top-left corner to stop
+            backend = PyAutoGUIBackend(failsafe=True)
+        self.backend = backend
+        self.frame_rate = DEFAULT_FRAME_RATE
+        if tuning is not None:
+            self.frame_rate = tuning.frame_rate
+            backend.apply_tuning(tuning)
+        self.exclusions = list(exclusions)
+        self.corner_size = corner_size
+        self._geometry = None
+        self.cache = cache if cache is not None else default_cache
+        self.player = TrajectoryPlayer(self.backend, clock=self.clock)
+        
+        # Sample position between checks so short movements are not missed
+        self.sampler = ActivitySampler(
+            self.backend,
+            sample_rate=sample_rate,
+            capacity=window_capacity(adaptive.max_check_interval if adaptive is not None else check_interval_seconds,
+                                     sample_rate),
+            clock=self.clock
+        )
         
         # Initialize alarm manager
         self.alarm_manager = AlarmManager(
             timeout_seconds=timeout_seconds,
-            check_interval_seconds=check_interval_seconds
+            check_interval_seconds=check_interval_seconds,
+            sound_notifier=sound_notifier,
+            journal=state_journal,
+            clock=self.clock,
+            activity_store=activity_store,
+            name=name
         )
+        if state_journal is not None and state_journal.last_record is not None:
+            self._restore_alarm_state(state_journal.last_record)
         
         # Setup signal handler for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-        
-        if sys.platform == 'win32':
-            signal.signal(signal.SIGBREAK, self._signal_handler)
+        if install_signal_handlers:
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
+            
+            if sys.platform == 'win32':
+                signal.signal(signal.SIGBREAK, self._signal_handler)
+    
+    @property
+    def screen_width(self):
+        """Width of the monitor layout (queried from the backend on first use)"""
+        return self._get_geometry().size[0]
+    
+    @property
+    def screen_height(self):
+        """Height of the monitor layout (queried from the backend on first use)"""
+        return self._get_geometry().size[1]
+    
+    def _get_geometry(self, refresh=False):
+        """
+        Valid target area, rebuilt when the monitor layout changes
+        :param refresh: Re-query the monitor layout from the backend
+        :return: ScreenGeometry
+        """
+        if self._geometry is None:
+            self._geometry = ScreenGeometry(self.backend.monitors(), self.exclusions, corner_size=self.corner_size)
+        elif refresh:
+            monitors = self.backend.monitors()
+            if monitors != self._geometry.monitors:
+                try:
+                    self._geometry = ScreenGeometry(monitors, self.exclusions, corner_size=self.corner_size)
+                except ValueError as e:
+                    event_log.emit('geometry.error', f"{self._report_prefix}Ignoring display layout change: {e}",
+                                   session=self.name, monitors=monitors)
+                    return self._geometry
+                width, height = self._geometry.size
+                event_log.emit('geometry.rebuilt',
+                               f"{self._report_prefix}Display layout changed: {len(monitors)} monitor(s), "
+                               f"{width}x{height}", session=self.name, monitors=monitors)
+        return self._geometry
+    
+    def _restore_alarm_state(self, state):
+        """
+        Continue the alarm escalation from a journal record
+        :param state: Record from AlarmManager.get_state()
+        """
+        try:
+            self.alarm_manager.restore_state(state)
+        except (KeyError, TypeError) as e:
+            event_log.emit('state.error', f"{self._report_prefix}Ignoring unreadable saved alarm state: {e}",
+                           session=self.name, error=str(e))
+            return
+        idle_minutes = (self.clock.monotonic() - self.alarm_manager.last_manual_movement_time) / 60
+        event_log.emit('state.restored',
+                       f"{self._report_prefix}Restored alarm state: {idle_minutes:.1f} minutes since manual movement, "
+                       f"alarm {'triggered' if self.alarm_manager.alarm_triggered else 'not triggered'}, "
+                       f"{self.alarm_manager.consecutive_auto_move_count} consecutive auto-moves",
+                       session=self.name, idle_seconds=round(idle_minutes * 60, 3),
+                       alarm_triggered=self.alarm_manager.alarm_triggered,
+                       consecutive_auto_moves=self.alarm_manager.consecutive_auto_move_count)
     
     def _signal_handler(self, signum, frame):
         """Handle interrupt signals (Ctrl+C)"""
         print("\n\nStopping auto mouse mover...")
         self.running = False
+        if self.scheduler is not None:
+            self.scheduler.stop()
     
     def _get_distance(self, pos1, pos2):
         """
@@ -62,15 +221,16 @@ class AutoMouseMover:
         """
         return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
     
-    def _has_moved(self, previous_pos, current_pos):
+    def _has_moved(self, window):
         """
-        Check if mouse has moved significantly
-        :param previous_pos: Previous position tuple (x, y)
-        :param current_pos: Current position tuple (x, y)
+        Check if mouse has moved significantly during a sampling window.
+        Uses the furthest point reached (not just the end point), so moving away and
+        back counts as movement, and the total path length to catch small circling.
+        :param window: Window statistics from ActivitySampler.window_stats()
         :return: True if mouse has moved more than threshold, False otherwise
         """
-        distance = self._get_distance(previous_pos, current_pos)
-        return distance > self.delta_threshold
+        return (window['max_displacement'] > self.delta_threshold or
+                window['path_length'] > self.delta_threshold * self.PATH_LENGTH_FACTOR)
     
     def _generate_random_position(self, current_pos):
         """
@@ -78,24 +238,16 @@ class AutoMouseMover:
         :param current_pos: Current position tuple (x, y)
         :return: Random position tuple (x, y)
         """
-        # Generate random angle and distance
-        angle = random.uniform(0, 2 * math.pi)
-        distance = random.uniform(self.min_distance, self.max_distance)
-        
-        # Calculate new position
-        new_x = int(current_pos[0] + distance * math.cos(angle))
-        new_y = int(current_pos[1] + distance * math.sin(angle))
-        
-        # Ensure position is within screen bounds
-        new_x = max(50, min(new_x, self.screen_width - 50))
-        new_y = max(50, min(new_y, self.screen_height - 50))
-        
-        return (new_x, new_y)
+        # Uniform over the part of the min/max distance ring that lies on a monitor and outside
+        # the exclusion zones (instead of clamping, which piles targets up along the edges)
+        return self._get_geometry().sample_annulus(current_pos[0], current_pos[1],
+                                                   self.min_distance, self.max_distance)
     
-    def _move_to_random_location(self, current_pos):
+    def _plan_random_move(self, current_pos):
         """
-        Move mouse smoothly to a random location
+        Pick a random target and build the path to it
         :param current_pos: Current position tuple (x, y)
+        :return: Tuple (target_pos, distance, duration, points)
         """
         target_pos = self._generate_random_position(current_pos)
         distance = self._get_distance(current_pos, target_pos)
@@ -103,15 +255,102 @@ class AutoMouseMover:
         # Adjust duration based on distance (smooth movement)
         duration = min(2.0, max(0.5, distance / 200))
         
+        delta_x, delta_y = target_pos[0] - current_pos[0], target_pos[1] - current_pos[1]
+        if self.path_style == 'human':
+            offsets = self.cache.human(delta_x, delta_y, frames_for_duration(duration, self.frame_rate))
+            return target_pos, distance, duration, self._clamp_points(translate(offsets, current_pos[0], current_pos[1]))
+        offsets = self.cache.line(delta_x, delta_y, frames_for_duration(duration, self.frame_rate))
+        return target_pos, distance, duration, translate(offsets, current_pos[0], current_pos[1])
+    
+    def _clamp_points(self, points):
+        """
+        Keep a path inside the same screen margin as random targets
+        :param points: List of (x, y) points
+        :return: List of clamped (x, y) points
+        """
+        geometry = self._get_geometry()
+        left, top, right, bottom = geometry.bounds
+        min_x, min_y = left + geometry.margin, top + geometry.margin
+        max_x, max_y = right - geometry.margin, bottom - geometry.margin
+        return [(max(min_x, min(x, max_x)), max(min_y, min(y, max_y))) for x, y in points]
+    
+    def _plan_trace_move(self, current_pos):
+        """
+        Pick a random segment from the trace library and replay its shape from the current position
+        :param current_pos: Current position tuple (x, y)
+        :return: Tuple (target_pos, distance, duration, points)
+        """
+        segment = self.trace_library.random_segment(max_seconds=random.uniform(0.5, 2.0))
+        offsets, duration = resample_offsets(segment, self.frame_rate)
+        if not offsets:
+            return self._plan_random_move(current_pos)
+        
+        points = self._clamp_points(translate(offsets, current_pos[0], current_pos[1]))
+        target_pos = points[-1]
+        return target_pos, self._get_distance(current_pos, target_pos), duration, points
+    
+    def _plan_move(self, current_pos):
+        """
+        Plan an auto-move with the configured strategy
+        :param current_pos: Current position tuple (x, y)
+        :return: Tuple (target_pos, distance, duration, points)
+        """
+        # Once per auto-move: pick up monitors being added, removed or resized
+        self._get_geometry(refresh=True)
+        if self.move_strategy == 'trace':
+            return self._plan_trace_move(current_pos)
+        return self._plan_random_move(current_pos)
+    
+    def _report_move(self, current_pos, target_pos, distance, result):
+        """Log the outcome of a random move"""
+        event_log.emit(
+            'move.auto',
+            f"{self._report_prefix}  ✓ Moved mouse from ({current_pos[0]}, {current_pos[1]}) to ({target_pos[0]}, {target_pos[1]}) "
+            f"[Distance: {int(distance)}px, Duration: {result.summary()}]",
+            session=self.name, start=current_pos, target=target_pos, distance=round(distance, 1),
+            requested_duration=result.requested_duration, achieved_duration=result.achieved_duration,
+            frames_played=result.frames_played, frames_skipped=result.frames_skipped
+        )
+    
+    def _move_to_random_location(self, current_pos):
+        """
+        Move mouse smoothly to a random location
+        :param current_pos: Current position tuple (x, y)
+        """
         try:
-            pyautogui.moveTo(target_pos[0], target_pos[1], duration=duration)
-            print(f"  ✓ Moved mouse from ({current_pos[0]}, {current_pos[1]}) to ({target_pos[0]}, {target_pos[1]}) "
-                  f"[Distance: {int(distance)}px, Duration: {duration:.2f}s]")
+            target_pos, distance, duration, points = self._plan_move(current_pos)
+            result = self.player.play(points, duration)
+            self._report_move(current_pos, target_pos, distance, result)
         except Exception as e:
-            print(f"  ✗ Error moving mouse: {e}")
+            event_log.emit('move.error', f"{self._report_prefix}  ✗ Error moving mouse: {e}",
+                           session=self.name, error=str(e))
     
-    def start(self):
-        """Start monitoring and auto-moving mouse"""
+    def _move_to_random_location_scheduled(self, current_pos, scheduler, on_complete):
+        """
+        Move mouse smoothly to a random location with frames played on a shared scheduler
+        :param current_pos: Current position tuple (x, y)
+        :param scheduler: Scheduler the move frames run on
+        :param on_complete: Callable run once the move has finished (or failed)
+        """
+        try:
+            target_pos, distance, duration, points = self._plan_move(current_pos)
+        except Exception as e:
+            event_log.emit('move.error', f"{self._report_prefix}  ✗ Error moving mouse: {e}",
+                           session=self.name, error=str(e))
+            on_complete()
+            return
+        
+        def finished(result):
+            self._report_move(current_pos, target_pos, distance, result)
+            on_complete()
+        
+        ScheduledPlayback(self.backend, scheduler, points, duration, on_complete=finished).start()
+    
+    def _print_banner(self, initial_pos):
+        """
+        Print configuration and monitoring info at startup
+        :param initial_pos: Initial position tuple (x, y)
+        """
         # Convert seconds to minutes for display
         interval_minutes = self.check_interval / 60
         interval_minutes_str = f"{interval_minutes:.2f}" if interval_minutes < 1 else f"{interval_minutes:.1f}"
@@ -126,67 +365,493 @@ class AutoMouseMover:
         print("Configuration:")
         print(f"  - Check interval: {interval_minutes_str} minutes ({self.check_interval} seconds)")
         print(f"  - Movement threshold: {self.delta_threshold} pixels")
+        print(f"  - Position sample rate: {self.sampler.sample_rate:g}/s")
         print(f"  - Random move distance: {self.min_distance}-{self.max_distance} pixels")
         print(f"  - Alarm timeout: {timeout_minutes_str} minutes ({timeout_seconds} seconds)")
         print(f"  - Max ding count per cycle: {max_ding_count} (calculated: min(20, {self.check_interval}s / 1s))")
-        print(f"  - Screen size: {self.screen_width}x{self.screen_height}")
+        geometry = self._get_geometry()
+        print(f"  - Screen size: {self.screen_width}x{self.screen_height} ({len(geometry.monitors)} monitor(s))")
+        print(f"  - Target exclusions: {len(self.exclusions)} zone(s), {self.corner_size}px corners "
+              f"({geometry.area} px² valid)")
+        print(f"  - Pointer backend: {self.backend.name}")
+        print(f"  - Auto-move path: {self.path_style}")
+        if self.adaptive is not None:
+            print(f"  - Adaptive cadence: checks {self.adaptive.min_check_interval:g}-"
+                  f"{self.adaptive.max_check_interval:g}s, samples {self.adaptive.min_sample_interval:g}-"
+                  f"{self.adaptive.max_sample_interval:g}s")
+        if self.move_strategy == 'trace':
+            print(f"  - Auto-move strategy: trace replay ({len(self.trace_library.readers)} trace(s), "
+                  f"{self.trace_library.total_records} samples)")
+        print(f"  - Sound backend: {self.alarm_manager.sound_notifier.probe() or 'none available (will retry)'}")
         print("\nPress Ctrl+C to stop\n")
         
-        # Get initial position
-        previous_pos = pyautogui.position()
-        print(f"Initial mouse position: ({previous_pos[0]}, {previous_pos[1]})")
+        print(f"Initial mouse position: ({initial_pos[0]}, {initial_pos[1]})")
         print(f"Monitoring mouse movement every {interval_minutes_str} minutes ({self.check_interval} seconds)...")
         print(f"Alarm will play if no manual movement detected for {timeout_minutes_str} minutes.")
         print(f"Dings will play after each auto-move cycle, increasing by 1 up to {max_ding_count}.\n")
+    
+    def _report_manual_movement(self, window, previous_pos, current_pos):
+        """
+        Log a check result where manual movement was detected
+        :param window: Window statistics from ActivitySampler.window_stats()
+        :param previous_pos: Position tuple (x, y) at the start of the window
+        :param current_pos: Position tuple (x, y) at the check
+        """
+        event_log.emit(
+            'check.manual',
+            f"{self._report_prefix}[Check #{self.check_count}] Mouse moved: "
+            f"{int(window['max_displacement'])}px max, "
+            f"{int(window['path_length'])}px path "
+            f"({previous_pos[0]}, {previous_pos[1]}) → ({current_pos[0]}, {current_pos[1]})",
+            session=self.name, check=self.check_count, previous=previous_pos, position=current_pos,
+            max_displacement=round(window['max_displacement'], 1), path_length=round(window['path_length'], 1),
+            samples=window['samples']
+        )
+    
+    def _report_idle(self, window, current_pos):
+        """
+        Log a check result where the mouse barely moved
+        :param window: Window statistics from ActivitySampler.window_stats()
+        :param current_pos: Position tuple (x, y) at the check
+        """
+        event_log.emit(
+            'check.idle',
+            f"{self._report_prefix}[Check #{self.check_count}] Mouse barely moved "
+            f"({int(window['max_displacement'])}px < "
+            f"{self.delta_threshold}px threshold over {window['samples']} samples)\n"
+            f"  Current position: ({current_pos[0]}, {current_pos[1]})",
+            session=self.name, check=self.check_count, position=current_pos,
+            max_displacement=round(window['max_displacement'], 1), path_length=round(window['path_length'], 1),
+            samples=window['samples']
+        )
+    
+    def _print_summary(self):
+        """Print final statistics at shutdown"""
+        # Let queued check/move records reach the console before the summary
+        event_log.flush()
+        print("\n=== Auto Mouse Mover Stopped ===")
+        print(f"Total checks performed: {self.check_count}")
+        status = self.alarm_manager.get_status_info()
+        print(f"Final consecutive auto-move count: {status['consecutive_auto_moves']}")
+        if self.activity_store is not None:
+            print(f"Activity history: {self.activity_store.summary()}")
+        cache_stats = self.cache.stats()
+        print(f"Trajectory cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['evictions']} evictions ({cache_stats['size']}/{cache_stats['maxsize']} paths)")
+        report = self.wakeup_report()
+        if report is not None:
+            print(report)
+    
+    def wakeup_report(self):
+        """
+        Describe the wakeups saved by the adaptive cadence
+        :return: Summary string, or None when not running adaptively
+        """
+        if self.adaptive is None or self.scheduler is None:
+            return None
+        fixed = self.adaptive.fixed_wakeups(self.scheduler.time(), self.check_interval, self.sampler.sample_rate)
+        saved = fixed - self.adaptive.wakeups
+        percent = 100.0 * saved / fixed if fixed else 0.0
+        return (f"Adaptive cadence: {self.adaptive.wakeups} wakeups vs {fixed} at the fixed cadence "
+                f"({saved} saved, {percent:.0f}%)")
+    
+    def status_metrics(self):
+        """
+        Metrics collector: alarm manager status and check count as gauge samples
+        :return: List of (name, help, labels, value) tuples
+        """
+        status = self.alarm_manager.get_status_info()
+        labels = {'session': self.name or 'default'}
+        return [
+            ('automover_checks', 'Checks performed since start', labels, self.check_count),
+            ('automover_consecutive_auto_moves', 'Consecutive auto-moves since the alarm fired',
+             labels, status['consecutive_auto_moves']),
+            ('automover_max_ding_count', 'Maximum dings per auto-move cycle', labels, status['max_ding_count']),
+            ('automover_timeout_seconds', 'Alarm timeout', labels, status['timeout_seconds']),
+            ('automover_check_interval_seconds', 'Seconds between checks', labels, status['check_interval_seconds']),
+        ]
+    
+    def begin_monitoring(self):
+        """
+        Reset check state and start the first sampling window
+        :return: Initial position tuple (x, y)
+        """
+        self.previous_pos = self.backend.position()
+        self.check_count = 0
+        self.sampler.start_window(self.previous_pos)
+        return self.previous_pos
+    
+    def run_check(self, current_pos, scheduler=None):
+        """
+        Evaluate the current sampling window, auto-move if the mouse was idle and start the next window
+        :param current_pos: Position tuple (x, y) at the check
+        :param scheduler: Optional Scheduler to play the auto-move on instead of blocking
+        :return: True if manual movement was detected, False if an auto-move was started
+        """
+        self.check_count += 1
+        # Adaptive windows can outlast the check interval; only movement within the last interval counts
+        window = self.sampler.window_stats(self.check_interval if self.adaptive is not None else None)
+        previous_pos = self.previous_pos
         
-        check_count = 0
+        # Check if mouse has moved
+        moved = self._has_moved(window)
+        self._record_check(moved, window, previous_pos, current_pos)
+        if moved:
+            # Manual mouse movement detected - reset alarm manager (resets both alarm and ding counters)
+            self.alarm_manager.on_manual_movement()
+            if self.scheduler is not None:
+                self._schedule_alarm()
+            
+            self.previous_pos = current_pos
+        else:
+            # Mouse hasn't moved much, move it to random location
+            if scheduler is None:
+                # Perform auto-move
+                self._move_to_random_location(current_pos)
+                self._finish_auto_move()
+            else:
+                # Frames run on the shared scheduler; sampling pauses until the move is done
+                self.moving = True
+                self._move_to_random_location_scheduled(current_pos, scheduler, self._finish_auto_move)
+            return moved
         
+        # Next window starts from the settled position
+        self.sampler.start_window(self.previous_pos)
+        return moved
+    
+    def _record_check(self, moved, window, previous_pos, current_pos):
+        """
+        Count, store and report the outcome of a check (shared by the scheduler and async runtimes)
+        :param moved: Whether the check saw manual movement
+        :param window: Window statistics from ActivitySampler.window_stats()
+        :param previous_pos: Position tuple (x, y) the window started from
+        :param current_pos: Position tuple (x, y) at the check
+        """
+        if moved:
+            MANUAL_MOVES.inc()
+            if self.activity_store is not None:
+                self.activity_store.record('manual', self.clock.time())
+            self._report_manual_movement(window, previous_pos, current_pos)
+        else:
+            AUTO_MOVES.inc()
+            if self.activity_store is not None:
+                self.activity_store.record('auto_move', self.clock.time())
+            self._report_idle(window, current_pos)
+    
+    def _finish_auto_move(self):
+        """Notify the alarm manager of an auto-move and start the next window from the new position"""
+        self.moving = False
+        
+        # Notify alarm manager of auto-move (plays dings and checks alarm)
+        self.alarm_manager.on_auto_move()
+        if self.scheduler is not None:
+            self._schedule_alarm()
+        
+        # Update previous position to new location
+        self.previous_pos = self.backend.position()
+        self.sampler.start_window(self.previous_pos)
+    
+    def attach(self, scheduler, sound_player):
+        """
+        Drive this mover from a Scheduler: position samples, checks, alarm deadlines and
+        ding cycles all become absolute monotonic deadline events
+        :param scheduler: Scheduler to run on (may be shared by many movers)
+        :param sound_player: SoundPlayerThread that plays ding cycles off the scheduler thread
+        """
+        self.scheduler = scheduler
+        self.sound_player = sound_player
+        self.alarm_manager.sound_dispatcher = self._schedule_dings
+        REGISTRY.register_collector(self.status_metrics)
+        
+        now = scheduler.time()
+        first_check = now + self.check_interval
+        self._next_check_deadline = first_check
+        if self.adaptive is not None:
+            self.adaptive.start(now)
+            self._schedule_adaptive_sample(now)
+        else:
+            first_sample = now + self.sampler.sample_interval
+            scheduler.call_at(first_sample, self._sample_tick, first_sample)
+        self._check_call = scheduler.call_at(first_check, self._check_tick, first_check)
+        self._schedule_alarm()
+        if self.activity_store is not None and self.activity_store.path is not None:
+            scheduler.call_later(SAVE_INTERVAL_SECONDS, self._save_activity_tick)
+    
+    def _sample_tick(self, deadline):
+        """Take one position sample (paused while auto-moving) and schedule the next one"""
+        if not self.running:
+            return
+        if not self.moving and not self.paused:
+            self.sampler.sample()
+        next_deadline = deadline + self.sampler.sample_interval
+        now = self.scheduler.time()
+        if next_deadline < now:
+            # Fell behind - resume from now instead of bursting
+            next_deadline = now + self.sampler.sample_interval
+        self.scheduler.call_at(next_deadline, self._sample_tick, next_deadline)
+    
+    def _save_activity_tick(self):
+        """Save the activity store to its file and schedule the next save"""
+        if not self.running:
+            return
+        self.save_activity()
+        self.scheduler.call_later(SAVE_INTERVAL_SECONDS, self._save_activity_tick)
+    
+    def save_activity(self):
+        """
+        Save the activity store to the file it was opened from (errors are logged, not raised)
+        :return: False if there is nothing to save or saving failed
+        """
+        if self.activity_store is None or self.activity_store.path is None:
+            return False
         try:
-            while self.running:
-                # Wait for check interval
-                time.sleep(self.check_interval)
-                
-                if not self.running:
-                    break
-                
-                # Get current position
-                current_pos = pyautogui.position()
-                check_count += 1
-                
-                # Check if mouse has moved
-                if self._has_moved(previous_pos, current_pos):
-                    # Manual mouse movement detected - reset alarm manager
-                    distance = self._get_distance(previous_pos, current_pos)
-                    print(f"[Check #{check_count}] Mouse moved: {int(distance)}px "
-                          f"({previous_pos[0]}, {previous_pos[1]}) → ({current_pos[0]}, {current_pos[1]})")
-                    
-                    # Reset alarm manager (resets both alarm and ding counters)
-                    self.alarm_manager.on_manual_movement()
-                    
-                    previous_pos = current_pos
-                else:
-                    # Mouse hasn't moved much, move it to random location
-                    distance = self._get_distance(previous_pos, current_pos)
-                    print(f"[Check #{check_count}] Mouse barely moved ({int(distance)}px < {self.delta_threshold}px threshold)")
-                    print(f"  Current position: ({current_pos[0]}, {current_pos[1]})")
-                    
-                    # Perform auto-move
-                    self._move_to_random_location(current_pos)
-                    
-                    # Notify alarm manager of auto-move (plays dings and checks alarm)
-                    self.alarm_manager.on_auto_move()
-                    
-                    # Update previous position to new location
-                    previous_pos = pyautogui.position()
+            self.activity_store.save()
+        except OSError as e:
+            event_log.emit('activity.save_failed', f"{self._report_prefix}Could not save activity file: {e}",
+                           session=self.name, path=self.activity_store.path, error=str(e))
+            return False
+        return True
+    
+    def _schedule_adaptive_sample(self, now):
+        """Schedule the next adaptive sample, or none if the window needs no more samples before the check"""
+        window_active = self._has_moved(self.sampler.window_stats())
+        until_check = self._next_check_deadline - now
+        idle_deadline = self.adaptive.idle_deadline()
+        until_idle = idle_deadline - now if idle_deadline is not None else None
+        interval = self.adaptive.next_sample_interval(window_active, until_check, until_idle)
+        if interval < until_check:
+            self._sample_call = self.scheduler.call_at(now + interval, self._adaptive_sample_tick)
+        else:
+            self._sample_call = None
+    
+    def _adaptive_sample_tick(self):
+        """Take one position sample and schedule the next one from the adaptive policy"""
+        self._sample_call = None
+        if not self.running:
+            return
+        self.adaptive.wakeups += 1
+        now = self.scheduler.time()
+        if not self.moving and not self.paused:
+            self.sampler.sample()
+            self._note_movement()
+            idle_deadline = self.adaptive.idle_deadline()
+            if idle_deadline is not None and idle_deadline <= now < self._next_check_deadline:
+                # Idle for a whole check interval since the last movement - check now, not at the backed-off deadline
+                if self._has_moved(self.sampler.window_stats()):
+                    # The check only looks at the last interval; earlier movement still resets the alarm
+                    self.alarm_manager.on_manual_movement(moved_at=self.adaptive.last_movement)
+                    self._schedule_alarm()
+                self.scheduler.cancel(self._check_call)
+                self._next_check_deadline = now
+                self._check_call = self.scheduler.call_at(now, self._check_tick, now)
+                return
+        self._schedule_adaptive_sample(now)
+    
+    def _note_movement(self):
+        """Remember when the pointer last moved in the current window (adaptive cadence)"""
+        changed_at = self.sampler.last_movement_time()
+        if changed_at is not None:
+            self.adaptive.last_movement = changed_at
+    
+    def _check_tick(self, deadline):
+        """Run one check and schedule the next one (fixed or adaptive cadence)"""
+        if not self.running:
+            return
+        CHECK_DRIFT.observe(self.scheduler.time() - deadline)
+        moved = False
+        if not self.moving and not self.paused:
+            started = time.perf_counter()
+            current_pos = self.sampler.sample()
+            if self.adaptive is not None:
+                self._note_movement()
+            moved = self.run_check(current_pos, scheduler=self.scheduler)
+            CHECK_DURATION.observe(time.perf_counter() - started)
+        now = self.scheduler.time()
+        if self.adaptive is not None:
+            self.adaptive.wakeups += 1
+            interval = self.adaptive.next_check_interval(moved, now, self.alarm_manager.next_alarm_deadline())
+        else:
+            interval = self.check_interval
+        # Absolute cadence: a slow move or check never pushes back later checks
+        next_deadline = deadline + interval
+        while next_deadline <= now:
+            next_deadline += interval
+        self._next_check_deadline = next_deadline
+        self._check_call = self.scheduler.call_at(next_deadline, self._check_tick, next_deadline)
+        if self.adaptive is not None:
+            # Restart sampling for the new window under the new check deadline
+            if self._sample_call is not None:
+                self.scheduler.cancel(self._sample_call)
+            self._schedule_adaptive_sample(now)
+    
+    def _schedule_alarm(self):
+        """(Re)schedule the alarm at its deadline, independent of the check cadence"""
+        if self._alarm_call is not None:
+            self.scheduler.cancel(self._alarm_call)
+        self._alarm_call = self.scheduler.call_at(self.alarm_manager.next_alarm_deadline(), self._alarm_tick)
+    
+    def _alarm_tick(self):
+        """Fire the alarm at its deadline (unless the user is active) and schedule the next one"""
+        self._alarm_call = None
+        if not self.running or self.paused:
+            return
+        if not self.defer_alarm_for_activity():
+            self.alarm_manager.check_alarm()
+        self._schedule_alarm()
+    
+    def defer_alarm_for_activity(self):
+        """
+        Look at the current sampling window before an alarm fires between checks: movement there is
+        manual activity the next check has not seen yet, so it resets the alarm instead (and the
+        window restarts, so the same movement never defers the alarm twice)
+        :return: True if manual movement was found and the alarm reset
+        """
+        if self.moving:
+            return False
+        current_pos = self.sampler.sample()
+        if not self._has_moved(self.sampler.window_stats()):
+            return False
+        self.alarm_manager.on_manual_movement()
+        self.previous_pos = current_pos
+        self.sampler.start_window(current_pos)
+        return True
+    
+    def pause(self):
+        """Stop checking, auto-moving and alarming until resume() (scheduler runtime)"""
+        if self.paused:
+            return
+        self.paused = True
+        if self._alarm_call is not None:
+            self.scheduler.cancel(self._alarm_call)
+            self._alarm_call = None
+        event_log.emit('mover.paused', f"{self._report_prefix}Paused", session=self.name)
+    
+    def resume(self):
+        """Resume after pause(); the alarm timeout starts over from now"""
+        if not self.paused:
+            return
+        self.paused = False
+        self.alarm_manager.reset()
+        self.previous_pos = self.backend.position()
+        self.sampler.start_window(self.previous_pos)
+        self._schedule_alarm()
+        event_log.emit('mover.resumed', f"{self._report_prefix}Resumed", session=self.name)
+    
+    def trigger_move(self):
+        """
+        Start a random move now, without counting it as an idle auto-move cycle (scheduler runtime)
+        :return: False if a move is already in progress
+        """
+        if self.moving:
+            return False
+        self.moving = True
+        self._move_to_random_location_scheduled(self.backend.position(), self.scheduler, self._finish_triggered_move)
+        return True
+    
+    def _finish_triggered_move(self):
+        """Start the next window from the position a triggered move ended at"""
+        self.moving = False
+        self.previous_pos = self.backend.position()
+        self.sampler.start_window(self.previous_pos)
+    
+    def update_settings(self, check_interval_seconds=None, delta_threshold=None, min_distance=None,
+                        max_distance=None, timeout_seconds=None):
+        """
+        Change settings while running; alarm state, counters and the current position are kept
+        :param check_interval_seconds: New time between checks (None = unchanged)
+        :param delta_threshold: New movement threshold in pixels (None = unchanged)
+        :param min_distance: New minimum random move distance (None = unchanged)
+        :param max_distance: New maximum random move distance (None = unchanged)
+        :param timeout_seconds: New alarm timeout (None = unchanged)
+        :raises ValueError: If a value is not finite, out of range, or min_distance would exceed
+                            max_distance (nothing is changed then)
+        """
+        # Validate everything before changing anything, so a rejected update leaves no partial state
+        for name, value in (('check_interval_seconds', check_interval_seconds), ('timeout_seconds', timeout_seconds)):
+            if value is not None and not (math.isfinite(value) and value > 0):
+                raise ValueError(f"{name} must be a finite number greater than 0")
+        for name, value in (('delta_threshold', delta_threshold), ('min_distance', min_distance),
+                            ('max_distance', max_distance)):
+            if value is not None and not (math.isfinite(value) and value >= 0):
+                raise ValueError(f"{name} must be a finite number of at least 0")
+        new_min = self.min_distance if min_distance is None else min_distance
+        new_max = self.max_distance if max_distance is None else max_distance
+        if new_min > new_max:
+            raise ValueError("min_distance must not exceed max_distance")
+        self.min_distance, self.max_distance = new_min, new_max
+        if delta_threshold is not None:
+            self.delta_threshold = delta_threshold
+        
+        if check_interval_seconds is not None:
+            self.check_interval = check_interval_seconds
+            if self.adaptive is not None:
+                self.adaptive.min_check_interval = check_interval_seconds
+                self.adaptive.max_check_interval = max(self.adaptive.max_check_interval, check_interval_seconds)
+                self.adaptive.check_interval = check_interval_seconds
+            longest_window = self.adaptive.max_check_interval if self.adaptive is not None else check_interval_seconds
+            capacity = window_capacity(longest_window, self.sampler.sample_rate)
+            if capacity > self.sampler.buffer.capacity:
+                self.sampler.resize(capacity)
+        self.alarm_manager.update_settings(timeout_seconds=timeout_seconds,
+                                           check_interval_seconds=check_interval_seconds)
+        
+        if self.scheduler is not None:
+            now = self.scheduler.time()
+            if check_interval_seconds is not None and self._check_call is not None:
+                # The next check moves to one new interval from now
+                self.scheduler.cancel(self._check_call)
+                self._next_check_deadline = now + check_interval_seconds
+                self._check_call = self.scheduler.call_at(self._next_check_deadline, self._check_tick,
+                                                          self._next_check_deadline)
+                if self.adaptive is not None:
+                    if self._sample_call is not None:
+                        self.scheduler.cancel(self._sample_call)
+                    self._schedule_adaptive_sample(now)
+            if timeout_seconds is not None and not self.paused:
+                self._schedule_alarm()
+        
+        event_log.emit('settings.changed',
+                       f"{self._report_prefix}Settings changed: check every {self.check_interval:g}s, "
+                       f"threshold {self.delta_threshold}px, distance {self.min_distance}-{self.max_distance}px, "
+                       f"timeout {self.alarm_manager.timeout_seconds:g}s, "
+                       f"max {self.alarm_manager.max_ding_count} dings",
+                       session=self.name, check_interval_seconds=self.check_interval,
+                       delta_threshold=self.delta_threshold, min_distance=self.min_distance,
+                       max_distance=self.max_distance, timeout_seconds=self.alarm_manager.timeout_seconds,
+                       max_ding_count=self.alarm_manager.max_ding_count)
+    
+    def _schedule_dings(self, count):
+        """Sound dispatcher: start a ding cycle as a deadline event played off the scheduler thread"""
+        self.scheduler.call_at(self.scheduler.time(), self.sound_player.play, count, self.alarm_manager.ding_duration,
+                               self.name)
+    
+    def start(self):
+        """Start monitoring and auto-moving mouse"""
+        # Get initial position
+        initial_pos = self.begin_monitoring()
+        self._print_banner(initial_pos)
+        
+        from sound_notifier import SoundPlayerThread
+        scheduler = Scheduler(self.clock)
+        sound_player = SoundPlayerThread(self.alarm_manager.sound_notifier)
+        self.attach(scheduler, sound_player)
+        
+        try:
+            scheduler.run()
         
         except KeyboardInterrupt:
             print("\n\nReceived interrupt signal...")
         
         finally:
-            print("\n=== Auto Mouse Mover Stopped ===")
-            print(f"Total checks performed: {check_count}")
-            status = self.alarm_manager.get_status_info()
-            print(f"Final consecutive auto-move count: {status['consecutive_auto_moves']}")
+            sound_player.stop()
+            REGISTRY.unregister_collector(self.status_metrics)
+            self.save_activity()
+            self._print_summary()
+    
+    def start_async(self):
+        """Start monitoring on an asyncio event loop (sampling, moves, alarms and sound run as separate tasks)"""
+        from async_runner import AsyncRunner
+        AsyncRunner(self).run()
 
 
 def main():
@@ -221,6 +886,50 @@ Examples:
   
   # Example: Check every 1 minute, max 20 dings per cycle (capped at 20)
   python auto_mouse_mover.py --interval 1.0 --timeout 30
+  
+  # Run headless against an in-memory virtual pointer (no display required)
+  python auto_mouse_mover.py --backend virtual --interval 0.033
+  
+  # Run on the asyncio runtime (dings and moves never delay the next check)
+  python auto_mouse_mover.py --async --interval 0.25
+  
+  # Serve Prometheus metrics on localhost:9105 and append JSONL snapshots every 30s
+  python auto_mouse_mover.py --metrics-port 9105 --metrics-file metrics.jsonl --metrics-interval 30
+  
+  # Check the options without touching the display or sound system
+  python auto_mouse_mover.py --interval 0.5 --timeout 10 --dry-run
+  
+  # Curved, human-like auto-moves (minimum-jerk velocity, slight overshoot) instead of straight lines
+  python auto_mouse_mover.py --path-style human
+  
+  # Replay random segments of recorded movement (see pointer_trace.py record) instead of straight jumps
+  python auto_mouse_mover.py --move-strategy trace --trace-library traces/
+  
+  # Keep the alarm escalation across restarts
+  python auto_mouse_mover.py --state-file ~/.auto_mouse_mover.state
+  
+  # Keep a per-minute/hour/day activity history (query it with activity_store.py)
+  python auto_mouse_mover.py --activity-file ~/.auto_mouse_mover.activity
+  
+  # Measure pointer latencies once (see calibration.py); later runs load the profile automatically
+  python calibration.py && python auto_mouse_mover.py
+  
+  # Run as a daemon controlled through a Unix socket (see control.py)
+  python auto_mouse_mover.py --daemon
+  python control.py set interval=1 timeout=10
+  
+  # Keep targets off a 48px taskbar at the bottom of a 1920x1080 screen and away from 150px corners
+  python auto_mouse_mover.py --exclude 0,1032,1920,48 --corner-size 150
+  
+  # Stretch checks up to 20 minutes while you are working, and sample at most every 30s while idle
+  python auto_mouse_mover.py --interval 5 --adaptive --max-interval 20 --max-sample-interval 30
+  
+  # Profile a running mover: SIGUSR1 starts/stops CPU profiling, SIGUSR2 diffs memory snapshots
+  python auto_mouse_mover.py --profile-dir ~/automover-profiles --profile-mode sample &
+  kill -USR1 $!    # ... wait ...    kill -USR1 $!
+  
+  # Also write every check/move/alarm as a JSON line (rotated at 5 MB, 3 backups kept)
+  python auto_mouse_mover.py --event-log events.jsonl --event-log-max-bytes 5000000
         '''
     )
     
@@ -259,6 +968,181 @@ Examples:
         help='Time in minutes before playing alarm if no manual movement (minimum: 0.167 = 10 seconds, default: 30.0)'
     )
     
+    parser.add_argument(
+        '--backend', '-b',
+        choices=sorted(BACKENDS),
+        default='pyautogui',
+        help='Pointer backend to use; "virtual" runs headless without a display (default: pyautogui)'
+    )
+    
+    parser.add_argument(
+        '--sample-rate', '-sr',
+        type=float,
+        default=2.0,
+        help='Position samples per second taken between checks (default: 2.0)'
+    )
+    
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Run on an asyncio event loop so moves and dings never delay the next check'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Validate the options, print the resulting configuration and exit without opening the display or sound'
+    )
+    
+    parser.add_argument(
+        '--move-strategy',
+        choices=AutoMouseMover.MOVE_STRATEGIES,
+        default='random',
+        help='Auto-move strategy: straight line to a random target, or replay a recorded trace segment (default: random)'
+    )
+    
+    parser.add_argument(
+        '--path-style',
+        choices=AutoMouseMover.PATH_STYLES,
+        default='line',
+        help='Shape of random auto-moves: straight line or curved human-like path (default: line)'
+    )
+    
+    parser.add_argument(
+        '--trace-library',
+        nargs='+',
+        default=None,
+        help='Trace files and/or directories of *.trace files for --move-strategy trace'
+    )
+    
+    parser.add_argument(
+        '--state-file',
+        default=None,
+        help='Journal alarm state to this file and restore it on startup (default: disabled)'
+    )
+    
+    parser.add_argument(
+        '--activity-file',
+        default=None,
+        help='Record check outcomes, alarms and dings with minute/hour/day rollups in this file (default: disabled)'
+    )
+    
+    parser.add_argument(
+        '--tuning-file',
+        default=DEFAULT_PROFILE_PATH,
+        help=f'Load the backend\'s pointer timing profile from this file if it has one (written by calibration.py; '
+             f'default: {DEFAULT_PROFILE_PATH})'
+    )
+    
+    parser.add_argument(
+        '--no-tuning',
+        action='store_true',
+        help='Ignore the tuning file and use the default frame rate and pyautogui timing'
+    )
+    
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Listen on a local control socket for status/pause/resume/move/set commands (see control.py)'
+    )
+    
+    parser.add_argument(
+        '--socket',
+        default=None,
+        help='Control socket path for --daemon (default: auto-mouse-mover-<uid>.sock in $XDG_RUNTIME_DIR or the temp dir)'
+    )
+    
+    parser.add_argument(
+        '--exclude',
+        type=parse_rect,
+        action='append',
+        default=[],
+        metavar='X,Y,W,H',
+        help='Screen area random targets must avoid, e.g. a taskbar (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--corner-size',
+        type=int,
+        default=DEFAULT_CORNER_SIZE,
+        help=f'Side in pixels of the square kept free at each monitor corner (hot corners, failsafe; '
+             f'default: {DEFAULT_CORNER_SIZE}, 0 = none)'
+    )
+    
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Back off checks and samples while you are active and tighten them as an auto-move or alarm nears'
+    )
+    
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        default=None,
+        help='Longest check interval in minutes with --adaptive (default: 4x --interval)'
+    )
+    
+    parser.add_argument(
+        '--max-sample-interval',
+        type=float,
+        default=None,
+        help='Longest gap between position samples in seconds with --adaptive (default: a quarter of --interval)'
+    )
+    
+    parser.add_argument(
+        '--profile-dir',
+        default=None,
+        help='Directory for profiles written on SIGUSR1 and memory diffs on SIGUSR2 (default: the temp dir)'
+    )
+    
+    parser.add_argument(
+        '--profile-mode',
+        choices=('cprofile', 'sample'),
+        default='cprofile',
+        help='CPU profiler toggled by SIGUSR1: cProfile, or a low-overhead stack sampler (default: cprofile)'
+    )
+    
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=None,
+        help='Serve Prometheus metrics on this localhost port (default: disabled)'
+    )
+    
+    parser.add_argument(
+        '--metrics-file',
+        default=None,
+        help='Append periodic JSONL metric snapshots to this file (default: disabled)'
+    )
+    
+    parser.add_argument(
+        '--metrics-interval',
+        type=float,
+        default=60.0,
+        help='Seconds between JSONL metric snapshots (default: 60)'
+    )
+    
+    parser.add_argument(
+        '--event-log',
+        default=None,
+        help='Write structured check/move/alarm events to this JSONL file (default: disabled)'
+    )
+    
+    parser.add_argument(
+        '--event-log-max-bytes',
+        type=int,
+        default=event_log.DEFAULT_MAX_BYTES,
+        help=f'Rotate the event log when it reaches this size (default: {event_log.DEFAULT_MAX_BYTES})'
+    )
+    
+    parser.add_argument(
+        '--event-log-backups',
+        type=int,
+        default=event_log.DEFAULT_BACKUP_COUNT,
+        help=f'Rotated event log files to keep (default: {event_log.DEFAULT_BACKUP_COUNT})'
+    )
+    
     args = parser.parse_args()
     
     # Convert minutes to seconds and validate minimum
@@ -275,20 +1159,193 @@ Examples:
         print(f"       You provided: {args.timeout} minutes")
         sys.exit(1)
     
+    if args.sample_rate <= 0:
+        print("Error: Sample rate must be greater than 0")
+        print(f"       You provided: {args.sample_rate}")
+        sys.exit(1)
+    
+    if args.metrics_interval <= 0:
+        print("Error: Metrics interval must be greater than 0")
+        print(f"       You provided: {args.metrics_interval}")
+        sys.exit(1)
+    
+    if args.corner_size < 0:
+        print("Error: Corner size must not be negative")
+        print(f"       You provided: {args.corner_size}")
+        sys.exit(1)
+    
+    if args.daemon and args.use_async:
+        print("Error: --daemon is only supported on the scheduler runtime (drop --async)")
+        sys.exit(1)
+    
+    if args.daemon and not hasattr(socket, 'AF_UNIX'):
+        print("Error: --daemon needs Unix domain sockets, which this platform does not support")
+        sys.exit(1)
+    
+    if args.adaptive and args.use_async:
+        print("Error: --adaptive is only supported on the scheduler runtime (drop --async)")
+        sys.exit(1)
+    
+    if args.max_interval is not None and args.max_interval < args.interval:
+        print("Error: Max interval must be at least the check interval")
+        print(f"       You provided: {args.max_interval} minutes (interval: {args.interval} minutes)")
+        sys.exit(1)
+    
+    if args.profile_dir is not None and not os.path.isdir(os.path.expanduser(args.profile_dir)):
+        print(f"Error: Profile directory does not exist: {args.profile_dir}")
+        sys.exit(1)
+    
+    if args.max_sample_interval is not None and args.max_sample_interval <= 0:
+        print("Error: Max sample interval must be greater than 0")
+        print(f"       You provided: {args.max_sample_interval}")
+        sys.exit(1)
+    
     # Convert minutes to seconds
     check_interval_seconds = args.interval * 60
     timeout_seconds = args.timeout * 60
     
+    adaptive = None
+    if args.adaptive:
+        max_check_factor = args.max_interval / args.interval if args.max_interval is not None else 4.0
+        adaptive = AdaptiveCadence.for_mover(check_interval_seconds, args.sample_rate, max_check_factor,
+                                             args.max_sample_interval)
+    
+    trace_library = None
+    if args.move_strategy == 'trace':
+        if not args.trace_library:
+            print("Error: --move-strategy trace needs --trace-library")
+            sys.exit(1)
+        try:
+            trace_library = TraceLibrary(args.trace_library)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load trace library: {e}")
+            sys.exit(1)
+    
+    if args.dry_run:
+        # Validation only: no pointer backend, display connection or sound backend is opened
+        status = AlarmManager(timeout_seconds=timeout_seconds,
+                              check_interval_seconds=check_interval_seconds).get_status_info()
+        print("Configuration OK (dry run):")
+        print(f"  - Check interval: {check_interval_seconds:g} seconds")
+        print(f"  - Movement threshold: {args.threshold} pixels")
+        print(f"  - Position sample rate: {args.sample_rate:g}/s")
+        print(f"  - Random move distance: {args.min_distance}-{args.max_distance} pixels")
+        print(f"  - Alarm timeout: {status['timeout_minutes']} minutes ({timeout_seconds:g} seconds)")
+        print(f"  - Max ding count per cycle: {status['max_ding_count']}")
+        print(f"  - Pointer backend: {args.backend}")
+        print(f"  - Auto-move: {args.move_strategy} strategy, {args.path_style} path")
+        print(f"  - Target exclusions: {len(args.exclude)} zone(s), {args.corner_size}px corners")
+        if adaptive is not None:
+            print(f"  - Adaptive cadence: checks {adaptive.min_check_interval:g}-{adaptive.max_check_interval:g}s, "
+                  f"samples {adaptive.min_sample_interval:g}-{adaptive.max_sample_interval:g}s")
+        print(f"  - Runtime: {'asyncio' if args.use_async else 'scheduler'}")
+        if args.state_file is not None:
+            print(f"  - State file: {os.path.expanduser(args.state_file)}")
+        if args.activity_file is not None:
+            print(f"  - Activity file: {os.path.expanduser(args.activity_file)}")
+        print(f"  - Tuning file: {'disabled' if args.no_tuning else os.path.expanduser(args.tuning_file)}")
+        if args.daemon:
+            from control import default_socket_path
+            print(f"  - Control socket: {args.socket or default_socket_path()}")
+        print(f"  - Profiling: {args.profile_mode} on SIGUSR1, memory diffs on SIGUSR2, reports in "
+              f"{os.path.expanduser(args.profile_dir) if args.profile_dir else 'the temp directory'}")
+        return
+    
+    state_journal = None
+    if args.state_file is not None:
+        from state_journal import StateJournal
+        try:
+            state_journal = StateJournal(os.path.expanduser(args.state_file))
+        except OSError as e:
+            print(f"Error: Could not open state file: {e}")
+            sys.exit(1)
+    
+    activity_store = None
+    if args.activity_file is not None:
+        try:
+            activity_store = ActivityStore.open(os.path.expanduser(args.activity_file))
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not open activity file: {e}")
+            sys.exit(1)
+    
+    # Keep pyautogui failsafe on - you can move mouse to top-left corner to stop
+    backend_options = {'failsafe': True} if args.backend == 'pyautogui' else {}
+    backend = create_backend(args.backend, **backend_options)
+    
+    tuning = None
+    if not args.no_tuning:
+        try:
+            tuning = load_profile(backend, args.tuning_file)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not load tuning profile: {e}")
+            sys.exit(1)
+    if tuning is not None:
+        print(f"Tuning profile: {tuning.frame_rate} frames/s (measured {tuning.update_rate:.0f} moves/s on {tuning.host})")
+        if args.sample_rate > tuning.max_sample_rate:
+            print(f"Warning: --sample-rate {args.sample_rate:g} is above the {tuning.max_sample_rate:g}/s "
+                  f"this backend's position() latency allows")
+    
     # Create and start auto mouse mover
     mover = AutoMouseMover(
         check_interval_seconds=check_interval_seconds,
         delta_threshold=args.threshold,
         min_distance=args.min_distance,
         max_distance=args.max_distance,
-        timeout_seconds=timeout_seconds
+        timeout_seconds=timeout_seconds,
+        backend=backend,
+        sample_rate=args.sample_rate,
+        move_strategy=args.move_strategy,
+        trace_library=trace_library,
+        path_style=args.path_style,
+        adaptive=adaptive,
+        exclusions=args.exclude,
+        corner_size=args.corner_size,
+        state_journal=state_journal,
+        activity_store=activity_store,
+        tuning=tuning
     )
     
-    mover.start()
+    try:
+        exporters = start_exporters(args.metrics_port, args.metrics_file, args.metrics_interval)
+    except OSError as e:
+        print(f"Error: Could not start metrics exporter: {e}")
+        sys.exit(1)
+    
+    if args.event_log is not None:
+        try:
+            event_log.configure(jsonl_path=args.event_log, max_bytes=args.event_log_max_bytes,
+                                backup_count=args.event_log_backups)
+        except OSError as e:
+            print(f"Error: Could not open event log: {e}")
+            sys.exit(1)
+    
+    # Always armed, so a misbehaving long-running mover can be inspected without a restart
+    from profiling import Profiler
+    profiler = Profiler(os.path.expanduser(args.profile_dir) if args.profile_dir else None, args.profile_mode)
+    profiler.install_signal_handlers()
+    
+    control_server = None
+    if args.daemon:
+        from control import ControlServer
+        try:
+            control_server = ControlServer(mover, args.socket, profiler)
+        except OSError as e:
+            print(f"Error: Could not open control socket: {e}")
+            sys.exit(1)
+    
+    try:
+        if args.use_async:
+            mover.start_async()
+        else:
+            mover.start()
+    finally:
+        profiler.stop()
+        if control_server is not None:
+            control_server.stop()
+        if state_journal is not None:
+            state_journal.close()
+        for exporter in exporters:
+            exporter.stop()
 
 
 if __name__ == "__main__":
@@ -2,17 +2,17 @@
 """
 Basic mouse move examples
 """
+import event_log
 from mouse_mover import MouseMover
-import pyautogui
 import time
 
-def basic_move():
-    mover = MouseMover()
+def basic_move(backend=None):
+    mover = MouseMover(backend)
     
     print("=== Basic Mouse Move Examples ===\n")
     
     # Get screen dimensions
-    screen_width, screen_height = pyautogui.size()
+    screen_width, screen_height = mover.backend.size()
     print(f"Screen size: {screen_width}x{screen_height}\n")
     
     # Example 1: Move to center of screen
@@ -45,6 +45,7 @@ def basic_move():
     print("7. Moving relative (-50, -50):")
     mover.move_relative(-50, -50)
     
+    event_log.flush()
     print("\n=== Basic examples completed ===")
 
 if __name__ == "__main__":
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Measures movement, sampling and alarm paths against a virtual pointer and compares them with a stored baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import event_log  # noqa: E402
+from alarm_manager import AlarmManager  # noqa: E402
+from auto_mouse_mover import AutoMouseMover  # noqa: E402
+from mouse_mover import MouseMover  # noqa: E402
+from pointer_backend import VirtualPointerBackend  # noqa: E402
+from screen_geometry import ScreenGeometry  # noqa: E402
+from simulation import Simulation  # noqa: E402
+from trajectory_cache import TrajectoryCache  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+
+# Modules that must stay unloaded until a pointer/sound backend or exporter is actually used
+STARTUP_HEAVY_MODULES = ('pyautogui', 'Xlib', 'winsound', 'sound_notifier', 'subprocess', 'asyncio', 'http.server')
+
+
+def _time_per_call(fn, number, repeat):
+    """
+    Median cost of one call over repeat timing runs
+    :param fn: Callable without arguments
+    :param number: Calls per timing run
+    :param repeat: Timing runs
+    :return: Microseconds per call
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - start) / number)
+    return statistics.median(runs) * 1e6
+
+
+def bench_move_to(quick):
+    mover = MouseMover(VirtualPointerBackend())
+    return _time_per_call(lambda: mover.move_to(500, 300), 2000 if quick else 20000, 5)
+
+
+def bench_move_relative(quick):
+    mover = MouseMover(VirtualPointerBackend())
+    state = {'sign': 1}
+
+    def step():
+        # Alternate directions so the pointer stays in place
+        state['sign'] = -state['sign']
+        mover.move_relative(state['sign'], state['sign'])
+
+    return _time_per_call(step, 2000 if quick else 20000, 5)
+
+
+def _pattern_error(play, duration, repeat):
+    """
+    Median absolute difference between achieved and requested pattern duration
+    :param play: Callable(mover) playing one pattern of the given duration
+    :param duration: Requested duration in seconds
+    :param repeat: Runs
+    :return: Milliseconds
+    """
+    # Realtime virtual pointer: playback paces itself like a real display
+    mover = MouseMover(VirtualPointerBackend(realtime=True), cache=TrajectoryCache())
+    errors = []
+    for _ in range(repeat):
+        play(mover)
+        errors.append(abs(mover.last_playback.achieved_duration - duration))
+    return statistics.median(errors) * 1e3
+
+
+def bench_move_circle_duration_error(quick):
+    duration = 0.25 if quick else 1.0
+    return _pattern_error(lambda m: m.move_circle(960, 540, 100, steps=60, duration=duration), duration, 3)
+
+
+def bench_move_square_duration_error(quick):
+    duration = 0.25 if quick else 1.0
+    return _pattern_error(lambda m: m.move_square(860, 440, 200, duration=duration), duration, 3)
+
+
+def _auto_mover():
+    return AutoMouseMover(check_interval_seconds=60, timeout_seconds=600, backend=VirtualPointerBackend(),
+                          install_signal_handlers=False)
+
+
+def bench_generate_random_position(quick):
+    mover = _auto_mover()
+    pos = (960, 540)
+    return _time_per_call(lambda: mover._generate_random_position(pos), 10000 if quick else 100000, 5)
+
+
+def bench_sample_annulus_corner(quick):
+    # Pointer in a corner of a two-monitor layout with a taskbar: most of the ring is off-screen
+    geometry = ScreenGeometry([(0, 0, 1920, 1080), (1920, 0, 1280, 1024)], [(0, 1032, 1920, 48)])
+    return _time_per_call(lambda: geometry.sample_annulus(60, 60, 100, 500), 5000 if quick else 50000, 5)
+
+
+def bench_get_distance(quick):
+    mover = _auto_mover()
+    a, b = (100, 200), (640, 480)
+    return _time_per_call(lambda: mover._get_distance(a, b), 20000 if quick else 200000, 5)
+
+
+def _alarm_manager(dinging):
+    # The sound dispatcher hook replaces playback, so only the bookkeeping is measured
+    manager = AlarmManager(timeout_seconds=3600, check_interval_seconds=60, sound_dispatcher=lambda count: None)
+    manager.alarm_triggered = dinging
+    return manager
+
+
+def bench_on_auto_move_before_alarm(quick):
+    manager = _alarm_manager(dinging=False)
+    return _time_per_call(manager.on_auto_move, 5000 if quick else 50000, 5)
+
+
+def bench_on_auto_move_dinging(quick):
+    manager = _alarm_manager(dinging=True)
+    return _time_per_call(manager.on_auto_move, 5000 if quick else 50000, 5)
+
+
+def bench_simulation_day(quick):
+    # Whole scheduler runtime (2/s samples, checks, moves, alarm, dings) on a virtual clock
+    hours = 4 if quick else 24
+    runs = []
+    for _ in range(3):
+        result = Simulation([('manual', 7200), ('idle', 3600)], hours * 3600, seed=1).run()
+        runs.append(result.elapsed_seconds * 24 / hours)
+    return statistics.median(runs) * 1e3
+
+
+def _run_python_ms(args, repeat):
+    """
+    Median wall time of a fresh interpreter running args from the repo root, minus bare interpreter startup
+    :param args: Arguments after the interpreter
+    :param repeat: Runs
+    :return: Milliseconds
+    """
+    def wall(command):
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + command, cwd=REPO_ROOT, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            runs.append(time.perf_counter() - start)
+        return statistics.median(runs)
+
+    return max(0.0, wall(args) - wall(['-c', 'pass'])) * 1e3
+
+
+def bench_startup_import(quick):
+    return _run_python_ms(['-c', 'import auto_mouse_mover, fleet'], 5 if quick else 15)
+
+
+def bench_startup_help(quick):
+    return _run_python_ms(['auto_mouse_mover.py', '--help'], 5 if quick else 15)
+
+
+def bench_startup_heavy_modules(quick):
+    # Number of heavy modules loaded by argument parsing, validation and a dry run (must stay 0)
+    code = ("import sys, auto_mouse_mover, fleet\n"
+            "sys.argv = ['auto_mouse_mover.py', '--dry-run']\n"
+            "auto_mouse_mover.main()\n"
+            f"print(sum(name in sys.modules for name in {STARTUP_HEAVY_MODULES!r}), file=sys.stderr)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return float(result.stderr.strip().splitlines()[-1])
+
+
+# name -> (function, unit, absolute slack tolerated on top of the relative tolerance)
+BENCHMARKS = {
+    'mouse_mover.move_to': (bench_move_to, 'us/call', 1.0),
+    'mouse_mover.move_relative': (bench_move_relative, 'us/call', 1.0),
+    'mouse_mover.move_circle.duration_error': (bench_move_circle_duration_error, 'ms', 5.0),
+    'mouse_mover.move_square.duration_error': (bench_move_square_duration_error, 'ms', 5.0),
+    'auto_mouse_mover.generate_random_position': (bench_generate_random_position, 'us/call', 0.2),
+    'screen_geometry.sample_annulus.corner': (bench_sample_annulus_corner, 'us/call', 1.0),
+    'auto_mouse_mover.get_distance': (bench_get_distance, 'us/call', 0.1),
+    'alarm_manager.on_auto_move.before_alarm': (bench_on_auto_move_before_alarm, 'us/call', 1.0),
+    'alarm_manager.on_auto_move.dinging': (bench_on_auto_move_dinging, 'us/call', 1.0),
+    'simulation.day': (bench_simulation_day, 'ms/day', 50.0),
+    'startup.import': (bench_startup_import, 'ms', 10.0),
+    'startup.help': (bench_startup_help, 'ms', 10.0),
+    'startup.heavy_modules_loaded': (bench_startup_heavy_modules, 'modules', 0.0),
+}
+
+
+def run(selected, quick):
+    """
+    Run benchmarks
+    :param selected: Benchmark names to run
+    :param quick: Use fewer iterations
+    :return: Results dictionary
+    """
+    results = {}
+    for name in selected:
+        fn, unit, _ = BENCHMARKS[name]
+        value = fn(quick)
+        results[name] = {'value': round(value, 4), 'unit': unit}
+        print(f"{name:<45} {value:>10.3f} {unit}", file=sys.stderr)
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'results': results
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Compare results with a baseline (lower is better for every benchmark)
+    :param report: Results from run()
+    :param baseline: Baseline in the same format
+    :param tolerance: Allowed relative slowdown (0.25 = 25%)
+    :return: List of regression descriptions
+    """
+    regressions = []
+    for name, result in report['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        slack = BENCHMARKS[name][2]
+        limit = reference['value'] * (1 + tolerance) + slack
+        status = 'REGRESSION' if result['value'] > limit else 'ok'
+        print(f"{status:<10} {name:<45} {result['value']:>10.3f} vs {reference['value']:>10.3f} {result['unit']}",
+              file=sys.stderr)
+        if result['value'] > limit:
+            regressions.append(f"{name}: {result['value']:.3f} {result['unit']} "
+                               f"(baseline {reference['value']:.3f}, limit {limit:.3f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the py-mouse-robot benchmark suite')
+    parser.add_argument('benchmarks', nargs='*', help='Benchmark names to run (default: all)')
+    parser.add_argument('--list', action='store_true', help='List benchmark names and exit')
+    parser.add_argument('--quick', action='store_true', help='Fewer iterations (for CI smoke runs)')
+    parser.add_argument('--output', '-o', help='Write the JSON results here (default: stdout)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON to compare with')
+    parser.add_argument('--no-compare', action='store_true', help='Skip the baseline comparison')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative slowdown before a regression is reported (default: {DEFAULT_TOLERANCE})')
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(BENCHMARKS))
+        return
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    # Keep move/alarm messages out of the measurements and the output
+    event_log.configure(console=False)
+
+    report = run(args.benchmarks or list(BENCHMARKS), args.quick)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    if args.no_compare or not os.path.exists(args.baseline):
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):", file=sys.stderr)
+        for line in regressions:
+            print(f"  - {line}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Calibration Module
+Measures what pointer calls really cost on this host (move latency, position read-back latency,
+sustained update rate) and turns the numbers into a tuning profile: the frame rate paths are played
+at, the fastest useful position sample rate and pyautogui's global timing knobs (PAUSE,
+MINIMUM_DURATION, MINIMUM_SLEEP).
+
+Profiles are stored as JSON, one per backend and display, so one file can hold the profiles of an
+X11 desktop, several Xvfb displays and the headless backend side by side.
+"""
+import json
+import os
+import socket
+import sys
+import time
+from playback import DEFAULT_FRAME_RATE
+
+PROFILE_VERSION = 1
+DEFAULT_PROFILE_PATH = '~/.auto_mouse_mover.tuning.json'
+DEFAULT_SAMPLES = 200
+# Seconds of back-to-back moves used to measure the sustained update rate
+DEFAULT_RATE_SECONDS = 1.0
+# Pixels the pointer is nudged by while measuring (it is put back afterwards)
+NUDGE_PIXELS = 2
+# Longest wait for position() to report a move before the read-back counts as failed
+READBACK_TIMEOUT_SECONDS = 0.05
+# Share of a frame (or sample interval) a p95 move (or position read) may take
+FRAME_BUDGET = 0.5
+MIN_FRAME_RATE = 10
+MAX_SAMPLE_RATE = 100.0
+
+
+def _percentiles(values):
+    """p50/p95/max of a list of latencies, in seconds"""
+    if not values:
+        return {'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        'p50': ordered[int(round(0.50 * last))],
+        'p95': ordered[int(round(0.95 * last))],
+        'max': ordered[last],
+    }
+
+
+def profile_key(backend):
+    """
+    Key of a backend's profile: its name, plus the display for per-display backends (e.g. 'xlib:1')
+    :param backend: PointerBackend
+    :return: Key string
+    """
+    display = getattr(backend, 'display_name', None)
+    return f"{backend.name}{display}" if display else backend.name
+
+
+class TuningProfile:
+    """Measured pointer latencies of one backend and the timing settings derived from them"""
+
+    def __init__(self, backend, move_latency, position_latency, readback_latency, readback_failures,
+                 update_rate, samples, host=None, created=None):
+        """
+        Initialize a profile (usually via calibrate() or load_profile())
+        :param backend: Profile key of the measured backend (see profile_key)
+        :param move_latency: Dictionary p50/p95/max of move_to() call times in seconds
+        :param position_latency: Dictionary p50/p95/max of position() call times in seconds
+        :param readback_latency: Dictionary p50/p95/max of the time until position() reports a move
+        :param readback_failures: Moves position() did not report within READBACK_TIMEOUT_SECONDS
+        :param update_rate: Sustained move_to() calls per second
+        :param samples: Calls measured per latency
+        :param host: Host name the profile was measured on (default: this host)
+        :param created: Wall-clock time of the measurement (default: now)
+        """
+        self.backend = backend
+        self.move_latency = move_latency
+        self.position_latency = position_latency
+        self.readback_latency = readback_latency
+        self.readback_failures = readback_failures
+        self.update_rate = update_rate
+        self.samples = samples
+        self.host = host if host is not None else socket.gethostname()
+        self.created = created if created is not None else time.time()
+
+    @property
+    def frame_rate(self):
+        """Frames per second for path playback: as smooth as possible while a p95 move fits in half a frame"""
+        limit = DEFAULT_FRAME_RATE
+        if self.move_latency['p95'] > 0:
+            limit = min(limit, FRAME_BUDGET / self.move_latency['p95'])
+        if self.update_rate > 0:
+            limit = min(limit, FRAME_BUDGET * self.update_rate)
+        return max(MIN_FRAME_RATE, int(limit))
+
+    @property
+    def max_sample_rate(self):
+        """Position samples per second above which reading the position takes more than half the interval"""
+        if self.position_latency['p95'] <= 0:
+            return MAX_SAMPLE_RATE
+        return min(MAX_SAMPLE_RATE, round(FRAME_BUDGET / self.position_latency['p95'], 1))
+
+    @property
+    def pyautogui_settings(self):
+        """
+        pyautogui globals matching the frame rate: no implicit pause after calls, tweens stepped at
+        the frame interval, and moves shorter than two frames done as a single jump
+        """
+        frame_interval = 1.0 / self.frame_rate
+        return {
+            'PAUSE': 0.0,
+            'MINIMUM_SLEEP': round(frame_interval, 4),
+            'MINIMUM_DURATION': round(2 * frame_interval, 4),
+        }
+
+    def to_dict(self):
+        """Profile as a JSON-serializable dictionary (measurements plus the derived settings)"""
+        return {
+            'version': PROFILE_VERSION,
+            'backend': self.backend,
+            'host': self.host,
+            'created': self.created,
+            'samples': self.samples,
+            'move_latency': self.move_latency,
+            'position_latency': self.position_latency,
+            'readback_latency': self.readback_latency,
+            'readback_failures': self.readback_failures,
+            'update_rate': self.update_rate,
+            'frame_rate': self.frame_rate,
+            'max_sample_rate': self.max_sample_rate,
+            'pyautogui': self.pyautogui_settings,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a profile from to_dict() output (derived settings are recomputed)
+        :param data: Dictionary
+        :return: TuningProfile
+        :raises ValueError: If the dictionary is not a profile of a supported version
+        """
+        try:
+            if data['version'] != PROFILE_VERSION:
+                raise ValueError(f"unsupported tuning profile version {data['version']}")
+            return cls(data['backend'], data['move_latency'], data['position_latency'], data['readback_latency'],
+                       data['readback_failures'], data['update_rate'], data['samples'],
+                       host=data['host'], created=data['created'])
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"invalid tuning profile: {e}")
+
+    def summary(self):
+        """Human readable measurements and derived settings"""
+        def ms(stats):
+            return f"p50 {stats['p50'] * 1000:.3f}ms, p95 {stats['p95'] * 1000:.3f}ms, max {stats['max'] * 1000:.3f}ms"
+        knobs = ', '.join(f"{name}={value:g}" for name, value in self.pyautogui_settings.items())
+        return '\n'.join([
+            f"Backend {self.backend} on {self.host} ({self.samples} samples per measurement)",
+            f"  move_to():      {ms(self.move_latency)}",
+            f"  position():     {ms(self.position_latency)}",
+            f"  read-back:      {ms(self.readback_latency)}, {self.readback_failures} not seen "
+            f"within {READBACK_TIMEOUT_SECONDS * 1000:g}ms",
+            f"  update rate:    {self.update_rate:.0f} moves/s",
+            f"  -> frame rate {self.frame_rate}/s, sample rate up to {self.max_sample_rate:g}/s, "
+            f"pyautogui {knobs}",
+        ])
+
+
+def calibrate(backend, samples=DEFAULT_SAMPLES, rate_seconds=DEFAULT_RATE_SECONDS):
+    """
+    Measure a backend by nudging the pointer a couple of pixels back and forth; the pointer is put
+    back where it was afterwards
+    :param backend: PointerBackend to measure
+    :param samples: Calls timed for each latency
+    :param rate_seconds: Seconds of back-to-back moves for the update rate
+    :return: TuningProfile
+    :raises ValueError: If samples or rate_seconds is not positive
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+    if rate_seconds <= 0:
+        raise ValueError("rate_seconds must be greater than 0")
+    perf_counter = time.perf_counter
+    origin = backend.position()
+    width, height = backend.size()
+    # Nudge towards the screen center so the pointer never touches an edge (or the failsafe corner)
+    step_x = NUDGE_PIXELS if origin[0] < width // 2 else -NUDGE_PIXELS
+    step_y = NUDGE_PIXELS if origin[1] < height // 2 else -NUDGE_PIXELS
+    targets = ((origin[0] + step_x, origin[1] + step_y), origin)
+
+    try:
+        move_times = []
+        readback_times = []
+        readback_failures = 0
+        for i in range(samples):
+            target = targets[i % 2]
+            started = perf_counter()
+            backend.move_to(*target)
+            moved = perf_counter()
+            move_times.append(moved - started)
+            # Poll until the move is visible; the first read usually already shows it
+            while tuple(backend.position()) != target:
+                if perf_counter() - moved > READBACK_TIMEOUT_SECONDS:
+                    readback_failures += 1
+                    break
+            else:
+                readback_times.append(perf_counter() - moved)
+
+        position_times = []
+        for _ in range(samples):
+            started = perf_counter()
+            backend.position()
+            position_times.append(perf_counter() - started)
+
+        calls = 0
+        started = perf_counter()
+        deadline = started + rate_seconds
+        while True:
+            backend.move_to(*targets[calls % 2])
+            calls += 1
+            now = perf_counter()
+            if now >= deadline:
+                break
+        update_rate = calls / (now - started)
+    finally:
+        backend.move_to(*origin)
+
+    return TuningProfile(profile_key(backend), _percentiles(move_times), _percentiles(position_times),
+                         _percentiles(readback_times), readback_failures, round(update_rate, 1), samples)
+
+
+def _read_profiles(path):
+    """Profiles dictionary of a tuning file ({} if it does not exist)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ValueError(f"{path}: not a tuning file ({e})")
+    if not isinstance(data, dict) or not isinstance(data.get('profiles'), dict):
+        raise ValueError(f"{path}: not a tuning file")
+    return data['profiles']
+
+
+def save_profile(profile, path=DEFAULT_PROFILE_PATH):
+    """
+    Store a profile in a tuning file, replacing the previous profile of the same backend
+    :param profile: TuningProfile
+    :param path: Tuning file ('~' is expanded)
+    :raises ValueError: If the existing file is not a tuning file
+    :raises OSError: If the file cannot be written
+    """
+    path = os.path.expanduser(path)
+    profiles = _read_profiles(path)
+    profiles[profile.backend] = profile.to_dict()
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'profiles': profiles}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(temp_path, path)
+
+
+def load_profile(backend, path=DEFAULT_PROFILE_PATH):
+    """
+    Load the profile measured for a backend
+    :param backend: PointerBackend (matched by profile_key)
+    :param path: Tuning file ('~' is expanded)
+    :return: TuningProfile, or None if the file does not exist or has no profile for the backend
+    :raises ValueError: If the file or the profile is invalid
+    :raises OSError: If the file exists but cannot be read
+    """
+    path = os.path.expanduser(path)
+    data = _read_profiles(path).get(profile_key(backend))
+    if data is None:
+        return None
+    try:
+        return TuningProfile.from_dict(data)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}")
+
+
+def main():
+    """Measure the pointer on this host and store the tuning profile"""
+    import argparse
+    from pointer_backend import BACKENDS, create_backend
+
+    parser = argparse.ArgumentParser(
+        description='Measure pointer latencies on this host and store a tuning profile for the movers',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+The pointer is nudged by 2 pixels while measuring and put back afterwards. mouse_mover.py and
+auto_mouse_mover.py load the profile of their backend from the tuning file on startup.
+
+Examples:
+  # Calibrate the default (pyautogui) backend
+  python calibration.py
+
+  # Calibrate one Xvfb display for fleet mode
+  python calibration.py --backend xlib --display :1
+
+  # Only print the measurements
+  python calibration.py --no-save
+        '''
+    )
+    parser.add_argument('--backend', '-b', choices=sorted(BACKENDS), default='pyautogui',
+                        help='Pointer backend to measure (default: pyautogui)')
+    parser.add_argument('--display', default=None, help='X display for the xlib backend (default: $DISPLAY)')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                        help=f'Calls timed per measurement (default: {DEFAULT_SAMPLES})')
+    parser.add_argument('--rate-seconds', type=float, default=DEFAULT_RATE_SECONDS,
+                        help=f'Seconds of back-to-back moves for the update rate (default: {DEFAULT_RATE_SECONDS:g})')
+    parser.add_argument('--output', '-o', default=DEFAULT_PROFILE_PATH,
+                        help=f'Tuning file to store the profile in (default: {DEFAULT_PROFILE_PATH})')
+    parser.add_argument('--no-save', action='store_true', help='Print the measurements without storing them')
+    args = parser.parse_args()
+
+    if args.samples < 1:
+        print("Error: --samples must be at least 1")
+        sys.exit(1)
+    if args.rate_seconds <= 0:
+        print("Error: --rate-seconds must be greater than 0")
+        sys.exit(1)
+
+    backend_options = {'display': args.display} if args.backend == 'xlib' else {}
+    try:
+        backend = create_backend(args.backend, **backend_options)
+    except Exception as e:
+        print(f"Error: Could not open the {args.backend} backend: {e}")
+        sys.exit(1)
+
+    print(f"Calibrating {profile_key(backend)} (about {args.rate_seconds + 0.5:.0f}s)...")
+    profile = calibrate(backend, args.samples, args.rate_seconds)
+    print(profile.summary())
+    if args.no_save:
+        return
+    try:
+        save_profile(profile, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not save tuning profile: {e}")
+        sys.exit(1)
+    print(f"Saved to {os.path.expanduser(args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,18 @@
 """
 Circular mouse move examples
 """
+import event_log
 from mouse_mover import MouseMover
-import pyautogui
+from pattern_stream import circle, figure_eight, jitter, repeat, square
 import time
-import math
 
-def circular_move():
-    mover = MouseMover()
+def circular_move(backend=None):
+    mover = MouseMover(backend)
     
     print("=== Circular Mouse Move Examples ===\n")
     
     # Get current position to use as center
-    center_pos = pyautogui.position()
+    center_pos = mover.backend.position()
     print(f"Circle center: ({center_pos[0]}, {center_pos[1]})\n")
     
     # Example 1: Small circle
@@ -33,29 +33,21 @@ def circular_move():
     
     # Example 4: Square pattern
     print("\n4. Square pattern:")
-    square_pos = pyautogui.position()
+    square_pos = mover.backend.position()
     mover.move_square(square_pos[0] - 75, square_pos[1] - 75, 150, duration=1.0)
     time.sleep(1)
     
     # Example 5: Figure-8 pattern (two overlapping circles)
     print("\n5. Figure-8 pattern:")
-    fig8_pos = pyautogui.position()
-    radius = 50
-    
-    # First half (top circle)
-    for i in range(37):
-        angle = (i / 36) * math.pi  # 0 to π (half circle)
-        x = int(fig8_pos[0] + radius * math.sin(angle))
-        y = int(fig8_pos[1] - radius * math.cos(angle))
-        pyautogui.moveTo(x, y, duration=0.03)
-    
-    # Second half (bottom circle, opposite direction)
-    for i in range(37):
-        angle = math.pi - (i / 36) * math.pi  # π to 0 (half circle, reverse)
-        x = int(fig8_pos[0] + radius * math.sin(angle))
-        y = int(fig8_pos[1] + radius * math.cos(angle))
-        pyautogui.moveTo(x, y, duration=0.03)
+    fig8_pos = mover.backend.position()
+    mover.move_figure_eight(fig8_pos[0], fig8_pos[1], 50, steps_per_half=36, duration=2.2)
+    time.sleep(1)
+    
+    # Example 6: Composed stream (points are generated lazily while playing)
+    print("\n6. Two figure-8s, a circle and a square with 1px of jitter:")
+    mover.play_stream(jitter(repeat(figure_eight(40, 2.0), 2) + circle(30, 1.5) + square(60, 1.0), 1))
     
+    event_log.flush()
     print("\n=== Circular move examples completed ===")
 
 if __name__ == "__main__":
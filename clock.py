@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Clock Module
+Injectable time sources: the system clock, or a virtual clock that only moves when told to,
+so schedulers, samplers and alarm managers can run through hours of simulated time instantly
+"""
+import time
+
+
+class SystemClock:
+    """Real monotonic/wall-clock time and real sleeps"""
+
+    # Waits block the thread (the scheduler sleeps in short slices so it stays responsive)
+    virtual = False
+
+    monotonic = staticmethod(time.monotonic)
+    sleep = staticmethod(time.sleep)
+    # Last: from here on 'time' in the class body is this attribute, not the module
+    time = staticmethod(time.time)
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class VirtualClock:
+    """Clock that only advances through sleep() and advance(); sleeping returns immediately"""
+
+    virtual = True
+
+    def __init__(self, start=0.0, wall_start=0.0):
+        """
+        Initialize the clock
+        :param start: Initial monotonic time
+        :param wall_start: Wall-clock time (Unix seconds) at the initial monotonic time
+        """
+        self._now = float(start)
+        self._wall_offset = wall_start - start
+
+    def monotonic(self):
+        """Current virtual monotonic time"""
+        return self._now
+
+    def time(self):
+        """Current virtual wall-clock time"""
+        return self._now + self._wall_offset
+
+    def sleep(self, seconds):
+        """
+        Advance the clock instead of waiting
+        :param seconds: Seconds to advance (negative values are ignored)
+        """
+        if seconds > 0:
+            self._now += seconds
+
+    def advance(self, seconds):
+        """
+        Advance the clock
+        :param seconds: Seconds to advance
+        :raises ValueError: If seconds is negative
+        """
+        if seconds < 0:
+            raise ValueError("A virtual clock cannot go backwards")
+        self._now += seconds
+
+    def advance_to(self, deadline):
+        """
+        Advance the clock to a monotonic time (no-op if it has already passed)
+        :param deadline: Monotonic time
+        """
+        if deadline > self._now:
+            self._now = deadline
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Control Socket Module
+Local Unix domain socket for driving a running auto mouse mover: query status, pause/resume,
+trigger a move, change settings live, query the activity history and profile it.
+
+Protocol: one request per line, one JSON response per line. Requests are JSON objects such as
+{"cmd": "set", "interval": 1, "timeout": 10} or the plain form "set interval=1 timeout=10".
+Responses are {"ok": true, "result": {...}} or {"ok": false, "error": "..."}.
+Interval and timeout are in minutes, as on the auto_mouse_mover.py command line.
+"""
+import json
+import math
+import os
+import socket
+import sys
+import tempfile
+import threading
+import event_log
+
+# Seconds to wait for the scheduler thread to run a command
+COMMAND_TIMEOUT_SECONDS = 5.0
+
+MIN_INTERVAL_MINUTES = 2.0 / 60.0  # 2 seconds minimum
+MIN_TIMEOUT_MINUTES = 10.0 / 60.0  # 10 seconds minimum
+
+# Settings accepted by the 'set' command -> number type
+SETTINGS = {
+    'interval': float,
+    'timeout': float,
+    'threshold': int,
+    'min_distance': int,
+    'max_distance': int,
+}
+
+
+def default_socket_path():
+    """
+    Per-user control socket path
+    :return: Path in $XDG_RUNTIME_DIR, or the temp directory
+    """
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f"auto-mouse-mover-{os.getuid()}.sock")
+
+
+def parse_request(line):
+    """
+    Parse one request line
+    :param line: JSON object or 'cmd key=value ...'
+    :return: Tuple (command, params)
+    :raises ValueError: If the line is malformed
+    """
+    line = line.strip()
+    if line.startswith('{'):
+        request = json.loads(line)
+        if not isinstance(request, dict) or not isinstance(request.get('cmd'), str):
+            raise ValueError("request needs a string 'cmd'")
+        params = dict(request)
+        return params.pop('cmd'), params
+    words = line.split()
+    if not words:
+        raise ValueError("empty request")
+    params = {}
+    for word in words[1:]:
+        key, sep, value = word.partition('=')
+        if not sep:
+            raise ValueError(f"expected key=value, got '{word}'")
+        params[key] = value
+    return words[0], params
+
+
+def parse_settings(params):
+    """
+    Validate 'set' parameters
+    :param params: Dictionary of setting name -> value (numbers or numeric strings)
+    :return: Dictionary of validated settings in command line units
+    :raises ValueError: If a setting is unknown or invalid
+    """
+    if not params:
+        raise ValueError(f"nothing to set (settings: {', '.join(SETTINGS)})")
+    settings = {}
+    for key, value in params.items():
+        if key not in SETTINGS:
+            raise ValueError(f"unknown setting '{key}' (settings: {', '.join(SETTINGS)})")
+        try:
+            settings[key] = SETTINGS[key](value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{key}: '{value}' is not a number")
+        if not math.isfinite(settings[key]):
+            raise ValueError(f"{key}: '{value}' is not a finite number")
+    if 'interval' in settings and settings['interval'] < MIN_INTERVAL_MINUTES:
+        raise ValueError(f"interval must be at least {MIN_INTERVAL_MINUTES:.3f} minutes (2 seconds)")
+    if 'timeout' in settings and settings['timeout'] < MIN_TIMEOUT_MINUTES:
+        raise ValueError(f"timeout must be at least {MIN_TIMEOUT_MINUTES:.3f} minutes (10 seconds)")
+    for key in ('threshold', 'min_distance', 'max_distance'):
+        if key in settings and settings[key] < 0:
+            raise ValueError(f"{key} must not be negative")
+    return settings
+
+
+class MoverController:
+    """Runs control commands against an AutoMouseMover on its scheduler thread"""
+
+    def __init__(self, mover, profiler=None):
+        """
+        Initialize the controller
+        :param mover: AutoMouseMover (attached to a scheduler once it starts)
+        :param profiler: Optional Profiler for the profile/memory/spans commands
+        """
+        self.mover = mover
+        self.profiler = profiler
+        self.commands = {
+            'status': self._status,
+            'pause': self._pause,
+            'resume': self._resume,
+            'move': self._move,
+            'set': self._set,
+            'stop': self._stop,
+            'profile': self._profile,
+            'memory': self._memory,
+            'spans': self._spans,
+            'activity': self._activity,
+        }
+
+    def handle_line(self, line):
+        """
+        Run one request line
+        :param line: Request line
+        :return: Response dictionary
+        """
+        try:
+            command, params = parse_request(line)
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+        handler = self.commands.get(command)
+        if handler is None:
+            return {'ok': False, 'error': f"unknown command '{command}' (commands: {', '.join(self.commands)})"}
+        if command not in ('set', 'activity') and params:
+            return {'ok': False, 'error': f"'{command}' takes no parameters"}
+        if command == 'set':
+            try:
+                params = parse_settings(params)
+            except ValueError as e:
+                return {'ok': False, 'error': str(e)}
+        return self.call(handler, params)
+
+    def call(self, handler, params):
+        """
+        Run a handler on the scheduler thread and wait for its result
+        :param handler: Callable(params) returning the result dictionary
+        :param params: Handler parameters
+        :return: Response dictionary
+        """
+        scheduler = self.mover.scheduler
+        if scheduler is None or not self.mover.running:
+            return {'ok': False, 'error': 'mover is not running'}
+        done = threading.Event()
+        response = {}
+
+        def run():
+            try:
+                response.update(ok=True, result=handler(params))
+            except ValueError as e:
+                response.update(ok=False, error=str(e))
+            except Exception as e:
+                # A failing command must never take down the scheduler thread (and with it the mover)
+                event_log.emit('control.error', f"Control command failed: {e!r}", error=repr(e))
+                response.update(ok=False, error=f"internal error: {e!r}")
+            finally:
+                done.set()
+
+        scheduler.call_soon_threadsafe(run)
+        if not done.wait(COMMAND_TIMEOUT_SECONDS):
+            return {'ok': False, 'error': 'timed out waiting for the mover'}
+        return response
+
+    def _status(self, params):
+        mover = self.mover
+        status = mover.alarm_manager.get_status_info()
+        now = mover.scheduler.time()
+        status.update(
+            name=mover.name,
+            paused=mover.paused,
+            moving=mover.moving,
+            check_count=mover.check_count,
+            check_interval_seconds=mover.check_interval,
+            threshold=mover.delta_threshold,
+            min_distance=mover.min_distance,
+            max_distance=mover.max_distance,
+            position=list(mover.backend.position()),
+            seconds_to_alarm=None if mover.paused else round(mover.alarm_manager.next_alarm_deadline() - now, 3),
+            seconds_to_check=round(mover._next_check_deadline - now, 3),
+        )
+        return status
+
+    def _pause(self, params):
+        self.mover.pause()
+        return self._status(params)
+
+    def _resume(self, params):
+        self.mover.resume()
+        return self._status(params)
+
+    def _move(self, params):
+        return {'started': self.mover.trigger_move()}
+
+    def _set(self, params):
+        self.mover.update_settings(
+            check_interval_seconds=params['interval'] * 60 if 'interval' in params else None,
+            delta_threshold=params.get('threshold'),
+            min_distance=params.get('min_distance'),
+            max_distance=params.get('max_distance'),
+            timeout_seconds=params['timeout'] * 60 if 'timeout' in params else None
+        )
+        return self._status({})
+
+    def _stop(self, params):
+        self.mover.running = False
+        self.mover.scheduler.stop()
+        return {}
+
+    def _require_profiler(self):
+        if self.profiler is None:
+            raise ValueError("profiling is not enabled in this mover")
+        return self.profiler
+
+    def _profile(self, params):
+        # Runs on the scheduler thread, which is the thread that gets profiled
+        return self._require_profiler().toggle_cpu()
+
+    def _memory(self, params):
+        return self._require_profiler().memory_snapshot()
+
+    def _spans(self, params):
+        return self._require_profiler().span_report()['spans']
+
+    def _activity(self, params):
+        store = self.mover.activity_store
+        if store is None:
+            raise ValueError("no activity file in this mover (start it with --activity-file)")
+        unknown = set(params) - {'hours'}
+        if unknown:
+            raise ValueError(f"'activity' takes only hours (got {', '.join(sorted(unknown))})")
+        start = None
+        if 'hours' in params:
+            try:
+                hours = float(params['hours'])
+            except (TypeError, ValueError):
+                raise ValueError(f"hours must be a number, got '{params['hours']}'")
+            if hours <= 0:
+                raise ValueError("hours must be greater than 0")
+            start = self.mover.clock.time() - hours * 3600
+        return store.totals(start)
+
+
+def _server_classes():
+    """Socket server classes, imported only when the control socket is used"""
+    import socketserver
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                response = self.server.controller.handle_line(line.decode('utf-8', errors='replace'))
+                self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    return Server, RequestHandler
+
+
+class ControlServer:
+    """Serves the control protocol for one mover on a Unix domain socket from a daemon thread"""
+
+    def __init__(self, mover, path=None, profiler=None):
+        """
+        Bind the socket and start serving
+        :param mover: AutoMouseMover to control
+        :param path: Socket path (default: default_socket_path())
+        :param profiler: Optional Profiler for the profile/memory/spans commands
+        :raises OSError: If the socket cannot be created or another mover is already listening on it
+        """
+        self.path = path if path is not None else default_socket_path()
+        if os.path.exists(self.path):
+            if _is_listening(self.path):
+                raise OSError(f"another mover is already listening on {self.path}")
+            # Left over from a mover that did not shut down cleanly
+            os.unlink(self.path)
+        server_class, handler_class = _server_classes()
+        # Only the owner may connect
+        old_umask = os.umask(0o177)
+        try:
+            self._server = server_class(self.path, handler_class)
+        finally:
+            os.umask(old_umask)
+        self._server.controller = MoverController(mover, profiler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name='control-socket', daemon=True)
+        self._thread.start()
+        event_log.emit('control.listening', f"Control socket: {self.path}", path=self.path)
+
+    def stop(self):
+        """Stop serving and remove the socket file"""
+        self._server.shutdown()
+        self._server.server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_listening(path):
+    """Check if something accepts connections on a Unix socket path"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def send_command(command, path=None, socket_timeout=COMMAND_TIMEOUT_SECONDS + 1, **params):
+    """
+    Send one command to a running mover
+    :param command: Command name ('status', 'pause', 'resume', 'move', 'set', 'stop', 'profile', 'memory',
+                    'spans', 'activity')
+    :param path: Socket path (default: default_socket_path())
+    :param socket_timeout: Socket timeout in seconds
+    :param params: Command parameters (for 'set': interval, timeout, threshold, min_distance, max_distance;
+                   for 'activity': hours)
+    :return: Response dictionary
+    """
+    request = dict(params, cmd=command)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(socket_timeout)
+        sock.connect(path if path is not None else default_socket_path())
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            return json.loads(reader.readline())
+
+
+def main():
+    """Command line client for the control socket"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Control a running auto_mouse_mover.py --daemon',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  python control.py status
+  python control.py pause
+  python control.py set interval=1 timeout=10 threshold=20
+  python control.py move
+  python control.py profile        # start CPU profiling; run again to stop and write the report
+  python control.py memory         # tracemalloc snapshot, diffed against the previous one
+  python control.py spans          # time spent in checks, position(), move_to() and sound
+  python control.py activity hours=2   # checks, idle fraction, alarms and dings of the last 2 hours
+  python control.py --socket /run/user/1000/desk.sock stop
+
+Protocol (for scripts): one JSON object per line, e.g. {"cmd": "set", "interval": 1},
+or the plain form "set interval=1"; each request gets one JSON response line.
+        '''
+    )
+    parser.add_argument('command', help='status, pause, resume, move, set, stop, profile, memory, spans or activity')
+    parser.add_argument('settings', nargs='*',
+                        help='key=value pairs for set (interval/timeout in minutes) or activity (hours)')
+    parser.add_argument('--socket', '-s', default=None, help='Control socket path (default: per-user runtime dir)')
+    args = parser.parse_args()
+
+    try:
+        _, params = parse_request(' '.join([args.command] + args.settings))
+        response = send_command(args.command, args.socket, **params)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error: Could not reach the mover: {e}")
+        sys.exit(1)
+    print(json.dumps(response, indent=2))
+    if not response.get('ok'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Event Log Module
+Structured, non-blocking event logging: records are queued in memory and written
+in batches to the console and/or a size-rotated JSONL file from a background thread
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from metrics import EVENTS_DROPPED
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+
+class ConsoleSink:
+    """Writes the human readable message of each record to a text stream"""
+
+    def __init__(self, stream=None):
+        """
+        Initialize the sink
+        :param stream: Text stream (default: sys.stdout at write time)
+        """
+        self.stream = stream
+
+    def write_batch(self, records):
+        lines = [record['message'] for record in records if record.get('message') is not None]
+        if not lines:
+            return
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
+
+    def close(self):
+        pass
+
+
+class JSONLSink:
+    """Appends records as JSON lines, rotating the file when it grows past max_bytes"""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT):
+        """
+        Open the log file
+        :param path: File to append to
+        :param max_bytes: Rotate before the file would exceed this size (0 = never rotate)
+        :param backup_count: Rotated files kept as path.1 ... path.N (0 = truncate instead)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, 'ab')
+        self._size = self._file.tell()
+
+    def write_batch(self, records):
+        data = ''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records)
+        data = data.encode('utf-8')
+        if self.max_bytes and self._size > 0 and self._size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def _rotate(self):
+        """Shift path -> path.1 -> path.2 ... and start a new file"""
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, 'ab')
+        else:
+            self._file = open(self.path, 'wb')
+        self._size = 0
+
+    def close(self):
+        self._file.close()
+
+
+class EventLog:
+    """Bounded in-memory queue of event records drained by a background writer thread"""
+
+    def __init__(self, sinks, queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialize the log (the writer thread starts with the first record)
+        :param sinks: Sinks with write_batch(records) and close()
+        :param queue_size: Records held before new ones are dropped instead of blocking the caller
+        :param batch_size: Most records handed to the sinks per write
+        """
+        self.sinks = list(sinks)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._emitted = 0
+        self._written = 0
+        self._closed = False
+        self._thread = None
+
+    def emit(self, event, message=None, **fields):
+        """
+        Queue a record; never blocks on I/O
+        :param event: Dotted event name (e.g. 'check.idle')
+        :param message: Human readable text for the console (None = structured sinks only)
+        :param fields: Structured fields of the record
+        :return: True if queued, False if dropped because the queue is full
+        """
+        record = {'ts': time.time(), 'event': event, 'message': message}
+        record.update(fields)
+        with self._cond:
+            if self._closed or len(self._queue) >= self.queue_size:
+                self.dropped += 1
+                EVENTS_DROPPED.inc()
+                return False
+            self._queue.append(record)
+            self._emitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='event-log', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def flush(self, timeout=2.0):
+        """
+        Wait until every record queued so far has been written
+        :param timeout: Longest wait in seconds
+        :return: True if everything was written in time
+        """
+        with self._cond:
+            target = self._emitted
+            if self._thread is None:
+                return True
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout=2.0):
+        """Write the remaining records, report drops and close the sinks"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._write(self._drop_report())
+        for sink in self.sinks:
+            sink.close()
+
+    def _drop_report(self):
+        """Record reporting records dropped since the last report (empty list if none)"""
+        dropped = self.dropped
+        if dropped == self._reported_dropped:
+            return []
+        count = dropped - self._reported_dropped
+        self._reported_dropped = dropped
+        return [{'ts': time.time(), 'event': 'log.dropped', 'count': count, 'total': dropped,
+                 'message': f"⚠ Event log queue full: dropped {count} record(s) ({dropped} total)"}]
+
+    def _write(self, records):
+        if not records:
+            return
+        for sink in self.sinks:
+            try:
+                sink.write_batch(records)
+            except Exception as e:
+                sys.stderr.write(f"Warning: Event log sink {type(sink).__name__} failed: {e}\n")
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            with self._cond:
+                while not queue and not self._closed:
+                    self._cond.wait()
+                if not queue and self._closed:
+                    return
+                batch = [queue.popleft() for _ in range(min(len(queue), self.batch_size))]
+            self._write(self._drop_report() + batch)
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+
+_default_log = None
+_default_lock = threading.Lock()
+
+
+def configure(console=True, jsonl_path=None, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+              queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Replace the process-wide event log
+    :param console: Write messages to stdout
+    :param jsonl_path: JSONL file for structured records, or None
+    :param max_bytes: Rotation size of the JSONL file
+    :param backup_count: Rotated JSONL files to keep
+    :param queue_size: Records held before new ones are dropped
+    :return: The new EventLog
+    """
+    global _default_log
+    sinks = []
+    if console:
+        sinks.append(ConsoleSink())
+    if jsonl_path is not None:
+        sinks.append(JSONLSink(jsonl_path, max_bytes, backup_count))
+    log = EventLog(sinks, queue_size=queue_size)
+    with _default_lock:
+        previous, _default_log = _default_log, log
+    if previous is not None:
+        previous.close()
+    return log
+
+
+def get_event_log():
+    """
+    Get the process-wide event log (console only unless configure() was called)
+    :return: EventLog
+    """
+    global _default_log
+    if _default_log is None:
+        with _default_lock:
+            if _default_log is None:
+                _default_log = EventLog([ConsoleSink()])
+    return _default_log
+
+
+def emit(event, message=None, **fields):
+    """Queue a record on the process-wide event log (see EventLog.emit)"""
+    return get_event_log().emit(event, message, **fields)
+
+
+def flush(timeout=2.0):
+    """Wait until the process-wide event log has written everything queued so far"""
+    return get_event_log().flush(timeout)
+
+
+@atexit.register
+def _close_default_log():
+    if _default_log is not None:
+        _default_log.close()
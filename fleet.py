@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Fleet Mode
+Drives many auto mouse mover sessions (one per display) from one process and one scheduler
+"""
+import json
+import math
+import os
+import signal
+import sys
+import event_log
+from activity_store import ActivityStore
+from adaptive_cadence import AdaptiveCadence
+from auto_mouse_mover import AutoMouseMover
+from calibration import load_profile
+from metrics import start_exporters
+from pointer_backend import BACKENDS, create_backend
+from scheduler import Scheduler
+from screen_geometry import DEFAULT_CORNER_SIZE
+from state_journal import StateJournal
+
+# Session settings use the same units as the auto_mouse_mover.py command line (minutes for interval/timeout)
+SESSION_DEFAULTS = {
+    'backend': 'xlib',
+    'display': None,
+    'interval': 5.0,
+    'threshold': 10,
+    'min_distance': 100,
+    'max_distance': 500,
+    'timeout': 30.0,
+    'sample_rate': 2.0,
+    'adaptive': False,
+    'max_interval': None,
+    'exclude': [],
+    'corner_size': DEFAULT_CORNER_SIZE,
+    'state_file': None,
+    'activity_file': None,
+    'tuning_file': None,
+}
+
+MIN_INTERVAL_MINUTES = 2.0 / 60.0  # 2 seconds minimum
+MIN_TIMEOUT_MINUTES = 10.0 / 60.0  # 10 seconds minimum
+
+NUMBER_SETTINGS = ('interval', 'timeout', 'sample_rate')
+# Pixel settings are ints, as on the auto_mouse_mover.py command line (screen geometry needs integer edges)
+INTEGER_SETTINGS = ('threshold', 'min_distance', 'max_distance', 'corner_size')
+OPTIONAL_STRING_SETTINGS = ('display', 'state_file', 'activity_file', 'tuning_file')
+
+
+def _is_number(value):
+    """Check for a finite int/float (bool is rejected even though it is an int)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _is_integer(value):
+    """Check for an int (bool is rejected even though it is an int)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_types(session):
+    """
+    Check the value types of a merged session config
+    :param session: Session dictionary (defaults applied)
+    :raises ValueError: If a setting has the wrong type
+    """
+    name = session['name']
+    for key in NUMBER_SETTINGS:
+        if not _is_number(session[key]):
+            raise ValueError(f"Session '{name}': {key} must be a finite number, got {session[key]!r}")
+    for key in INTEGER_SETTINGS:
+        if not _is_integer(session[key]):
+            raise ValueError(f"Session '{name}': {key} must be an integer, got {session[key]!r}")
+    if session['max_interval'] is not None and not _is_number(session['max_interval']):
+        raise ValueError(f"Session '{name}': max_interval must be a finite number or null, got {session['max_interval']!r}")
+    for key in ('width', 'height'):
+        if key in session and not _is_integer(session[key]):
+            raise ValueError(f"Session '{name}': {key} must be an integer, got {session[key]!r}")
+    for key in OPTIONAL_STRING_SETTINGS:
+        if session[key] is not None and not isinstance(session[key], str):
+            raise ValueError(f"Session '{name}': {key} must be a string or null, got {session[key]!r}")
+    if not isinstance(session['backend'], str):
+        raise ValueError(f"Session '{name}': backend must be a string, got {session['backend']!r}")
+    if not isinstance(session['adaptive'], bool):
+        raise ValueError(f"Session '{name}': adaptive must be true or false, got {session['adaptive']!r}")
+    if not isinstance(session['exclude'], list):
+        raise ValueError(f"Session '{name}': exclude must be a list of [x, y, width, height] entries")
+    for zone in session['exclude']:
+        if not isinstance(zone, list) or not all(_is_integer(v) for v in zone):
+            raise ValueError(f"Session '{name}': exclude entries must be lists of integers, got {zone!r}")
+
+
+def validate_session(session):
+    """
+    Check a merged session config
+    :param session: Session dictionary (defaults applied)
+    :raises ValueError: If a setting is invalid
+    """
+    name = session['name']
+    _check_types(session)
+    if session['backend'] not in BACKENDS:
+        raise ValueError(f"Session '{name}': unknown backend '{session['backend']}' "
+                         f"(available: {', '.join(sorted(BACKENDS))})")
+    if session['interval'] < MIN_INTERVAL_MINUTES:
+        raise ValueError(f"Session '{name}': interval must be at least {MIN_INTERVAL_MINUTES:.3f} minutes (2 seconds)")
+    if session['timeout'] < MIN_TIMEOUT_MINUTES:
+        raise ValueError(f"Session '{name}': timeout must be at least {MIN_TIMEOUT_MINUTES:.3f} minutes (10 seconds)")
+    if session['sample_rate'] <= 0:
+        raise ValueError(f"Session '{name}': sample_rate must be greater than 0")
+    if session['min_distance'] > session['max_distance']:
+        raise ValueError(f"Session '{name}': min_distance must not exceed max_distance")
+    if session['max_interval'] is not None and session['max_interval'] < session['interval']:
+        raise ValueError(f"Session '{name}': max_interval must be at least interval")
+    if session['corner_size'] < 0:
+        raise ValueError(f"Session '{name}': corner_size must not be negative")
+    for zone in session['exclude']:
+        if len(zone) != 4 or zone[2] <= 0 or zone[3] <= 0:
+            raise ValueError(f"Session '{name}': exclude entries must be [x, y, width, height] with a positive size")
+
+
+def load_fleet_config(path):
+    """
+    Load and validate a fleet config file.
+    Format: {"defaults": {...}, "sessions": [{"name": "...", "display": ":1", ...}, ...]}
+    :param path: Path to the JSON config
+    :return: List of session dictionaries with defaults applied
+    :raises ValueError: If the config is invalid
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    defaults = dict(SESSION_DEFAULTS)
+    defaults.update(config.get('defaults', {}))
+    sessions = []
+    seen_names = set()
+    for index, entry in enumerate(config.get('sessions', [])):
+        session = dict(defaults)
+        session.update(entry)
+        session.setdefault('name', session['display'] or f"session-{index + 1}")
+        unknown = set(session) - set(SESSION_DEFAULTS) - {'name', 'width', 'height'}
+        if unknown:
+            raise ValueError(f"Session '{session['name']}': unknown setting(s) {', '.join(sorted(unknown))}")
+        if session['name'] in seen_names:
+            raise ValueError(f"Duplicate session name '{session['name']}'")
+        seen_names.add(session['name'])
+        validate_session(session)
+        sessions.append(session)
+
+    if not sessions:
+        raise ValueError("Fleet config lists no sessions")
+    return sessions
+
+
+def _create_session_backend(session):
+    """Create the pointer backend for one session"""
+    if session['backend'] == 'xlib':
+        return create_backend('xlib', display=session['display'])
+    if session['backend'] == 'virtual':
+        return create_backend('virtual', width=session.get('width', 1920), height=session.get('height', 1080))
+    return create_backend(session['backend'])
+
+
+class Fleet:
+    """Runs many AutoMouseMover sessions on one shared scheduler"""
+
+    def __init__(self, sessions, scheduler=None):
+        """
+        Initialize the fleet
+        :param sessions: Session dictionaries from load_fleet_config
+        :param scheduler: Scheduler to run on (default: a new one)
+        """
+        from sound_notifier import SoundNotifier
+        self.scheduler = scheduler if scheduler is not None else Scheduler()
+        # One sound backend and one player thread for every session
+        self.sound_notifier = SoundNotifier()
+        self.sound_player = None
+        self.movers = []
+        self.journals = []
+        for session in sessions:
+            journal = None
+            if session['state_file'] is not None:
+                journal = StateJournal(os.path.expanduser(session['state_file']))
+                self.journals.append(journal)
+            backend = _create_session_backend(session)
+            tuning = None
+            if session['tuning_file'] is not None:
+                tuning = load_profile(backend, session['tuning_file'])
+            activity_store = None
+            if session['activity_file'] is not None:
+                activity_store = ActivityStore.open(os.path.expanduser(session['activity_file']))
+            adaptive = None
+            if session['adaptive']:
+                max_check_factor = session['max_interval'] / session['interval'] if session['max_interval'] else 4.0
+                adaptive = AdaptiveCadence.for_mover(session['interval'] * 60, session['sample_rate'], max_check_factor)
+            mover = AutoMouseMover(
+                check_interval_seconds=session['interval'] * 60,
+                delta_threshold=session['threshold'],
+                min_distance=session['min_distance'],
+                max_distance=session['max_distance'],
+                timeout_seconds=session['timeout'] * 60,
+                backend=backend,
+                sample_rate=session['sample_rate'],
+                name=session['name'],
+                sound_notifier=self.sound_notifier,
+                install_signal_handlers=False,
+                adaptive=adaptive,
+                exclusions=[tuple(zone) for zone in session['exclude']],
+                corner_size=session['corner_size'],
+                state_journal=journal,
+                activity_store=activity_store,
+                tuning=tuning
+            )
+            self.movers.append(mover)
+
+    def _signal_handler(self, signum, frame):
+        """Handle interrupt signals (Ctrl+C)"""
+        print("\n\nStopping fleet...")
+        self.stop()
+
+    def stop(self):
+        """Stop all sessions"""
+        for mover in self.movers:
+            mover.running = False
+        self.scheduler.stop()
+
+    def start(self):
+        """Start all sessions and run until Ctrl+C / SIGTERM"""
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+
+        from sound_notifier import SoundPlayerThread
+        self.sound_player = SoundPlayerThread(self.sound_notifier)
+
+        print(f"=== Fleet Started: {len(self.movers)} session(s) ===")
+        print(f"Sound backend: {self.sound_notifier.probe() or 'none available (will retry)'}")
+        for mover in self.movers:
+            pos = mover.begin_monitoring()
+            print(f"  - {mover.name}: backend {mover.backend.name}, {mover.screen_width}x{mover.screen_height}, "
+                  f"check every {mover.check_interval:g}s, initial position ({pos[0]}, {pos[1]})")
+            # Samples, checks, alarm deadlines and auto-move frames all run on the shared scheduler
+            mover.attach(self.scheduler, self.sound_player)
+        print("\nPress Ctrl+C to stop\n")
+
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            print("\n\nReceived interrupt signal...")
+        finally:
+            self.sound_player.stop()
+            for journal in self.journals:
+                journal.close()
+            for mover in self.movers:
+                mover.save_activity()
+            self._print_summary()
+
+    def _print_summary(self):
+        """Print final statistics per session"""
+        event_log.flush()
+        print("\n=== Fleet Stopped ===")
+        for mover in self.movers:
+            status = mover.alarm_manager.get_status_info()
+            print(f"  - {mover.name}: {mover.check_count} checks, "
+                  f"{status['consecutive_auto_moves']} consecutive auto-moves")
+            if mover.activity_store is not None:
+                print(f"    activity history: {mover.activity_store.summary()}")
+            report = mover.wakeup_report()
+            if report is not None:
+                print(f"      {report}")
+        print(f"Total checks performed: {sum(mover.check_count for mover in self.movers)}")
+
+
+def main():
+    """Fleet entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Run many auto mouse mover sessions from one process',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Config file (JSON, interval/timeout in minutes as on the auto_mouse_mover.py command line):
+  {
+    "defaults": {"backend": "xlib", "interval": 5, "timeout": 30},
+    "sessions": [
+      {"name": "desk-1", "display": ":1"},
+      {"name": "desk-2", "display": ":2", "interval": 1, "threshold": 20}
+    ]
+  }
+
+Session settings: name, backend (xlib/pyautogui/virtual), display, interval, threshold,
+min_distance, max_distance, timeout, sample_rate, adaptive, max_interval (minutes),
+exclude (list of [x, y, width, height]), corner_size, state_file, activity_file,
+tuning_file (profiles from calibration.py, matched by backend and display), width/height (virtual backend only).
+
+Examples:
+  # Run every session in fleet.json
+  python fleet.py fleet.json
+
+  # Only validate the config
+  python fleet.py fleet.json --validate
+  
+  # Serve Prometheus metrics (one series per session for status gauges) on localhost:9105
+  python fleet.py fleet.json --metrics-port 9105
+
+  # Profiling: kill -USR1 <pid> starts/stops CPU profiling, kill -USR2 <pid> diffs memory snapshots
+  python fleet.py fleet.json --profile-dir /tmp/fleet-profiles
+        '''
+    )
+    parser.add_argument('config', help='Path to the fleet config (JSON)')
+    parser.add_argument('--validate', action='store_true', help='Validate the config and exit')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics on this localhost port (default: disabled)')
+    parser.add_argument('--metrics-file', default=None,
+                        help='Append periodic JSONL metric snapshots to this file (default: disabled)')
+    parser.add_argument('--metrics-interval', type=float, default=60.0,
+                        help='Seconds between JSONL metric snapshots (default: 60)')
+    parser.add_argument('--event-log', default=None,
+                        help='Write structured check/move/alarm events to this JSONL file (default: disabled)')
+    parser.add_argument('--event-log-max-bytes', type=int, default=event_log.DEFAULT_MAX_BYTES,
+                        help=f'Rotate the event log when it reaches this size (default: {event_log.DEFAULT_MAX_BYTES})')
+    parser.add_argument('--profile-dir', default=None,
+                        help='Directory for profiles written on SIGUSR1 and memory diffs on SIGUSR2 (default: temp dir)')
+    parser.add_argument('--profile-mode', choices=('cprofile', 'sample'), default='cprofile',
+                        help='CPU profiler toggled by SIGUSR1 (default: cprofile)')
+    args = parser.parse_args()
+
+    try:
+        sessions = load_fleet_config(args.config)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.validate:
+        print(f"Config OK: {len(sessions)} session(s)")
+        return
+
+    if args.metrics_interval <= 0:
+        print("Error: --metrics-interval must be greater than 0")
+        sys.exit(1)
+    if args.profile_dir is not None and not os.path.isdir(args.profile_dir):
+        print(f"Error: Profile directory does not exist: {args.profile_dir}")
+        sys.exit(1)
+    try:
+        exporters = start_exporters(args.metrics_port, args.metrics_file, args.metrics_interval)
+    except OSError as e:
+        print(f"Error: Could not start metrics exporter: {e}")
+        sys.exit(1)
+    if args.event_log is not None:
+        try:
+            event_log.configure(jsonl_path=args.event_log, max_bytes=args.event_log_max_bytes)
+        except OSError as e:
+            print(f"Error: Could not open event log: {e}")
+            sys.exit(1)
+    
+    from profiling import Profiler
+    profiler = Profiler(args.profile_dir, args.profile_mode)
+    profiler.install_signal_handlers()
+    
+    try:
+        try:
+            fleet = Fleet(sessions)
+        except (OSError, ValueError) as e:
+            print(f"Error: Could not start fleet: {e}")
+            sys.exit(1)
+        fleet.start()
+    finally:
+        profiler.stop()
+        for exporter in exporters:
+            exporter.stop()
+
+
+if __name__ == "__main__":
+    main()
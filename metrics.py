@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Metrics Module
+Counters and histograms for the auto-mover hot paths, exported as Prometheus text and/or JSONL snapshots
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+
+# Default histogram buckets in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+DRIFT_BUCKETS = (-0.01, 0.0, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_value(value):
+    """Format a sample value for the Prometheus text format"""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    """Format a label dictionary for the Prometheus text format"""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in sorted(labels.items()):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class Counter:
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """
+        Increase the counter
+        :param amount: Amount to add
+        """
+        with self._lock:
+            self.value += amount
+
+    def render(self):
+        return [f"{self.name} {_format_value(self.value)}"]
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """
+        Record one observation
+        :param value: Observed value
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def render(self):
+        lines = []
+        cumulative = 0
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self.sum, self.count
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(float(bound))}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(total)}")
+        lines.append(f"{self.name}_count {count}")
+        return lines
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self.sum, self.count
+        return {
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], counts)),
+            'sum': total,
+            'count': count
+        }
+
+
+class MetricsRegistry:
+    """Holds metrics and status collectors"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text):
+        """
+        Get or create a counter
+        :param name: Metric name
+        :param help_text: Description
+        :return: Counter
+        """
+        return self._register(Counter(name, help_text))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        """
+        Get or create a histogram
+        :param name: Metric name
+        :param help_text: Description
+        :param buckets: Upper bounds of the buckets
+        :return: Histogram
+        """
+        return self._register(Histogram(name, help_text, buckets))
+
+    def register_collector(self, collector):
+        """
+        Register a callable evaluated at export time
+        :param collector: Callable returning a list of (name, help, labels dict, value) gauge samples
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector):
+        """Remove a collector registered with register_collector"""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def _collect_gauges(self):
+        with self._lock:
+            collectors = list(self._collectors)
+        samples = []
+        for collector in collectors:
+            samples.extend(collector())
+        return samples
+
+    def render_prometheus(self):
+        """
+        Render every metric in the Prometheus text exposition format
+        :return: str
+        """
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+
+        gauges = {}
+        for name, help_text, labels, value in self._collect_gauges():
+            gauges.setdefault(name, (help_text, []))[1].append((labels, value))
+        for name, (help_text, samples) in gauges.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """
+        Get all metric values
+        :return: JSON-serializable dictionary
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            'timestamp': time.time(),
+            'metrics': {metric.name: metric.snapshot() for metric in metrics},
+            'gauges': [{'name': name, 'labels': labels, 'value': value}
+                       for name, _, labels, value in self._collect_gauges()]
+        }
+
+
+# Registry shared by every module in the process
+REGISTRY = MetricsRegistry()
+
+CHECK_DRIFT = REGISTRY.histogram(
+    'automover_check_drift_seconds', 'Lateness of each check relative to its scheduled deadline', DRIFT_BUCKETS)
+POSITION_LATENCY = REGISTRY.histogram(
+    'automover_position_latency_seconds', 'Latency of pointer position() reads')
+MOVE_TO_LATENCY = REGISTRY.histogram(
+    'automover_move_to_latency_seconds', 'Latency of pointer move_to() calls during playback')
+CHECK_DURATION = REGISTRY.histogram(
+    'automover_check_duration_seconds', 'Time spent evaluating a check (excluding auto-move playback)')
+MOVE_DURATION = REGISTRY.histogram(
+    'automover_move_duration_seconds', 'Achieved duration of pattern/auto-move playbacks')
+MOVE_OVERRUN = REGISTRY.histogram(
+    'automover_move_overrun_seconds', 'Achieved minus requested playback duration', DRIFT_BUCKETS)
+SOUND_LATENCY = REGISTRY.histogram(
+    'automover_sound_latency_seconds', 'Time spent starting a sound playback')
+SOUND_FAILURES = REGISTRY.counter(
+    'automover_sound_failures_total', 'Sound playbacks that failed')
+MANUAL_MOVES = REGISTRY.counter(
+    'automover_manual_moves_total', 'Checks that detected manual movement')
+AUTO_MOVES = REGISTRY.counter(
+    'automover_auto_moves_total', 'Checks that triggered an auto-move')
+ALARMS = REGISTRY.counter(
+    'automover_alarms_total', 'Alarm firings')
+EVENTS_DROPPED = REGISTRY.counter(
+    'automover_events_dropped_total', 'Event log records dropped because the queue was full')
+
+
+def _request_handler_class():
+    """Build the /metrics handler (http.server is only imported when the endpoint is enabled)"""
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        """Serves /metrics from the registry attached to the server"""
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = self.server.registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep scrapes out of the console output
+            pass
+
+    return MetricsRequestHandler
+
+
+class MetricsHTTPServer:
+    """Prometheus endpoint on a local port, served from a daemon thread"""
+
+    def __init__(self, port, host='127.0.0.1', registry=REGISTRY):
+        """
+        Start serving
+        :param port: TCP port (0 = pick a free one)
+        :param host: Interface to bind (default: localhost only)
+        :param registry: MetricsRegistry to export
+        """
+        from http.server import ThreadingHTTPServer
+        self._server = ThreadingHTTPServer((host, port), _request_handler_class())
+        self._server.daemon_threads = True
+        self._server.registry = registry
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class JSONLSnapshotWriter:
+    """Appends a registry snapshot to a JSONL file every interval seconds"""
+
+    def __init__(self, path, interval_seconds=60.0, registry=REGISTRY):
+        """
+        Start writing snapshots
+        :param path: File to append to
+        :param interval_seconds: Seconds between snapshots
+        :param registry: MetricsRegistry to export
+        """
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.registry = registry
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-jsonl', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        """Append one snapshot line now"""
+        line = json.dumps(self.registry.snapshot(), separators=(',', ':'))
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+    def stop(self):
+        """Stop the writer after a final snapshot"""
+        self._stop_event.set()
+        self._thread.join(timeout=1)
+        self.write_snapshot()
+
+
+def start_exporters(port=None, jsonl_path=None, interval_seconds=60.0, registry=REGISTRY):
+    """
+    Start the configured exporters
+    :param port: Prometheus HTTP port, or None to disable
+    :param jsonl_path: JSONL snapshot file, or None to disable
+    :param interval_seconds: Seconds between JSONL snapshots
+    :param registry: MetricsRegistry to export
+    :return: List of started exporters (each has stop())
+    """
+    exporters = []
+    if port is not None:
+        exporters.append(MetricsHTTPServer(port, registry=registry))
+    if jsonl_path is not None:
+        exporters.append(JSONLSnapshotWriter(jsonl_path, interval_seconds, registry=registry))
+    return exporters
@@ -2,19 +2,56 @@
 """
 Basic mouse movement examples for Windows and Mac
 """
-import pyautogui
-import time
 import math
-import random
-
-# Disable pyautogui failsafe (optional - remove if you want failsafe enabled)
-pyautogui.FAILSAFE = False
+import time
+import event_log
+from calibration import DEFAULT_PROFILE_PATH, load_profile
+from pattern_stream import StreamPlayer, wiggle as wiggle_stream
+from patterns import translate
+from playback import DEFAULT_FRAME_RATE, TrajectoryPlayer, frames_for_duration
+from pointer_backend import PyAutoGUIBackend
+from pointer_trace import TraceReader, TraceRecorder, resample_offsets
+from trajectory_cache import default_cache
 
 class MouseMover:
     """Class for mouse movement operations"""
     
-    def __init__(self):
-        self.screen_width, self.screen_height = pyautogui.size()
+    def __init__(self, backend=None, cache=None, tuning=None):
+        """
+        Initialize the mouse mover
+        :param backend: PointerBackend to drive (default: pyautogui with failsafe disabled)
+        :param cache: TrajectoryCache for pattern paths (default: process-wide shared cache)
+        :param tuning: Optional TuningProfile of the backend (see calibration.py); sets the frame rate
+                       paths are stepped at and the backend's timing knobs
+        """
+        if backend is None:
+            # Disable pyautogui failsafe (optional - pass your own backend if you want failsafe enabled)
+            backend = PyAutoGUIBackend(failsafe=False)
+        self.backend = backend
+        self._screen_size = None
+        self.cache = cache if cache is not None else default_cache
+        self.player = TrajectoryPlayer(self.backend)
+        self.stream_player = StreamPlayer(self.backend)
+        self.last_playback = None
+        self.frame_rate = DEFAULT_FRAME_RATE
+        if tuning is not None:
+            self.frame_rate = tuning.frame_rate
+            self.backend.apply_tuning(tuning)
+    
+    @property
+    def screen_width(self):
+        """Screen width (queried from the backend on first use)"""
+        return self._get_screen_size()[0]
+    
+    @property
+    def screen_height(self):
+        """Screen height (queried from the backend on first use)"""
+        return self._get_screen_size()[1]
+    
+    def _get_screen_size(self):
+        if self._screen_size is None:
+            self._screen_size = self.backend.size()
+        return self._screen_size
     
     def move_to(self, x, y):
         """
@@ -23,10 +60,10 @@ class MouseMover:
         :param y: Y coordinate
         """
         try:
-            pyautogui.moveTo(x, y)
-            print(f"Mouse moved to ({x}, {y})")
+            self.backend.move_to(x, y)
+            event_log.emit('pointer.move', f"Mouse moved to ({x}, {y})", target=(x, y))
         except Exception as e:
-            print(f"Error moving mouse: {e}")
+            event_log.emit('pointer.error', f"Error moving mouse: {e}", error=str(e))
     
     def move_relative(self, delta_x, delta_y):
         """
@@ -35,30 +72,53 @@ class MouseMover:
         :param delta_y: Change in Y coordinate
         """
         try:
-            current_x, current_y = pyautogui.position()
+            current_x, current_y = self.backend.position()
             new_x = current_x + delta_x
             new_y = current_y + delta_y
-            pyautogui.moveTo(new_x, new_y)
-            print(f"Mouse moved relative by ({delta_x}, {delta_y})")
+            self.backend.move_to(new_x, new_y)
+            event_log.emit('pointer.move_relative', f"Mouse moved relative by ({delta_x}, {delta_y})",
+                           delta=(delta_x, delta_y), target=(new_x, new_y))
         except Exception as e:
-            print(f"Error moving mouse: {e}")
+            event_log.emit('pointer.error', f"Error moving mouse: {e}", error=str(e))
     
-    def smooth_move(self, start_x, start_y, end_x, end_y, steps=50, duration=1.0):
+    def smooth_move(self, start_x, start_y, end_x, end_y, steps=50, duration=1.0, easing='linear'):
         """
         Move mouse smoothly in a line
         :param start_x: Starting X coordinate
         :param start_y: Starting Y coordinate
         :param end_x: Ending X coordinate
         :param end_y: Ending Y coordinate
-        :param steps: Number of steps for smooth movement (optional, duration takes precedence)
+        :param steps: Number of steps along the line
+        :param duration: Duration of movement in seconds
+        :param easing: Easing of the movement ('linear', 'ease_in_out' or 'minimum_jerk')
+        """
+        try:
+            offsets = self.cache.line(end_x - start_x, end_y - start_y, steps, easing)
+            result = self._play(translate(offsets, start_x, start_y), duration)
+            self._report_pattern(
+                'line', f"Smooth move completed from ({start_x}, {start_y}) to ({end_x}, {end_y})", result)
+        except Exception as e:
+            event_log.emit('pattern.error', f"Error in smooth move: {e}", pattern='line', error=str(e))
+    
+    def human_move(self, start_x, start_y, end_x, end_y, duration=1.0, steps=None, rng=None):
+        """
+        Move mouse along a curved, human-like path (minimum-jerk velocity, slight overshoot)
+        :param start_x: Starting X coordinate
+        :param start_y: Starting Y coordinate
+        :param end_x: Ending X coordinate
+        :param end_y: Ending Y coordinate
         :param duration: Duration of movement in seconds
+        :param steps: Number of steps along the path (default: one per frame)
+        :param rng: random.Random for a reproducible path
         """
         try:
-            pyautogui.moveTo(start_x, start_y)
-            pyautogui.moveTo(end_x, end_y, duration=duration)
-            print(f"Smooth move completed from ({start_x}, {start_y}) to ({end_x}, {end_y})")
+            steps = steps if steps is not None else frames_for_duration(duration, self.frame_rate)
+            offsets = self.cache.human(end_x - start_x, end_y - start_y, steps, rng)
+            result = self._play(translate(offsets, start_x, start_y), duration)
+            self._report_pattern(
+                'human', f"Human-like move completed from ({start_x}, {start_y}) to ({end_x}, {end_y})", result)
         except Exception as e:
-            print(f"Error in smooth move: {e}")
+            event_log.emit('pattern.error', f"Error in human-like move: {e}", pattern='human', error=str(e))
     
     def move_circle(self, center_x, center_y, radius, steps=36, duration=2.0):
         """
@@ -70,15 +130,11 @@ class MouseMover:
         :param duration: Duration for complete circle in seconds
         """
         try:
-            step_duration = duration / steps
-            for i in range(steps + 1):
-                angle = (i / steps) * 2 * math.pi
-                x = int(center_x + radius * math.cos(angle))
-                y = int(center_y + radius * math.sin(angle))
-                pyautogui.moveTo(x, y, duration=step_duration)
-            print(f"Circular move completed around ({center_x}, {center_y}) with radius {radius}")
+            result = self._play(translate(self.cache.circle(radius, steps), center_x, center_y), duration)
+            self._report_pattern(
+                'circle', f"Circular move completed around ({center_x}, {center_y}) with radius {radius}", result)
         except Exception as e:
-            print(f"Error in circular move: {e}")
+            event_log.emit('pattern.error', f"Error in circular move: {e}", pattern='circle', error=str(e))
     
     def move_square(self, start_x, start_y, side_length, duration=1.0):
         """
@@ -86,23 +142,109 @@ class MouseMover:
         :param start_x: Starting X coordinate (top-left)
         :param start_y: Starting Y coordinate (top-left)
         :param side_length: Length of each side
-        :param duration: Duration for each side in seconds
+        :param duration: Duration for the complete square in seconds
         """
         try:
-            corners = [
-                (start_x, start_y),  # top-left
-                (start_x + side_length, start_y),  # top-right
-                (start_x + side_length, start_y + side_length),  # bottom-right
-                (start_x, start_y + side_length),  # bottom-left
-                (start_x, start_y)  # back to start
-            ]
-            
-            for corner in corners:
-                pyautogui.moveTo(corner[0], corner[1], duration=duration / 5)
-            
-            print(f"Square move completed starting at ({start_x}, {start_y}) with side length {side_length}")
+            steps_per_side = frames_for_duration(duration / 4, self.frame_rate)
+            result = self._play(translate(self.cache.square(side_length, steps_per_side), start_x, start_y), duration)
+            self._report_pattern(
+                'square', f"Square move completed starting at ({start_x}, {start_y}) with side length {side_length}",
+                result)
         except Exception as e:
-            print(f"Error in square move: {e}")
+            event_log.emit('pattern.error', f"Error in square move: {e}", pattern='square', error=str(e))
+    
+    def move_figure_eight(self, center_x, center_y, radius, steps_per_half=36, duration=2.2):
+        """
+        Move mouse in a figure-8 pattern (two half circles above and below the center)
+        :param center_x: Center X coordinate
+        :param center_y: Center Y coordinate
+        :param radius: Radius of each half circle
+        :param steps_per_half: Number of steps for each half circle
+        :param duration: Duration for the complete figure in seconds
+        """
+        try:
+            offsets = self.cache.figure_eight(radius, steps_per_half)
+            result = self._play(translate(offsets, center_x, center_y), duration)
+            self._report_pattern(
+                'figure_eight', f"Figure-8 move completed around ({center_x}, {center_y}) with radius {radius}", result)
+        except Exception as e:
+            event_log.emit('pattern.error', f"Error in figure-8 move: {e}", pattern='figure_eight', error=str(e))
+    
+    def record_trace(self, path, duration, sample_rate=120.0):
+        """
+        Record the pointer to a compact trace file
+        :param path: Output trace file
+        :param duration: Seconds to record
+        :param sample_rate: Samples per second
+        :return: Number of samples recorded
+        """
+        with TraceRecorder(path) as recorder:
+            count = recorder.record(self.backend, duration, sample_rate)
+        event_log.emit('trace.recorded', f"Recorded {count} samples to {path}", path=path, samples=count)
+        return count
+    
+    def replay_trace(self, path, start=0, max_seconds=10.0, relative=True):
+        """
+        Replay a segment of a recorded trace with its original timing
+        :param path: Trace file
+        :param start: First record of the segment
+        :param max_seconds: Longest segment to replay
+        :param relative: Replay the shape from the current position (False = original coordinates)
+        """
+        try:
+            with TraceReader(path) as reader:
+                segment = reader.read_timed_segment(start, max_seconds)
+            if not segment:
+                event_log.emit('pattern.error', f"Error in trace replay: no samples at record {start} of {path}",
+                               pattern='trace', error='empty segment')
+                return
+            offsets, duration = resample_offsets(segment, self.frame_rate)
+            origin = self.backend.position() if relative else segment[0][1:]
+            result = self._play(translate(offsets, origin[0], origin[1]), duration)
+            self._report_pattern('trace', f"Trace replay completed from {path} ({len(segment)} samples)", result)
+        except Exception as e:
+            event_log.emit('pattern.error', f"Error in trace replay: {e}", pattern='trace', error=str(e))
+    
+    def run_script(self, steps, tolerance=None, max_gap=None):
+        """
+        Compile a movement script (see movement_script.py) from the current position and play it
+        :param steps: List of step dictionaries
+        :param tolerance: Simplification tolerance in pixels (default: movement_script.DEFAULT_TOLERANCE)
+        :param max_gap: Longest time between pointer updates while moving (default: movement_script.DEFAULT_MAX_GAP)
+        :return: CompiledScript, or None if the script could not be compiled or played
+        """
+        from movement_script import DEFAULT_MAX_GAP, DEFAULT_TOLERANCE, compile_script
+        try:
+            compiled = compile_script(steps, self.backend.position(), frame_rate=self.frame_rate,
+                                      tolerance=DEFAULT_TOLERANCE if tolerance is None else tolerance,
+                                      max_gap=DEFAULT_MAX_GAP if max_gap is None else max_gap)
+            self.last_playback = self.player.play_timed(compiled.points)
+            self._report_pattern('script', f"Movement script completed: {compiled.summary()}", self.last_playback)
+            return compiled
+        except Exception as e:
+            event_log.emit('pattern.error', f"Error in movement script: {e}", pattern='script', error=str(e))
+            return None
+    
+    def _play(self, points, duration):
+        """
+        Play a point path on the trajectory player and remember its timing report
+        :param points: Sequence of (x, y) points
+        :param duration: Duration of the path in seconds
+        :return: PlaybackResult
+        """
+        self.last_playback = self.player.play(points, duration)
+        return self.last_playback
+    
+    def _report_pattern(self, pattern, message, result):
+        """
+        Log a completed pattern with its timing report
+        :param pattern: Pattern name
+        :param message: Human readable description
+        :param result: PlaybackResult of the pattern
+        """
+        event_log.emit('pattern.done', f"{message} [{result.summary()}]", pattern=pattern,
+                       requested_duration=result.requested_duration, achieved_duration=result.achieved_duration,
+                       frames_played=result.frames_played, frames_skipped=result.frames_skipped)
     
     def get_current_position(self):
         """
@@ -110,11 +252,28 @@ class MouseMover:
         :return: Tuple (x, y) of current mouse position
         """
         try:
-            x, y = pyautogui.position()
-            print(f"Current mouse position: ({x}, {y})")
+            x, y = self.backend.position()
+            event_log.emit('pointer.position', f"Current mouse position: ({x}, {y})", position=(x, y))
             return (x, y)
         except Exception as e:
-            print(f"Error getting mouse position: {e}")
+            event_log.emit('pointer.error', f"Error getting mouse position: {e}", error=str(e))
+            return None
+    
+    def play_stream(self, pattern, max_seconds=None):
+        """
+        Play a lazy pattern stream (see pattern_stream.py) from the current position. Endless
+        patterns run until max_seconds, or until another thread calls stream_player.stop();
+        stream_player.switch(pattern) continues with another pattern mid-stream.
+        :param pattern: pattern_stream.Pattern
+        :param max_seconds: Stream time after which playback ends (None = until the pattern ends)
+        :return: PlaybackResult, or None if the stream failed
+        """
+        try:
+            self.last_playback = self.stream_player.play(pattern, max_seconds=max_seconds)
+            self._report_pattern('stream', f"Pattern stream {pattern.name} finished", self.last_playback)
+            return self.last_playback
+        except Exception as e:
+            event_log.emit('pattern.error', f"Error in pattern stream: {e}", pattern='stream', error=str(e))
             return None
     
     def wiggle(self, duration=5, interval=1):
@@ -122,29 +281,30 @@ class MouseMover:
         Wiggle mouse (small random movements) - useful for keeping system awake
         :param duration: Duration in seconds
         :param interval: Interval between movements in seconds
+        :return: PlaybackResult, or None if the wiggle failed
         """
         try:
-            start_pos = pyautogui.position()
-            start_time = time.time()
-            
-            while time.time() - start_time < duration:
-                delta_x = random.randint(-5, 5)
-                delta_y = random.randint(-5, 5)
-                new_x = start_pos[0] + delta_x
-                new_y = start_pos[1] + delta_y
-                pyautogui.moveTo(new_x, new_y, duration=0.1)
-                time.sleep(interval)
-            
-            # Return to original position
-            pyautogui.moveTo(start_pos[0], start_pos[1])
-            print(f"Wiggle completed for {duration} seconds")
+            # One wiggle per started interval, then back to the original position
+            count = math.ceil(duration / interval) if duration > 0 and interval > 0 else 0
+            pattern = wiggle_stream(5, interval, count, min(0.1, interval), frame_rate=self.frame_rate)
+            self.last_playback = self.stream_player.play(pattern)
+            self._report_pattern('wiggle', f"Wiggle completed for {duration} seconds", self.last_playback)
+            return self.last_playback
         except Exception as e:
-            print(f"Error in wiggle: {e}")
+            event_log.emit('pattern.error', f"Error in wiggle: {e}", pattern='wiggle', error=str(e))
 
 
 def main():
     """Example usage"""
-    mover = MouseMover()
+    backend = PyAutoGUIBackend(failsafe=False)
+    try:
+        tuning = load_profile(backend)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring tuning profile: {e}")
+        tuning = None
+    mover = MouseMover(backend, tuning=tuning)
+    if tuning is not None:
+        print(f"Using tuning profile from {DEFAULT_PROFILE_PATH}: {tuning.frame_rate} frames/s")
     
     print("=== Mouse Mover Examples ===\n")
     
@@ -165,21 +325,22 @@ def main():
     
     # Smooth move
     print("\n4. Performing smooth move:")
-    current_pos = pyautogui.position()
+    current_pos = mover.backend.position()
     mover.smooth_move(current_pos[0], current_pos[1], current_pos[0] + 200, current_pos[1] + 100, duration=1.0)
     time.sleep(1)
     
     # Circle move
     print("\n5. Performing circular move:")
-    circle_center = pyautogui.position()
+    circle_center = mover.backend.position()
     mover.move_circle(circle_center[0], circle_center[1], 50, steps=36, duration=2.0)
     time.sleep(1)
     
     # Square move
     print("\n6. Performing square move:")
-    square_start = pyautogui.position()
+    square_start = mover.backend.position()
     mover.move_square(square_start[0] - 50, square_start[1] - 50, 100, duration=1.0)
     
+    event_log.flush()
     print("\n=== All examples completed ===")
 
 
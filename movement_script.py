@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Movement Script Module
+Compiles movement programs described as data (lines, arcs, circles, squares, waits, loops)
+into a timed point stream for MouseMover, then removes pointer calls that do not change the
+visible path: repeated integer points, interior points of straight runs, and points within
+a pixel tolerance of the Ramer-Douglas-Peucker simplified path.
+
+A script is a JSON list of steps (or {"steps": [...]}); coordinates are absolute unless the
+key ends in _by (relative to the current pen position). Steps:
+  {"op": "line", "to": [x, y] | "by": [dx, dy], "duration": 1.0, "easing": "linear"}
+  {"op": "jump", "to": [x, y] | "by": [dx, dy]}
+  {"op": "arc", "center": [x, y] | "center_by": [dx, dy], "angle": 90, "duration": 1.0}
+  {"op": "circle", "radius": 50, "center": ... | "center_by": ..., "steps": 36, "duration": 2.0}
+  {"op": "square", "side": 100, "start": ... | "start_by": ..., "duration": 1.0}
+  {"op": "wait", "seconds": 0.5}
+  {"op": "loop", "count": 3, "body": [...]}
+Circles default to passing through the pen (center 'radius' pixels to the left) and squares
+default to the pen as their top-left corner, so both start and end where the pen is.
+"""
+import json
+import math
+from patterns import EASINGS, circle_offsets, line_offsets, square_offsets, translate
+from playback import DEFAULT_FRAME_RATE, frames_for_duration
+
+# Largest distance in pixels a dropped point may have from the simplified path
+DEFAULT_TOLERANCE = 1.0
+# Longest time in seconds between two emitted points while the pointer is moving (None = no limit)
+DEFAULT_MAX_GAP = 1.0 / 30
+# Upper bound on generated points, so a runaway loop fails fast instead of exhausting memory
+MAX_POINTS = 1000000
+
+OPERATIONS = ('line', 'jump', 'arc', 'circle', 'square', 'wait', 'loop')
+
+
+class CompiledScript:
+    """Timed point stream of a movement script with simplification statistics"""
+
+    def __init__(self, points, generated, deduplicated, collinear, simplified):
+        """
+        :param points: List of (t, x, y) with t = seconds from the start of the script
+        :param generated: Points produced by the steps
+        :param deduplicated: Points left after dropping repeated positions
+        :param collinear: Points left after merging straight runs
+        :param simplified: Points left after Ramer-Douglas-Peucker simplification
+        """
+        self.points = points
+        self.generated = generated
+        self.deduplicated = deduplicated
+        self.collinear = collinear
+        self.simplified = simplified
+
+    @property
+    def duration(self):
+        """Time of the last point in seconds"""
+        return self.points[-1][0] if self.points else 0.0
+
+    def summary(self):
+        """Short human readable size report"""
+        saved = 100.0 * (1 - len(self.points) / self.generated) if self.generated else 0.0
+        return (f"{len(self.points)} of {self.generated} points emitted ({saved:.0f}% fewer pointer calls; "
+                f"{self.deduplicated} after dedupe, {self.collinear} after collinear merge, "
+                f"{self.simplified} after simplification), {self.duration:.2f}s")
+
+
+def load_script(path):
+    """
+    Load a script file
+    :param path: JSON file with a list of steps or {"steps": [...]}
+    :return: List of step dictionaries
+    :raises ValueError: If the file does not hold a list of steps
+    """
+    with open(path, encoding='utf-8') as f:
+        script = json.load(f)
+    if isinstance(script, dict):
+        script = script.get('steps')
+    if not isinstance(script, list):
+        raise ValueError(f"{path}: expected a list of steps or an object with a 'steps' list")
+    return script
+
+
+class _Compiler:
+    """Expands steps into timed points from a pen position"""
+
+    def __init__(self, start, frame_rate):
+        self.x, self.y = start
+        self.t = 0.0
+        self.frame_rate = frame_rate
+        self.points = [(0.0, self.x, self.y)]
+
+    def emit(self, path, duration, include_first):
+        """Spread path points evenly over duration and move the pen to the last one"""
+        count = len(path) - 1
+        if count <= 0:
+            return
+        first = 0 if include_first else 1
+        for i in range(first, count + 1):
+            x, y = path[i]
+            self.points.append((self.t + duration * i / count, x, y))
+        if len(self.points) > MAX_POINTS:
+            raise ValueError(f"script expands to more than {MAX_POINTS} points")
+        self.t += duration
+        self.x, self.y = path[-1]
+
+    def run(self, steps, location='step'):
+        for index, step in enumerate(steps, 1):
+            where = f"{location} {index}"
+            if not isinstance(step, dict):
+                raise ValueError(f"{where}: expected an object")
+            op = step.get('op')
+            if op not in OPERATIONS:
+                raise ValueError(f"{where}: unknown op {op!r} (available: {', '.join(OPERATIONS)})")
+            getattr(self, '_' + op)(step, f"{where} ({op})")
+
+    def _point(self, step, key, where, default=None, relative_key=None):
+        """Absolute point from key or pen-relative point from relative_key (default: key + '_by')"""
+        relative_key = relative_key or key + '_by'
+        if key in step and relative_key in step:
+            raise ValueError(f"{where}: give either '{key}' or '{relative_key}', not both")
+        if key in step:
+            value, origin = step[key], (0, 0)
+        elif relative_key in step:
+            value, origin = step[relative_key], (self.x, self.y)
+        elif default is not None:
+            return default
+        else:
+            raise ValueError(f"{where}: needs '{key}' or '{relative_key}'")
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ValueError(f"{where}: '{key}' must be [x, y]")
+        return (origin[0] + _number(value[0], key, where), origin[1] + _number(value[1], key, where))
+
+    def _duration(self, step, where, default):
+        duration = _number(step.get('duration', default), 'duration', where)
+        if duration < 0:
+            raise ValueError(f"{where}: duration must not be negative")
+        return duration
+
+    def _line(self, step, where):
+        end_x, end_y = self._point(step, 'to', where, relative_key='by')
+        duration = self._duration(step, where, 1.0)
+        easing = step.get('easing', 'linear')
+        if easing not in EASINGS:
+            raise ValueError(f"{where}: unknown easing {easing!r} (available: {', '.join(sorted(EASINGS))})")
+        offsets = line_offsets(int(end_x) - self.x, int(end_y) - self.y,
+                               frames_for_duration(duration, self.frame_rate), easing)
+        self.emit(translate(offsets, self.x, self.y), duration, include_first=False)
+
+    def _jump(self, step, where):
+        x, y = self._point(step, 'to', where, relative_key='by')
+        self.points.append((self.t, int(x), int(y)))
+        self.x, self.y = int(x), int(y)
+
+    def _arc(self, step, where):
+        center_x, center_y = self._point(step, 'center', where)
+        sweep = math.radians(_number(step.get('angle'), 'angle', where))
+        duration = self._duration(step, where, 1.0)
+        radius = math.hypot(self.x - center_x, self.y - center_y)
+        start_angle = math.atan2(self.y - center_y, self.x - center_x)
+        steps = frames_for_duration(duration, self.frame_rate)
+        path = [(int(round(center_x + radius * math.cos(start_angle + sweep * i / steps))),
+                 int(round(center_y + radius * math.sin(start_angle + sweep * i / steps))))
+                for i in range(steps + 1)]
+        self.emit(path, duration, include_first=False)
+
+    def _circle(self, step, where):
+        radius = _number(step.get('radius'), 'radius', where)
+        center_x, center_y = self._point(step, 'center', where, default=(self.x - radius, self.y))
+        steps = int(_number(step.get('steps', 36), 'steps', where))
+        if steps < 1:
+            raise ValueError(f"{where}: steps must be at least 1")
+        duration = self._duration(step, where, 2.0)
+        path = translate(circle_offsets(radius, steps), int(center_x), int(center_y))
+        # A circle that does not start at the pen begins with a jump, like MouseMover.move_circle
+        self.emit(path, duration, include_first=path[0] != (self.x, self.y))
+
+    def _square(self, step, where):
+        side = _number(step.get('side'), 'side', where)
+        start_x, start_y = self._point(step, 'start', where, default=(self.x, self.y))
+        duration = self._duration(step, where, 1.0)
+        path = translate(square_offsets(side, frames_for_duration(duration / 4, self.frame_rate)),
+                         int(start_x), int(start_y))
+        self.emit(path, duration, include_first=path[0] != (self.x, self.y))
+
+    def _wait(self, step, where):
+        seconds = _number(step.get('seconds'), 'seconds', where)
+        if seconds < 0:
+            raise ValueError(f"{where}: seconds must not be negative")
+        self.t += seconds
+        # Holding still needs no pointer call; the marker keeps the wait at the end of a script
+        self.points.append((self.t, self.x, self.y))
+
+    def _loop(self, step, where):
+        count = int(_number(step.get('count'), 'count', where))
+        body = step.get('body')
+        if count < 0:
+            raise ValueError(f"{where}: count must not be negative")
+        if not isinstance(body, list):
+            raise ValueError(f"{where}: needs a 'body' list of steps")
+        for _ in range(count):
+            self.run(body, f"{where} body step")
+
+
+def _number(value, key, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{where}: '{key}' must be a number")
+    return value
+
+
+def dedupe(points, indices):
+    """
+    Drop points at the same position as the previous kept point
+    :param points: List of (t, x, y)
+    :param indices: Candidate indices in order
+    :return: List of kept indices
+    """
+    kept = [indices[0]]
+    for i in indices[1:]:
+        last = points[kept[-1]]
+        if points[i][1] != last[1] or points[i][2] != last[2]:
+            kept.append(i)
+    return kept
+
+
+def merge_collinear(points, indices):
+    """
+    Drop interior points of straight runs that keep going in the same direction
+    :param points: List of (t, x, y)
+    :param indices: Candidate indices in order (no repeated positions)
+    :return: List of kept indices
+    """
+    if len(indices) < 3:
+        return list(indices)
+    kept = [indices[0]]
+    for middle, following in zip(indices[1:], indices[2:]):
+        _, ax, ay = points[kept[-1]]
+        _, bx, by = points[middle]
+        _, cx, cy = points[following]
+        cross = (bx - ax) * (cy - by) - (by - ay) * (cx - bx)
+        dot = (bx - ax) * (cx - bx) + (by - ay) * (cy - by)
+        if cross != 0 or dot <= 0:
+            kept.append(middle)
+    kept.append(indices[-1])
+    return kept
+
+
+def _segment_distance(px, py, ax, ay, bx, by):
+    """Distance from point P to segment AB"""
+    dx, dy = bx - ax, by - ay
+    length_squared = dx * dx + dy * dy
+    if length_squared == 0:
+        return math.hypot(px - ax, py - ay)
+    f = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_squared))
+    return math.hypot(px - ax - f * dx, py - ay - f * dy)
+
+
+def rdp(points, indices, tolerance):
+    """
+    Ramer-Douglas-Peucker simplification (iterative)
+    :param points: List of (t, x, y)
+    :param indices: Candidate indices in order
+    :param tolerance: Largest allowed distance of a dropped point from the simplified path
+    :return: List of kept indices
+    """
+    if len(indices) < 3 or tolerance <= 0:
+        return list(indices)
+    keep = [False] * len(indices)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(indices) - 1)]
+    while stack:
+        first, last = stack.pop()
+        _, ax, ay = points[indices[first]]
+        _, bx, by = points[indices[last]]
+        farthest, distance = None, tolerance
+        for k in range(first + 1, last):
+            _, px, py = points[indices[k]]
+            d = _segment_distance(px, py, ax, ay, bx, by)
+            if d > distance:
+                farthest, distance = k, d
+        if farthest is not None:
+            keep[farthest] = True
+            stack.append((first, farthest))
+            stack.append((farthest, last))
+    return [index for index, kept in zip(indices, keep) if kept]
+
+
+def limit_gaps(points, candidates, kept, max_gap):
+    """
+    Re-insert dropped points so that a moving pointer is updated at least every max_gap seconds
+    :param points: List of (t, x, y)
+    :param candidates: Indices the simplification started from, in order
+    :param kept: Indices kept by the simplification
+    :param max_gap: Longest time between emitted points in seconds
+    :return: List of kept indices
+    """
+    keep = set(kept)
+    result = [candidates[0]]
+    for position in range(1, len(candidates)):
+        index = candidates[position]
+        if index in keep or position == len(candidates) - 1:
+            result.append(index)
+        elif points[candidates[position + 1]][0] - points[result[-1]][0] > max_gap:
+            result.append(index)
+    return result
+
+
+def compile_script(steps, start, frame_rate=DEFAULT_FRAME_RATE, tolerance=DEFAULT_TOLERANCE,
+                   max_gap=DEFAULT_MAX_GAP):
+    """
+    Compile a movement script into an optimized timed point stream
+    :param steps: List of step dictionaries (see module docstring)
+    :param start: Pen position (x, y) the script starts from (usually the pointer position)
+    :param frame_rate: Points per second generated for lines, arcs and squares
+    :param tolerance: Pixel tolerance of the Ramer-Douglas-Peucker pass (0 = only exact merges)
+    :param max_gap: Longest time between emitted points while moving (None = no limit)
+    :return: CompiledScript
+    :raises ValueError: If a step is invalid
+    """
+    compiler = _Compiler((int(start[0]), int(start[1])), frame_rate)
+    compiler.run(steps)
+    points = compiler.points
+    end = compiler.t
+
+    deduplicated = dedupe(points, list(range(len(points))))
+    collinear = merge_collinear(points, deduplicated)
+    simplified = rdp(points, collinear, tolerance)
+    kept = simplified if max_gap is None else limit_gaps(points, deduplicated, simplified, max_gap)
+
+    # The pen starts where the pointer already is, so the first point needs no pointer call
+    stream = [points[i] for i in kept[1:]]
+    last = stream[-1] if stream else points[0]
+    if last[0] < end:
+        # Trailing wait: repeat the final point at the end time so playback lasts the whole script
+        stream.append((end, last[1], last[2]))
+    return CompiledScript(stream, len(points) - 1, len(deduplicated) - 1, len(collinear) - 1,
+                          len(simplified) - 1)
+
+
+def main():
+    """Compile and optionally play a movement script"""
+    import argparse
+    import sys
+    import event_log
+    from mouse_mover import MouseMover
+    from pointer_backend import BACKENDS, create_backend
+
+    parser = argparse.ArgumentParser(description='Compile and play a movement script')
+    parser.add_argument('script', help='JSON script file (see movement.example.json)')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Simplification tolerance in pixels (default: {DEFAULT_TOLERANCE}, 0 = exact merges only)')
+    parser.add_argument('--max-gap', type=float, default=DEFAULT_MAX_GAP,
+                        help=f'Longest time in seconds between pointer updates while moving (default: {DEFAULT_MAX_GAP:.3f})')
+    parser.add_argument('--backend', '-b', choices=sorted(BACKENDS), default='pyautogui',
+                        help='Pointer backend (default: pyautogui)')
+    parser.add_argument('--compile-only', action='store_true',
+                        help='Print the compiled size from the screen center and exit without moving')
+    args = parser.parse_args()
+
+    try:
+        steps = load_script(args.script)
+        if args.compile_only:
+            compiled = compile_script(steps, (960, 540), tolerance=args.tolerance, max_gap=args.max_gap)
+            print(f"{args.script}: {compiled.summary()}")
+            return
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    mover = MouseMover(create_backend(args.backend))
+    mover.run_script(steps, tolerance=args.tolerance, max_gap=args.max_gap)
+    event_log.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Pattern Stream Module
+Movement patterns as lazy, composable streams of timed points, and a player that drives the pointer
+from them one point at a time.
+
+A pattern yields (t, dx, dy): seconds from its own start and pixels from the pen position it started
+at. The starting point itself (0, 0, 0) is never yielded, so patterns join without duplicate points.
+Nothing is precomputed, so endless keep-awake streams run in constant memory, and the player can
+stop a stream or switch to another one between any two points.
+
+    stream = repeat(circle(40, 2.0) + square(80, 2.0)) + wiggle(5, 1.0, count=10)
+    StreamPlayer(backend).play(jitter(take(stream, 60), 1.5))
+"""
+import math
+import random
+import sys
+import threading
+import time
+from clock import SYSTEM_CLOCK
+from metrics import MOVE_TO_LATENCY
+from patterns import EASINGS
+from playback import DEFAULT_FRAME_RATE, PlaybackResult, frames_for_duration
+
+
+class Pattern:
+    """Re-iterable lazy stream of (t, dx, dy) points; every iteration starts a fresh generator"""
+
+    def __init__(self, name, generate, *args):
+        """
+        :param name: Short description used in reports
+        :param generate: Generator function yielding (t, dx, dy)
+        :param args: Arguments passed to generate on every iteration
+        """
+        self.name = name
+        self._generate = generate
+        self._args = args
+
+    def __iter__(self):
+        return self._generate(*self._args)
+
+    def __add__(self, other):
+        return concat(self, other)
+
+    def __mul__(self, count):
+        return repeat(self, count)
+
+    def __repr__(self):
+        return f"Pattern({self.name})"
+
+
+def _line_points(delta_x, delta_y, duration, easing, steps):
+    ease = EASINGS[easing]
+    for i in range(1, steps + 1):
+        f = ease(i / steps)
+        yield (duration * i / steps, delta_x * f, delta_y * f)
+
+
+def line(delta_x, delta_y, duration=1.0, easing='linear', frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Straight line from the pen to (delta_x, delta_y)
+    :param delta_x: X offset of the end point
+    :param delta_y: Y offset of the end point
+    :param duration: Seconds the line takes
+    :param easing: Name of the easing function (see patterns.EASINGS)
+    :param frame_rate: Points per second
+    :return: Pattern
+    :raises ValueError: If the easing is unknown
+    """
+    if easing not in EASINGS:
+        raise ValueError(f"Unknown easing '{easing}' (available: {', '.join(sorted(EASINGS))})")
+    steps = frames_for_duration(duration, frame_rate)
+    return Pattern(f"line({delta_x}, {delta_y})", _line_points, delta_x, delta_y, duration, easing, steps)
+
+
+def _hold_points(seconds):
+    yield (seconds, 0.0, 0.0)
+
+
+def hold(seconds):
+    """
+    Keep the pointer still
+    :param seconds: Seconds to wait
+    :return: Pattern
+    """
+    return Pattern(f"hold({seconds:g}s)", _hold_points, seconds)
+
+
+def _arc_points(center_x, center_y, sweep, duration, steps):
+    radius = math.hypot(center_x, center_y)
+    start = math.atan2(-center_y, -center_x)
+    for i in range(1, steps + 1):
+        angle = start + sweep * i / steps
+        yield (duration * i / steps, center_x + radius * math.cos(angle), center_y + radius * math.sin(angle))
+
+
+def arc(center_x, center_y, degrees, duration=1.0, steps=None, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Turn the pen around a center (positive degrees turn clockwise on screen)
+    :param center_x: X offset of the center from the pen
+    :param center_y: Y offset of the center from the pen
+    :param degrees: Angle to turn
+    :param duration: Seconds the arc takes
+    :param steps: Number of points (default: one per frame)
+    :param frame_rate: Points per second when steps is not given
+    :return: Pattern
+    """
+    steps = steps if steps is not None else frames_for_duration(duration, frame_rate)
+    return Pattern(f"arc({degrees:g}deg)", _arc_points, center_x, center_y, math.radians(degrees), duration, steps)
+
+
+def circle(radius, duration=2.0, steps=None, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Full circle through the pen (center radius pixels to the left), ending where it started
+    :param radius: Radius of the circle
+    :param duration: Seconds the circle takes
+    :param steps: Number of points (default: one per frame)
+    :param frame_rate: Points per second when steps is not given
+    :return: Pattern
+    """
+    pattern = arc(-radius, 0, 360, duration, steps, frame_rate)
+    pattern.name = f"circle({radius})"
+    return pattern
+
+
+def square(side_length, duration=1.0, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Square with the pen as top-left corner, traced clockwise back to the pen
+    :param side_length: Length of each side
+    :param duration: Seconds the whole square takes
+    :param frame_rate: Points per second
+    :return: Pattern
+    """
+    corners = ((side_length, 0), (0, side_length), (-side_length, 0), (0, -side_length))
+    pattern = concat(*(line(dx, dy, duration / 4, frame_rate=frame_rate) for dx, dy in corners))
+    pattern.name = f"square({side_length})"
+    return pattern
+
+
+def figure_eight(radius, duration=2.2, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Figure-8: a clockwise circle above the pen, then a counter-clockwise one below it
+    :param radius: Radius of each loop
+    :param duration: Seconds the whole figure takes
+    :param frame_rate: Points per second
+    :return: Pattern
+    """
+    half = duration / 2
+    pattern = concat(arc(0, -radius, 360, half, frame_rate=frame_rate),
+                     arc(0, radius, -360, half, frame_rate=frame_rate))
+    pattern.name = f"figure_eight({radius})"
+    return pattern
+
+
+def _wiggle_points(amplitude, interval, count, move_duration, rng, frame_rate):
+    rng = rng if rng is not None else random
+    steps = frames_for_duration(move_duration, frame_rate)
+    t = 0.0
+    x = y = 0.0
+    done = 0
+    while count is None or done < count:
+        # Each wiggle lands within amplitude of the starting point, so the pointer never drifts away
+        target_x, target_y = rng.randint(-amplitude, amplitude), rng.randint(-amplitude, amplitude)
+        for i in range(1, steps + 1):
+            f = i / steps
+            yield (t + move_duration * f, x + (target_x - x) * f, y + (target_y - y) * f)
+        x, y = target_x, target_y
+        t += interval
+        done += 1
+        yield (t, x, y)
+    if x or y:
+        # Finite wiggles end back on the starting point
+        yield (t, 0.0, 0.0)
+
+
+def wiggle(amplitude=5, interval=1.0, count=None, move_duration=0.1, rng=None, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Small random moves around the pen, one every interval seconds (endless unless count is given)
+    :param amplitude: Largest offset from the pen in pixels on each axis
+    :param interval: Seconds from one wiggle to the next
+    :param count: Number of wiggles (None = endless); a finite wiggle returns to the pen
+    :param move_duration: Seconds each wiggle move takes
+    :param rng: Random number generator (default: the random module)
+    :param frame_rate: Points per second during wiggle moves
+    :return: Pattern
+    :raises ValueError: If interval is not positive or shorter than move_duration
+    """
+    if interval <= 0:
+        raise ValueError("Wiggle interval must be greater than 0")
+    if move_duration > interval:
+        raise ValueError("Wiggle move_duration must not exceed the interval")
+    return Pattern(f"wiggle({amplitude}px every {interval:g}s)", _wiggle_points,
+                   amplitude, interval, count, move_duration, rng, frame_rate)
+
+
+def _concat_points(patterns):
+    t0 = x0 = y0 = 0.0
+    for pattern in patterns:
+        t = dx = dy = 0.0
+        for t, dx, dy in pattern:
+            yield (t0 + t, x0 + dx, y0 + dy)
+        # The next pattern starts where (and when) this one ended
+        t0, x0, y0 = t0 + t, x0 + dx, y0 + dy
+
+
+def concat(*patterns):
+    """
+    Play patterns one after another, each starting where the previous one ended
+    :param patterns: Patterns to chain
+    :return: Pattern
+    """
+    return Pattern(' + '.join(pattern.name for pattern in patterns), _concat_points, patterns)
+
+
+def _repeat_points(pattern, count):
+    t0 = x0 = y0 = 0.0
+    done = 0
+    while count is None or done < count:
+        emitted = False
+        t = dx = dy = 0.0
+        for t, dx, dy in pattern:
+            emitted = True
+            yield (t0 + t, x0 + dx, y0 + dy)
+        if not emitted or (count is None and t <= 0):
+            # An empty or instant pattern repeated forever would never let time move on
+            return
+        t0, x0, y0 = t0 + t, x0 + dx, y0 + dy
+        done += 1
+
+
+def repeat(pattern, count=None):
+    """
+    Play a pattern again and again, each pass starting where the previous one ended
+    :param pattern: Pattern to repeat
+    :param count: Number of passes (None = endless)
+    :return: Pattern
+    """
+    return Pattern(f"({pattern.name}) x {'inf' if count is None else count}", _repeat_points, pattern, count)
+
+
+def _jitter_points(pattern, amplitude, rng):
+    rng = rng if rng is not None else random
+    uniform = rng.uniform
+    for t, dx, dy in pattern:
+        yield (t, dx + uniform(-amplitude, amplitude), dy + uniform(-amplitude, amplitude))
+
+
+def jitter(pattern, amplitude, rng=None):
+    """
+    Add random noise to every point (the pattern's own path is unchanged, so noise never accumulates)
+    :param pattern: Pattern to disturb
+    :param amplitude: Largest noise in pixels on each axis
+    :param rng: Random number generator (default: the random module)
+    :return: Pattern
+    """
+    return Pattern(f"jitter({pattern.name}, {amplitude:g}px)", _jitter_points, pattern, amplitude, rng)
+
+
+def _take_points(pattern, seconds):
+    for point in pattern:
+        if point[0] > seconds:
+            return
+        yield point
+
+
+def take(pattern, seconds):
+    """
+    Cut a (possibly endless) pattern off after a number of seconds
+    :param pattern: Pattern to cut
+    :param seconds: Stream time after which no more points are played
+    :return: Pattern
+    """
+    return Pattern(f"{pattern.name} for {seconds:g}s", _take_points, pattern, seconds)
+
+
+def _shifted(pattern, t0, x0, y0):
+    """Points of a pattern moved to start at time t0 from offset (x0, y0)"""
+    for t, dx, dy in pattern:
+        yield (t0 + t, x0 + dx, y0 + dy)
+
+
+class StreamPlayer:
+    """Pulls points from a pattern and shows each one at its absolute deadline"""
+
+    def __init__(self, backend, clock=None):
+        """
+        Initialize the player
+        :param backend: PointerBackend to drive
+        :param clock: Time source for point deadlines (default: the system clock)
+        """
+        self.backend = backend
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.playing = False
+        self._stop_requested = False
+        self._next_pattern = None
+        self._interrupt = threading.Event()
+
+    def stop(self):
+        """End the stream being played at the next point (safe from other threads and signal handlers)"""
+        self._stop_requested = True
+        self._interrupt.set()
+
+    def switch(self, pattern):
+        """
+        Continue with another pattern from the current pointer position, without stopping
+        (safe from other threads and signal handlers)
+        :param pattern: Pattern to play instead of the rest of the current one
+        """
+        self._next_pattern = pattern
+        self._interrupt.set()
+
+    def _wait(self, seconds):
+        """
+        Wait until a deadline unless stop() or switch() is called first
+        :return: True if interrupted
+        """
+        if self.clock.virtual:
+            self.clock.sleep(seconds)
+            return False
+        return self._interrupt.wait(seconds)
+
+    def play(self, pattern, origin=None, max_seconds=None):
+        """
+        Play a pattern from the pointer position. Deadlines are absolute, so slow moves never
+        accumulate drift; a point whose successor is already due is skipped. Headless backends play
+        every point without waiting (give endless patterns a max_seconds there).
+        :param pattern: Pattern to play
+        :param origin: Position (x, y) the pattern is relative to (default: the current position)
+        :param max_seconds: Stream time after which playback ends (None = until the pattern ends)
+        :return: PlaybackResult (requested duration = stream time of the last point reached)
+        """
+        backend = self.backend
+        clock = self.clock
+        perf_counter = time.perf_counter
+        origin_x, origin_y = origin if origin is not None else backend.position()
+        self._stop_requested = False
+        self._next_pattern = None
+        self._interrupt.clear()
+        self.playing = True
+
+        stream = iter(pattern if max_seconds is None else take(pattern, max_seconds))
+        current = next(stream, None)
+        pen = (0.0, 0.0)
+        reached = 0.0
+        frames_played = 0
+        frames_skipped = 0
+        start = clock.monotonic()
+        try:
+            while True:
+                if self._stop_requested:
+                    break
+                if self._next_pattern is not None:
+                    self._interrupt.clear()
+                    pattern, self._next_pattern = self._next_pattern, None
+                    now = clock.monotonic() - start
+                    stream = _shifted(pattern, now, pen[0], pen[1])
+                    if max_seconds is not None:
+                        stream = _take_points(stream, max_seconds)
+                    current = next(stream, None)
+                if current is None:
+                    break
+                following = next(stream, None)
+                t, dx, dy = current
+                if backend.realtime:
+                    now = clock.monotonic()
+                    if now < start + t:
+                        if self._wait(start + t - now):
+                            # Stopped or switched: the rest of this stream is dropped
+                            continue
+                    elif following is not None and now >= start + following[0]:
+                        frames_skipped += 1
+                        current = following
+                        continue
+                    started = perf_counter()
+                    backend.move_to(origin_x + int(round(dx)), origin_y + int(round(dy)))
+                    MOVE_TO_LATENCY.observe(perf_counter() - started)
+                else:
+                    backend.move_to(origin_x + int(round(dx)), origin_y + int(round(dy)))
+                frames_played += 1
+                pen = (dx, dy)
+                reached = t
+                current = following
+        finally:
+            self.playing = False
+
+        return PlaybackResult(reached, clock.monotonic() - start, frames_played + frames_skipped,
+                              frames_played, frames_skipped).record()
+
+
+PATTERNS = {
+    'wiggle': lambda size, frame_rate: wiggle(max(1, size // 10), 1.0, frame_rate=frame_rate),
+    'circle': lambda size, frame_rate: repeat(circle(size, 2.0, frame_rate=frame_rate)),
+    'square': lambda size, frame_rate: repeat(square(size, 2.0, frame_rate=frame_rate)),
+    'figure8': lambda size, frame_rate: repeat(figure_eight(size, 2.2, frame_rate=frame_rate)),
+}
+
+
+def main():
+    """Play an endless keep-awake pattern until Ctrl+C (or for a fixed time)"""
+    import argparse
+    import signal
+    import event_log
+    from calibration import load_profile
+    from pointer_backend import BACKENDS, create_backend
+
+    parser = argparse.ArgumentParser(
+        description='Play an endless keep-awake movement pattern until Ctrl+C',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # Wiggle by up to 5px every second until Ctrl+C
+  python pattern_stream.py
+
+  # Circles of radius 40px with 2px of noise for 10 minutes
+  python pattern_stream.py --pattern circle --size 40 --jitter 2 --minutes 10
+
+  # Switch to the next pattern on SIGUSR1 without stopping
+  python pattern_stream.py --pattern circle & kill -USR1 $!
+        '''
+    )
+    parser.add_argument('--pattern', '-p', choices=sorted(PATTERNS), default='wiggle',
+                        help='Pattern to play (default: wiggle)')
+    parser.add_argument('--size', type=int, default=50,
+                        help='Radius/side of the pattern in pixels; wiggles use a tenth of it (default: 50)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random noise added to every point in pixels')
+    parser.add_argument('--minutes', type=float, default=None, help='Stop after this many minutes (default: endless)')
+    parser.add_argument('--backend', '-b', choices=sorted(BACKENDS), default='pyautogui',
+                        help='Pointer backend (default: pyautogui)')
+    args = parser.parse_args()
+
+    if args.size < 1:
+        print("Error: --size must be at least 1")
+        sys.exit(1)
+    if args.minutes is None and args.backend == 'virtual':
+        print("Error: the virtual backend plays without waiting, so it needs --minutes")
+        sys.exit(1)
+
+    backend_options = {'failsafe': True} if args.backend == 'pyautogui' else {}
+    backend = create_backend(args.backend, **backend_options)
+    try:
+        tuning = load_profile(backend)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring tuning profile: {e}")
+        tuning = None
+    frame_rate = DEFAULT_FRAME_RATE
+    if tuning is not None:
+        frame_rate = tuning.frame_rate
+        backend.apply_tuning(tuning)
+
+    def build(name):
+        pattern = PATTERNS[name](args.size, frame_rate)
+        return jitter(pattern, args.jitter) if args.jitter > 0 else pattern
+
+    player = StreamPlayer(backend)
+    names = sorted(PATTERNS)
+    current = [args.pattern]
+
+    def next_pattern(signum, frame):
+        current[0] = names[(names.index(current[0]) + 1) % len(names)]
+        event_log.emit('pattern.switched', f"Switching to {current[0]}", pattern=current[0])
+        player.switch(build(current[0]))
+
+    signal.signal(signal.SIGINT, lambda signum, frame: player.stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: player.stop())
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, next_pattern)
+
+    print(f"Playing {args.pattern} (Ctrl+C to stop)")
+    result = player.play(build(args.pattern), max_seconds=args.minutes * 60 if args.minutes is not None else None)
+    event_log.flush()
+    print(f"Stopped after {result.summary()}")
+
+
+if __name__ == "__main__":
+    main()
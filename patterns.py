@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Movement Patterns Module
+Origin-relative point paths for the movement patterns used by MouseMover and AutoMouseMover
+"""
+import math
+
+
+def translate(offsets, origin_x, origin_y):
+    """
+    Translate an origin-relative path to absolute coordinates
+    :param offsets: Sequence of (dx, dy) offsets
+    :param origin_x: X coordinate of the origin
+    :param origin_y: Y coordinate of the origin
+    :return: List of (x, y) points
+    """
+    return [(origin_x + dx, origin_y + dy) for dx, dy in offsets]
+
+
+def circle_offsets(radius, steps=36):
+    """
+    Circle around the origin, starting and ending at angle 0
+    :param radius: Radius of the circle
+    :param steps: Number of steps to complete the circle
+    :return: List of steps + 1 (dx, dy) offsets
+    """
+    return [(int(radius * math.cos((i / steps) * 2 * math.pi)),
+             int(radius * math.sin((i / steps) * 2 * math.pi)))
+            for i in range(steps + 1)]
+
+
+def square_offsets(side_length, steps_per_side=1):
+    """
+    Square with the origin as top-left corner, traced clockwise back to the origin
+    :param side_length: Length of each side
+    :param steps_per_side: Number of steps along each side
+    :return: List of 4 * steps_per_side + 1 (dx, dy) offsets
+    """
+    corners = [
+        (0, 0),  # top-left
+        (side_length, 0),  # top-right
+        (side_length, side_length),  # bottom-right
+        (0, side_length),  # bottom-left
+        (0, 0)  # back to start
+    ]
+    offsets = [corners[0]]
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:]):
+        for i in range(1, steps_per_side + 1):
+            t = i / steps_per_side
+            offsets.append((int(x0 + (x1 - x0) * t), int(y0 + (y1 - y0) * t)))
+    return offsets
+
+
+# Easing functions mapping linear progress t in [0, 1] to path progress
+EASINGS = {
+    'linear': lambda t: t,
+    'ease_in_out': lambda t: t * t * (3 - 2 * t),
+    # Bell-shaped velocity with zero velocity and acceleration at both ends
+    'minimum_jerk': lambda t: t * t * t * (10 + t * (-15 + 6 * t)),
+}
+
+
+def line_profile(steps=50, easing='linear'):
+    """
+    Progress fractions along a line for each step
+    :param steps: Number of steps along the line
+    :param easing: Name of the easing function (see EASINGS)
+    :return: List of steps + 1 fractions from 0.0 to 1.0
+    """
+    try:
+        ease = EASINGS[easing]
+    except KeyError:
+        raise ValueError(f"Unknown easing '{easing}' (available: {', '.join(sorted(EASINGS))})")
+    return [ease(i / steps) for i in range(steps + 1)]
+
+
+def scale_profile(profile, delta_x, delta_y):
+    """
+    Turn a line profile into offsets towards (delta_x, delta_y)
+    :param profile: Progress fractions from line_profile
+    :param delta_x: X offset of the end point
+    :param delta_y: Y offset of the end point
+    :return: List of (dx, dy) offsets
+    """
+    return [(int(delta_x * f), int(delta_y * f)) for f in profile]
+
+
+def line_offsets(delta_x, delta_y, steps=50, easing='linear'):
+    """
+    Straight line from the origin to (delta_x, delta_y)
+    :param delta_x: X offset of the end point
+    :param delta_y: Y offset of the end point
+    :param steps: Number of steps along the line
+    :param easing: Name of the easing function (see EASINGS)
+    :return: List of steps + 1 (dx, dy) offsets
+    """
+    return scale_profile(line_profile(steps, easing), delta_x, delta_y)
+
+
+def figure_eight_offsets(radius, steps_per_half=36):
+    """
+    Figure-8 made of two half circles above and below the origin
+    :param radius: Radius of each half circle
+    :param steps_per_half: Number of steps for each half circle
+    :return: List of 2 * (steps_per_half + 1) (dx, dy) offsets
+    """
+    offsets = []
+    # First half (top circle)
+    for i in range(steps_per_half + 1):
+        angle = (i / steps_per_half) * math.pi  # 0 to π (half circle)
+        offsets.append((int(radius * math.sin(angle)), int(-radius * math.cos(angle))))
+    # Second half (bottom circle, opposite direction)
+    for i in range(steps_per_half + 1):
+        angle = math.pi - (i / steps_per_half) * math.pi  # π to 0 (half circle, reverse)
+        offsets.append((int(radius * math.sin(angle)), int(radius * math.cos(angle))))
+    return offsets
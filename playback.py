@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Trajectory Playback Module
+Plays precomputed point paths against absolute monotonic deadlines
+"""
+import time
+from clock import SYSTEM_CLOCK
+from metrics import MOVE_DURATION, MOVE_OVERRUN, MOVE_TO_LATENCY
+
+# Frame rate used when a pattern derives its point count from a duration
+DEFAULT_FRAME_RATE = 60
+
+
+class PlaybackResult:
+    """Timing report of a single trajectory playback"""
+
+    def __init__(self, requested_duration, achieved_duration, frames_total, frames_played, frames_skipped):
+        self.requested_duration = requested_duration
+        self.achieved_duration = achieved_duration
+        self.frames_total = frames_total
+        self.frames_played = frames_played
+        self.frames_skipped = frames_skipped
+
+    @property
+    def drift(self):
+        """Achieved minus requested duration in seconds"""
+        return self.achieved_duration - self.requested_duration
+
+    def summary(self):
+        """Short human readable timing summary"""
+        return (f"{self.achieved_duration:.2f}s of {self.requested_duration:.2f}s requested, "
+                f"{self.frames_played}/{self.frames_total} frames, {self.frames_skipped} skipped")
+
+    def record(self):
+        """Add this playback to the move duration/overrun metrics"""
+        MOVE_DURATION.observe(self.achieved_duration)
+        MOVE_OVERRUN.observe(self.drift)
+        return self
+
+    def __repr__(self):
+        return (f"PlaybackResult(requested_duration={self.requested_duration!r}, "
+                f"achieved_duration={self.achieved_duration!r}, frames_total={self.frames_total!r}, "
+                f"frames_played={self.frames_played!r}, frames_skipped={self.frames_skipped!r})")
+
+
+def _timed_move(backend, x, y):
+    """Move a display pointer and record the latency of the call"""
+    started = time.perf_counter()
+    backend.move_to(x, y)
+    MOVE_TO_LATENCY.observe(time.perf_counter() - started)
+
+
+class TrajectoryPlayer:
+    """Moves the pointer through a point path on a fixed timeline"""
+
+    def __init__(self, backend, clock=None):
+        """
+        Initialize the player
+        :param backend: PointerBackend to drive
+        :param clock: Time source for frame deadlines (default: the system clock)
+        """
+        self.backend = backend
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+
+    def play(self, points, duration):
+        """
+        Play a path so that point i is shown at start + i * duration / (len(points) - 1).
+        Deadlines are absolute, so slow moves never accumulate drift; a frame whose
+        successor is already due is skipped instead of lagging behind. The final
+        point is always shown.
+        :param points: Sequence of (x, y) points
+        :param duration: Total duration of the path in seconds
+        :return: PlaybackResult
+        """
+        frames_total = len(points)
+        if frames_total == 0:
+            return PlaybackResult(duration, 0.0, 0, 0, 0)
+
+        backend = self.backend
+        clock = self.clock
+        start = clock.monotonic()
+        if not backend.realtime:
+            # Headless backends play every frame immediately (untimed, there is no display to wait for)
+            for x, y in points:
+                backend.move_to(x, y)
+            return PlaybackResult(duration, clock.monotonic() - start, frames_total, frames_total, 0).record()
+        if frames_total == 1 or duration <= 0:
+            x, y = points[-1]
+            _timed_move(backend, x, y)
+            return PlaybackResult(duration, clock.monotonic() - start, frames_total, 1, frames_total - 1).record()
+
+        frame_interval = duration / (frames_total - 1)
+        last_index = frames_total - 1
+        frames_played = 0
+        frames_skipped = 0
+
+        for i, (x, y) in enumerate(points):
+            deadline = start + i * frame_interval
+            now = clock.monotonic()
+            if now < deadline:
+                clock.sleep(deadline - now)
+            elif i < last_index and now >= deadline + frame_interval:
+                # Next frame is already due - drop this one to catch up
+                frames_skipped += 1
+                continue
+            _timed_move(backend, x, y)
+            frames_played += 1
+
+        achieved = clock.monotonic() - start
+        return PlaybackResult(duration, achieved, frames_total, frames_played, frames_skipped).record()
+
+    def play_timed(self, timed_points):
+        """
+        Play a path whose points carry their own time offsets (e.g. a compiled movement script).
+        The pointer holds each point until the next one is due; a point whose successor is already
+        due is skipped. The final point is always shown.
+        :param timed_points: Sequence of (t, x, y) with t = seconds from the start, non-decreasing
+        :return: PlaybackResult
+        """
+        frames_total = len(timed_points)
+        if frames_total == 0:
+            return PlaybackResult(0.0, 0.0, 0, 0, 0)
+
+        backend = self.backend
+        clock = self.clock
+        duration = timed_points[-1][0]
+        start = clock.monotonic()
+        if not backend.realtime:
+            for _, x, y in timed_points:
+                backend.move_to(x, y)
+            return PlaybackResult(duration, clock.monotonic() - start, frames_total, frames_total, 0).record()
+
+        last_index = frames_total - 1
+        frames_played = 0
+        frames_skipped = 0
+        for i, (t, x, y) in enumerate(timed_points):
+            deadline = start + t
+            now = clock.monotonic()
+            if now < deadline:
+                clock.sleep(deadline - now)
+            elif i < last_index and now >= start + timed_points[i + 1][0]:
+                frames_skipped += 1
+                continue
+            _timed_move(backend, x, y)
+            frames_played += 1
+
+        achieved = clock.monotonic() - start
+        return PlaybackResult(duration, achieved, frames_total, frames_played, frames_skipped).record()
+
+
+class ScheduledPlayback:
+    """Plays a point path as frames on a shared Scheduler instead of blocking the caller"""
+
+    def __init__(self, backend, scheduler, points, duration, on_complete=None):
+        """
+        Initialize the playback (call start() to begin)
+        :param backend: PointerBackend to drive
+        :param scheduler: Scheduler the frames run on
+        :param points: Sequence of (x, y) points
+        :param duration: Total duration of the path in seconds
+        :param on_complete: Optional callable(PlaybackResult) run after the last frame
+        """
+        self.backend = backend
+        self.scheduler = scheduler
+        self.points = points
+        self.duration = duration
+        self.on_complete = on_complete
+        self.frames_played = 0
+        self.frames_skipped = 0
+        self._start = None
+        self._frame_interval = 0.0
+
+    def start(self):
+        """Schedule the first frame"""
+        self._start = self.scheduler.time()
+        frames_total = len(self.points)
+        if frames_total > 1 and self.duration > 0 and self.backend.realtime:
+            self._frame_interval = self.duration / (frames_total - 1)
+        self.scheduler.call_at(self._start, self._frame, 0)
+
+    def _frame(self, index):
+        """Show frame index (or skip it when the next one is already due) and schedule the next"""
+        points = self.points
+        last_index = len(points) - 1
+        if last_index < 0:
+            self._finish()
+            return
+        if self._frame_interval == 0.0:
+            # Headless playback shows the whole path in one go, instant playback only the end point
+            if self.backend.realtime:
+                shown = points[-1:]
+                _timed_move(self.backend, *shown[0])
+            else:
+                shown = points
+                for x, y in shown:
+                    self.backend.move_to(x, y)
+            self.frames_played = len(shown)
+            self.frames_skipped = len(points) - len(shown)
+            self._finish()
+            return
+
+        now = self.scheduler.time()
+        deadline = self._start + index * self._frame_interval
+        if index < last_index and now >= deadline + self._frame_interval:
+            self.frames_skipped += 1
+        else:
+            x, y = points[index]
+            _timed_move(self.backend, x, y)
+            self.frames_played += 1
+
+        if index == last_index:
+            self._finish()
+        else:
+            self.scheduler.call_at(self._start + (index + 1) * self._frame_interval, self._frame, index + 1)
+
+    def _finish(self):
+        result = PlaybackResult(self.duration, self.scheduler.time() - self._start, len(self.points),
+                                self.frames_played, self.frames_skipped).record()
+        if self.on_complete is not None:
+            self.on_complete(result)
+
+
+def frames_for_duration(duration, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Number of steps needed to play a path for duration seconds at frame_rate
+    :param duration: Duration in seconds
+    :param frame_rate: Frames per second
+    :return: Step count (at least 1)
+    """
+    return max(1, int(round(duration * frame_rate)))
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Pointer Backend Module
+Abstraction over the OS pointer so movement code can run with or without a real display
+"""
+import time
+from collections import deque
+from clock import SYSTEM_CLOCK
+
+
+class PointerBackend:
+    """Interface every pointer backend implements"""
+
+    name = 'base'
+    # Whether moves should be paced in real time (False = play paths at full speed)
+    realtime = True
+
+    def position(self):
+        """
+        Get current pointer position
+        :return: Tuple (x, y)
+        """
+        raise NotImplementedError
+
+    def size(self):
+        """
+        Get screen size
+        :return: Tuple (width, height)
+        """
+        raise NotImplementedError
+
+    def monitors(self):
+        """
+        Get the monitor layout (queried on every call, so layout changes are seen)
+        :return: List of (x, y, width, height) rectangles in pointer coordinates
+        """
+        width, height = self.size()
+        return [(0, 0, width, height)]
+
+    def move_to(self, x, y, duration=0.0):
+        """
+        Move pointer to absolute coordinates
+        :param x: X coordinate
+        :param y: Y coordinate
+        :param duration: Duration of the movement in seconds (0 = instant)
+        """
+        raise NotImplementedError
+
+    def apply_tuning(self, profile):
+        """
+        Adopt the timing settings of a calibration profile (see calibration.py)
+        :param profile: TuningProfile measured for this backend
+        """
+
+
+class PyAutoGUIBackend(PointerBackend):
+    """Backend driving the real pointer through pyautogui"""
+
+    name = 'pyautogui'
+
+    def __init__(self, failsafe=False):
+        """
+        Initialize the pyautogui backend
+        :param failsafe: Enable pyautogui failsafe (move pointer to a corner to abort)
+        """
+        import pyautogui
+        self._pyautogui = pyautogui
+        pyautogui.FAILSAFE = failsafe
+
+    def position(self):
+        x, y = self._pyautogui.position()
+        return (x, y)
+
+    def size(self):
+        width, height = self._pyautogui.size()
+        return (width, height)
+
+    def move_to(self, x, y, duration=0.0):
+        # Callers own the timing, so skip pyautogui's implicit PAUSE after every call
+        self._pyautogui.moveTo(x, y, duration=duration, _pause=False)
+
+    def apply_tuning(self, profile):
+        # Globals, so they also cover pyautogui calls made outside this backend
+        for name, value in profile.pyautogui_settings.items():
+            setattr(self._pyautogui, name, value)
+
+
+class XlibBackend(PointerBackend):
+    """Backend driving the pointer of a specific X display (e.g. one Xvfb per session)"""
+
+    name = 'xlib'
+    # Steps per second of move_to() tweens
+    tween_rate = 60
+
+    def __init__(self, display=None):
+        """
+        Initialize the Xlib backend
+        :param display: X display name such as ':1' (default: $DISPLAY)
+        """
+        from Xlib import X
+        from Xlib import display as xdisplay
+        from Xlib.ext import xtest
+        self._motion_notify = X.MotionNotify
+        self._fake_input = xtest.fake_input
+        self._display = xdisplay.Display(display)
+        screen = self._display.screen()
+        self._root = screen.root
+        self._size = (screen.width_in_pixels, screen.height_in_pixels)
+        self.display_name = self._display.get_display_name()
+
+    def position(self):
+        pointer = self._root.query_pointer()
+        return (pointer.root_x, pointer.root_y)
+
+    def size(self):
+        return self._size
+
+    def monitors(self):
+        # RandR 1.5 lists the active monitors; older servers only know the whole screen
+        if not hasattr(self._root, 'xrandr_get_monitors'):
+            return [(0, 0) + self._size]
+        try:
+            reply = self._root.xrandr_get_monitors(is_active=True)
+        except Exception:
+            return [(0, 0) + self._size]
+        layout = [(m.x, m.y, m.width_in_pixels, m.height_in_pixels) for m in reply.monitors]
+        return layout or [(0, 0) + self._size]
+
+    def move_to(self, x, y, duration=0.0):
+        if duration > 0:
+            # Linear tween like pyautogui's default
+            start_x, start_y = self.position()
+            steps = max(1, int(duration * self.tween_rate))
+            for i in range(1, steps):
+                self._warp(start_x + (x - start_x) * i / steps, start_y + (y - start_y) * i / steps)
+                time.sleep(duration / steps)
+        self._warp(x, y)
+
+    def apply_tuning(self, profile):
+        self.tween_rate = profile.frame_rate
+
+    def _warp(self, x, y):
+        self._fake_input(self._display, self._motion_notify, x=int(x), y=int(y))
+        self._display.sync()
+
+
+class VirtualPointerBackend(PointerBackend):
+    """In-memory pointer that records timestamped moves (no display required)"""
+
+    name = 'virtual'
+
+    def __init__(self, width=1920, height=1080, start_pos=None, realtime=False, max_history=100000,
+                 monitor_layout=None, clock=None):
+        """
+        Initialize the virtual pointer
+        :param width: Virtual screen width
+        :param height: Virtual screen height
+        :param start_pos: Initial pointer position (default: screen center)
+        :param realtime: Sleep for the requested duration of each move (default: False = full speed)
+        :param max_history: Maximum number of recorded moves kept (oldest dropped first)
+        :param monitor_layout: Optional list of (x, y, width, height) monitors inside the virtual screen
+                               (default: one monitor covering it); may be replaced to simulate a layout change
+        :param clock: Time source for history timestamps and realtime pacing (default: the system clock)
+        """
+        self.monitor_layout = monitor_layout
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self.width = width
+        self.height = height
+        self.realtime = realtime
+        self.max_history = max_history
+        if start_pos is None:
+            start_pos = (width // 2, height // 2)
+        self._x, self._y = int(start_pos[0]), int(start_pos[1])
+
+        # Recorded moves as (monotonic timestamp, x, y, requested duration)
+        self.history = deque(maxlen=max_history)
+        self.move_count = 0
+
+    def position(self):
+        return (self._x, self._y)
+
+    def size(self):
+        return (self.width, self.height)
+
+    def monitors(self):
+        if self.monitor_layout:
+            return list(self.monitor_layout)
+        return [(0, 0, self.width, self.height)]
+
+    def move_to(self, x, y, duration=0.0):
+        if self.realtime and duration > 0:
+            self.clock.sleep(duration)
+        self._x = max(0, min(int(x), self.width - 1))
+        self._y = max(0, min(int(y), self.height - 1))
+        self.move_count += 1
+        self.history.append((self.clock.monotonic(), self._x, self._y, duration))
+
+    def clear_history(self):
+        """Forget all recorded moves"""
+        self.history.clear()
+        self.move_count = 0
+
+
+BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    XlibBackend.name: XlibBackend,
+    VirtualPointerBackend.name: VirtualPointerBackend,
+}
+
+
+def create_backend(name='pyautogui', **kwargs):
+    """
+    Create a pointer backend by name
+    :param name: Backend name ('pyautogui', 'xlib' or 'virtual')
+    :param kwargs: Extra arguments passed to the backend constructor
+    :return: PointerBackend instance
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown pointer backend '{name}' (available: {', '.join(sorted(BACKENDS))})")
+    return backend_class(**kwargs)
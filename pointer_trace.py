@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Pointer Trace Module
+Compact binary recording of pointer activity and memory-mapped replay of trace segments.
+
+File layout: an 8 byte header (magic b'PMTR', format version, record size) followed by
+fixed-width little-endian records of (microseconds since previous sample, x, y).
+"""
+import mmap
+import os
+import random
+import struct
+import time
+from bisect import bisect_right
+from playback import DEFAULT_FRAME_RATE
+
+MAGIC = b'PMTR'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+RECORD = struct.Struct('<Iii')
+MAX_DELTA_MICROSECONDS = 0xFFFFFFFF
+TRACE_SUFFIX = '.trace'
+
+
+class TraceRecorder:
+    """Appends (time delta, x, y) samples to a trace file"""
+
+    def __init__(self, path):
+        """
+        Create a new trace file (an existing file is overwritten)
+        :param path: File to write
+        """
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._last_time = None
+        self.count = 0
+
+    def add(self, timestamp, x, y):
+        """
+        Append one sample
+        :param timestamp: time.monotonic() of the sample
+        :param x: X coordinate
+        :param y: Y coordinate
+        """
+        if self._last_time is None:
+            delta = 0
+        else:
+            delta = min(MAX_DELTA_MICROSECONDS, max(0, int(round((timestamp - self._last_time) * 1e6))))
+        self._last_time = timestamp
+        self._file.write(RECORD.pack(delta, int(x), int(y)))
+        self.count += 1
+
+    def record(self, backend, duration, sample_rate=120.0, keep_running=None):
+        """
+        Sample a pointer backend at a fixed rate (absolute deadlines, so timing does not drift)
+        :param backend: PointerBackend to read
+        :param duration: Seconds to record
+        :param sample_rate: Samples per second
+        :param keep_running: Optional callable; recording stops early when it returns False
+        :return: Number of samples written
+        """
+        interval = 1.0 / sample_rate
+        start = time.monotonic()
+        end = start + duration
+        deadline = start
+        written = 0
+        while deadline <= end and (keep_running is None or keep_running()):
+            now = time.monotonic()
+            if now < deadline:
+                time.sleep(deadline - now)
+            x, y = backend.position()
+            self.add(time.monotonic(), x, y)
+            written += 1
+            deadline += interval
+            while deadline < time.monotonic():
+                # Missed samples are dropped; the recorded deltas keep the real timing
+                deadline += interval
+        return written
+
+    def close(self):
+        """Flush and close the file"""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TraceReader:
+    """Memory-maps a trace file and reads segments without loading the whole trace"""
+
+    def __init__(self, path):
+        """
+        Open a trace file
+        :param path: Trace file
+        :raises ValueError: If the file is not a trace file
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path}: not a pointer trace (file too short)")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} pointer trace")
+        # A partially written last record (recorder killed mid-write) is ignored
+        self.count = (size - HEADER.size) // RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """
+        Read one record
+        :param index: Record index
+        :return: Tuple (delta_seconds, x, y)
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        delta, x, y = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        return delta / 1e6, x, y
+
+    def iter_segment(self, start, count):
+        """
+        Stream records start .. start + count - 1 from the mapping
+        :param start: First record index
+        :param count: Number of records
+        :return: Iterator of (delta_seconds, x, y)
+        """
+        start = max(0, start)
+        stop = min(self.count, start + count)
+        if stop <= start:
+            return
+        view = memoryview(self._map)[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size]
+        try:
+            for delta, x, y in RECORD.iter_unpack(view):
+                yield delta / 1e6, x, y
+        finally:
+            view.release()
+
+    def read_timed_segment(self, start, max_seconds, max_records=100000):
+        """
+        Read a segment lasting at most max_seconds as relative timestamps
+        :param start: First record index
+        :param max_seconds: Longest segment duration
+        :param max_records: Upper bound on records read
+        :return: List of (t, x, y) with t = seconds since the first record
+        """
+        segment = []
+        t = 0.0
+        records = self.iter_segment(start, max_records)
+        try:
+            for delta, x, y in records:
+                if segment:
+                    t += delta
+                    if t > max_seconds:
+                        break
+                segment.append((t, x, y))
+        finally:
+            # Release the view on the mapping right away
+            records.close()
+        return segment
+
+    def close(self):
+        """Unmap and close the file"""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def resample_offsets(segment, frame_rate=DEFAULT_FRAME_RATE):
+    """
+    Resample a timed segment to evenly spaced frames, relative to its first point,
+    so it can be played by TrajectoryPlayer/ScheduledPlayback
+    :param segment: List of (t, x, y) from TraceReader.read_timed_segment
+    :param frame_rate: Output frames per second
+    :return: Tuple (offsets, duration) with offsets a list of (dx, dy)
+    """
+    if not segment:
+        return [], 0.0
+    _, x0, y0 = segment[0]
+    duration = segment[-1][0]
+    if len(segment) == 1 or duration <= 0:
+        return [(segment[-1][1] - x0, segment[-1][2] - y0)], 0.0
+
+    times = [t for t, _, _ in segment]
+    frames = max(1, int(round(duration * frame_rate)))
+    offsets = []
+    last = len(segment) - 1
+    for i in range(frames + 1):
+        t = duration * i / frames
+        j = min(bisect_right(times, t), last)
+        t0, xa, ya = segment[j - 1]
+        t1, xb, yb = segment[j]
+        f = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+        offsets.append((int(round(xa + (xb - xa) * f)) - x0, int(round(ya + (yb - ya) * f)) - y0))
+    return offsets, duration
+
+
+class TraceLibrary:
+    """Set of trace files to draw random replay segments from"""
+
+    def __init__(self, paths, rng=None):
+        """
+        Open every trace in the library
+        :param paths: Trace files and/or directories (searched for *.trace files)
+        :param rng: Optional random.Random for reproducible segment choice
+        :raises ValueError: If no non-empty trace is found or a file is not a trace
+        """
+        self.rng = rng if rng is not None else random.Random()
+        self.readers = []
+        for path in paths:
+            if os.path.isdir(path):
+                files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(TRACE_SUFFIX))
+            else:
+                files = [path]
+            for file_path in files:
+                reader = TraceReader(file_path)
+                if len(reader) >= 2:
+                    self.readers.append(reader)
+                else:
+                    reader.close()
+        if not self.readers:
+            raise ValueError("Trace library contains no traces with at least 2 samples")
+        self.total_records = sum(len(reader) for reader in self.readers)
+
+    def random_segment(self, max_seconds):
+        """
+        Pick a random segment, weighting traces by length
+        :param max_seconds: Longest segment duration
+        :return: List of (t, x, y) with t relative to the segment start
+        """
+        index = self.rng.randrange(self.total_records)
+        for reader in self.readers:
+            if index < len(reader) - 1:
+                return reader.read_timed_segment(index, max_seconds)
+            index -= len(reader)
+        reader = self.readers[-1]
+        return reader.read_timed_segment(len(reader) - 2, max_seconds)
+
+    def close(self):
+        """Close every trace"""
+        for reader in self.readers:
+            reader.close()
+        self.readers = []
+
+
+def main():
+    """Record or inspect pointer traces"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Record and inspect compact pointer traces')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='Record the real pointer to a trace file')
+    record_parser.add_argument('path', help=f'Output file (conventionally *{TRACE_SUFFIX})')
+    record_parser.add_argument('--duration', '-d', type=float, default=60.0, help='Seconds to record (default: 60)')
+    record_parser.add_argument('--rate', '-r', type=float, default=120.0, help='Samples per second (default: 120)')
+
+    info_parser = subparsers.add_parser('info', help='Show the size and duration of trace files')
+    info_parser.add_argument('paths', nargs='+', help='Trace files')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        from pointer_backend import PyAutoGUIBackend
+        backend = PyAutoGUIBackend()
+        print(f"Recording pointer for {args.duration:g}s at {args.rate:g} samples/s... (Ctrl+C to stop early)")
+        with TraceRecorder(args.path) as recorder:
+            try:
+                recorder.record(backend, args.duration, args.rate)
+            except KeyboardInterrupt:
+                pass
+        print(f"Wrote {recorder.count} samples to {args.path}")
+        return
+
+    for path in args.paths:
+        with TraceReader(path) as reader:
+            seconds = sum(delta for delta, _, _ in reader.iter_segment(0, len(reader)))
+            print(f"{path}: {len(reader)} samples, {seconds:.1f}s, "
+                  f"{HEADER.size + len(reader) * RECORD.size} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Profiling Module
+On-demand inspection of a running mover without restarting it:
+
+- CPU profiling (cProfile, or a low-overhead stack sampler) toggled on and off; stats are written
+  to files when it is switched off
+- tracemalloc snapshots, each one diffed against the previous one
+- a breakdown of the hot-path timing spans (check, position(), move_to(), sound playback)
+
+Triggered by SIGUSR1/SIGUSR2 or by the profile/memory/spans control commands. cProfile, tracemalloc
+and pstats are only imported when first used.
+"""
+import io
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+import event_log
+from metrics import CHECK_DURATION, MOVE_TO_LATENCY, POSITION_LATENCY, SOUND_LATENCY
+
+PROFILE_MODES = ('cprofile', 'sample')
+# Seconds between stacks taken by the sampling profiler
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# Lines in each text report
+DEFAULT_TOP = 25
+# Stack depth tracemalloc records per allocation
+TRACEMALLOC_FRAMES = 10
+
+# Span name -> histogram of its durations
+SPANS = (
+    ('check', CHECK_DURATION),
+    ('position', POSITION_LATENCY),
+    ('move_to', MOVE_TO_LATENCY),
+    ('sound', SOUND_LATENCY),
+)
+
+
+class StackSampler:
+    """Counts the call stacks of one thread, taken from a background thread at a fixed interval"""
+
+    def __init__(self, thread_id, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initialize the sampler (call start() to begin)
+        :param thread_id: Identifier of the thread to sample (threading.get_ident())
+        :param interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        """Start sampling"""
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        thread_id = self.thread_id
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            # Code objects are hashable and cheap to keep; names are formatted when writing
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path):
+        """
+        Write stacks in the collapsed format used by flame graph tools ('a;b;c count' per line)
+        :param path: Output file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(';'.join(_code_name(code) for code in stack) + f" {count}\n")
+
+    def report(self, top=DEFAULT_TOP):
+        """
+        Functions with the most samples
+        :param top: Lines per table
+        :return: Report text
+        """
+        samples = max(1, self.samples)
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count
+        lines = [f"{self.samples} samples every {self.interval * 1000:g}ms", "", "Self (innermost frame):"]
+        for code, count in own.most_common(top):
+            lines.append(f"  {100.0 * count / samples:6.2f}%  {_code_name(code)}")
+        lines.extend(["", "Inclusive (anywhere on the stack):"])
+        for code, count in total.most_common(top):
+            lines.append(f"  {100.0 * count / samples:6.2f}%  {_code_name(code)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _code_name(code):
+    """Readable name of a code object: file:line(function)"""
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+
+class Profiler:
+    """CPU profiles, memory snapshot diffs and span breakdowns for the running process"""
+
+    def __init__(self, output_dir=None, mode='cprofile', top=DEFAULT_TOP, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initialize the profiler (nothing is measured until toggle_cpu() or memory_snapshot())
+        :param output_dir: Directory for profile and memory reports (default: the temp directory)
+        :param mode: 'cprofile' (deterministic, every call) or 'sample' (stack sampling, low overhead)
+        :param top: Lines per text report
+        :param sample_interval: Seconds between stacks in 'sample' mode
+        :raises ValueError: If the mode is unknown
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (available: {', '.join(PROFILE_MODES)})")
+        self.output_dir = output_dir if output_dir is not None else tempfile.gettempdir()
+        self.mode = mode
+        self.top = top
+        self.sample_interval = sample_interval
+        self._profile = None
+        self._sampler = None
+        self._cpu_started = None
+        self._snapshot = None
+        self._started_tracemalloc = False
+        self._span_totals = {name: (0, 0.0) for name, _ in SPANS}
+        self._reports = 0
+
+    @property
+    def cpu_running(self):
+        """Whether a CPU profile is being recorded"""
+        return self._profile is not None or self._sampler is not None
+
+    def _report_path(self, kind, extension):
+        """New report file name: automover-<pid>-<time>-<n>-<kind>.<extension>"""
+        self._reports += 1
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.join(self.output_dir, f"automover-{os.getpid()}-{stamp}-{self._reports}-{kind}.{extension}")
+
+    def toggle_cpu(self):
+        """
+        Start CPU profiling the calling thread, or stop it and write the reports
+        :return: Dictionary with 'running' and, after stopping, the report 'files'
+        """
+        if not self.cpu_running:
+            self._cpu_started = time.perf_counter()
+            if self.mode == 'cprofile':
+                import cProfile
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+            else:
+                self._sampler = StackSampler(threading.get_ident(), self.sample_interval)
+                self._sampler.start()
+            event_log.emit('profile.started', f"CPU profiling started ({self.mode})", mode=self.mode)
+            return {'running': True, 'mode': self.mode}
+
+        seconds = time.perf_counter() - self._cpu_started
+        header = f"CPU profile ({self.mode}), {seconds:.1f}s, pid {os.getpid()}\n\n"
+        spans = self.span_report()['text']
+        if self._profile is not None:
+            profile, self._profile = self._profile, None
+            profile.disable()
+            import pstats
+            stats_path = self._report_path('cpu', 'prof')
+            profile.dump_stats(stats_path)
+            text = io.StringIO()
+            pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(self.top)
+            body = text.getvalue()
+        else:
+            sampler, self._sampler = self._sampler, None
+            sampler.stop()
+            stats_path = self._report_path('cpu', 'collapsed')
+            sampler.write_collapsed(stats_path)
+            body = sampler.report(self.top)
+        report_path = stats_path.rsplit('.', 1)[0] + '.txt'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(header + spans + '\n' + body)
+        files = [stats_path, report_path]
+        event_log.emit('profile.saved', f"CPU profile ({seconds:.1f}s) written to {report_path}",
+                       mode=self.mode, seconds=round(seconds, 3), files=files)
+        return {'running': False, 'seconds': round(seconds, 3), 'files': files}
+
+    def memory_snapshot(self):
+        """
+        Take a tracemalloc snapshot and write its difference to the previous one (the first call
+        starts tracing and only takes the reference snapshot)
+        :return: Dictionary with the traced size and, from the second call on, the report 'file'
+        """
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracemalloc = True
+            self._snapshot = None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        previous, self._snapshot = self._snapshot, snapshot
+        result = {'traced_bytes': current, 'peak_bytes': peak}
+        if previous is None:
+            event_log.emit('memory.tracing', f"Memory tracing started ({current} bytes traced); "
+                           f"the next snapshot is diffed against this one", traced_bytes=current)
+            return result
+
+        differences = snapshot.compare_to(previous, 'lineno')
+        growth = sum(stat.size_diff for stat in differences)
+        path = self._report_path('memory', 'txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"Memory difference since the previous snapshot, pid {os.getpid()}\n")
+            f.write(f"Traced: {current} bytes (peak {peak}), change {growth:+d} bytes\n\n")
+            for stat in differences[:self.top]:
+                f.write(f"{stat}\n")
+        event_log.emit('memory.diff', f"Memory snapshot: {growth:+d} bytes since the previous one, "
+                       f"written to {path}", traced_bytes=current, growth_bytes=growth, file=path)
+        result.update(growth_bytes=growth, file=path)
+        return result
+
+    def span_report(self):
+        """
+        Count, total and mean duration of each timing span, overall and since the previous report
+        :return: Dictionary with 'spans' (name -> numbers) and a 'text' table
+        """
+        spans = {}
+        lines = [f"{'span':<10} {'count':>9} {'mean ms':>9} {'total s':>9} {'new':>7} {'new mean ms':>11}"]
+        for name, histogram in SPANS:
+            count, total = histogram.count, histogram.sum
+            last_count, last_total = self._span_totals[name]
+            self._span_totals[name] = (count, total)
+            new_count, new_total = count - last_count, total - last_total
+            mean = 1000.0 * total / count if count else 0.0
+            new_mean = 1000.0 * new_total / new_count if new_count else 0.0
+            spans[name] = {'count': count, 'total_seconds': round(total, 6), 'mean_ms': round(mean, 4),
+                           'new_count': new_count, 'new_mean_ms': round(new_mean, 4)}
+            lines.append(f"{name:<10} {count:>9} {mean:>9.3f} {total:>9.3f} {new_count:>7} {new_mean:>11.3f}")
+        return {'spans': spans, 'text': '\n'.join(lines) + '\n'}
+
+    def _on_cpu_signal(self, signum, frame):
+        self.toggle_cpu()
+
+    def _on_memory_signal(self, signum, frame):
+        self.memory_snapshot()
+        event_log.emit('profile.spans', self.span_report()['text'].rstrip())
+
+    def install_signal_handlers(self):
+        """
+        SIGUSR1 toggles CPU profiling, SIGUSR2 takes a memory snapshot and logs the span breakdown.
+        Signal handlers run on the main thread, which is the thread that gets profiled.
+        :return: False if the platform has no SIGUSR1/SIGUSR2 (e.g. Windows)
+        """
+        if not hasattr(signal, 'SIGUSR1'):
+            return False
+        signal.signal(signal.SIGUSR1, self._on_cpu_signal)
+        signal.signal(signal.SIGUSR2, self._on_memory_signal)
+        return True
+
+    def stop(self):
+        """Write a running CPU profile and stop memory tracing started here"""
+        if self.cpu_running:
+            self.toggle_cpu()
+        if self._started_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+            self._snapshot = None
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Scheduler Module
+Single-threaded deadline scheduler on a monotonic clock (the system clock, or a virtual clock
+that jumps straight to the next deadline)
+"""
+import heapq
+import itertools
+import threading
+from collections import deque
+from clock import SYSTEM_CLOCK
+
+# Longest single wait, so stop() from a signal handler takes effect promptly
+MAX_SLEEP_SECONDS = 0.5
+
+
+class ScheduledCall:
+    """Handle of a scheduled callback (pass to Scheduler.cancel)"""
+
+    __slots__ = ('deadline', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class Scheduler:
+    """Runs callbacks at absolute monotonic deadlines from one thread and one timer"""
+
+    def __init__(self, clock=None):
+        """
+        Initialize the scheduler
+        :param clock: Time source (default: the system clock); with a VirtualClock, waiting for a
+                      deadline advances the clock instead of sleeping
+        """
+        self.clock = clock if clock is not None else SYSTEM_CLOCK
+        self._heap = []
+        self._sequence = itertools.count()
+        # Calls handed over from other threads, moved onto the heap by the run loop
+        self._pending = deque()
+        self._wakeup = threading.Event()
+        self.running = False
+
+    def time(self):
+        """Current scheduler time (the clock's monotonic time)"""
+        return self.clock.monotonic()
+
+    def call_at(self, deadline, callback, *args):
+        """
+        Schedule callback(*args) at an absolute deadline
+        :param deadline: Scheduler time to run at
+        :param callback: Callable to run
+        :return: ScheduledCall handle
+        """
+        call = ScheduledCall(deadline, callback, args)
+        # The sequence number keeps equal deadlines in FIFO order
+        heapq.heappush(self._heap, (deadline, next(self._sequence), call))
+        return call
+
+    def call_later(self, delay, callback, *args):
+        """
+        Schedule callback(*args) after a delay
+        :param delay: Seconds from now
+        :param callback: Callable to run
+        :return: ScheduledCall handle
+        """
+        return self.call_at(self.time() + delay, callback, *args)
+
+    def call_soon_threadsafe(self, callback, *args):
+        """
+        Schedule callback(*args) on the scheduler thread as soon as possible (safe from any thread)
+        :param callback: Callable to run
+        """
+        self._pending.append((callback, args))
+        self._wakeup.set()
+
+    def cancel(self, call):
+        """
+        Cancel a scheduled call (it is discarded when it reaches the top of the heap)
+        :param call: ScheduledCall handle
+        """
+        call.cancelled = True
+
+    def __len__(self):
+        return sum(1 for _, _, call in self._heap if not call.cancelled)
+
+    def stop(self):
+        """Stop run() after the current callback"""
+        self.running = False
+
+    def run(self):
+        """Run due callbacks until stop() is called or nothing is left to run"""
+        self.running = True
+        heap = self._heap
+        pending = self._pending
+        while self.running:
+            while pending:
+                callback, args = pending.popleft()
+                self.call_at(self.time(), callback, *args)
+            while heap and heap[0][2].cancelled:
+                heapq.heappop(heap)
+            if not heap:
+                break
+            deadline, _, call = heap[0]
+            now = self.time()
+            if deadline > now:
+                self._sleep(deadline - now)
+                continue
+            heapq.heappop(heap)
+            call.callback(*call.args)
+        self.running = False
+
+    def _sleep(self, seconds):
+        """Wait for the next deadline (or a call from another thread)"""
+        if self.clock.virtual:
+            self.clock.sleep(seconds)
+            return
+        self._wakeup.wait(min(seconds, MAX_SLEEP_SECONDS))
+        self._wakeup.clear()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Screen Geometry Module
+Index of the area random auto-move targets may land in: every monitor (minus an edge margin)
+with exclusion zones such as hot corners, taskbars and the pyautogui failsafe corner removed.
+
+The valid area is decomposed once into disjoint rectangles on a compressed coordinate grid, so
+membership is a grid lookup, a uniformly random valid point is an O(1) alias-table draw, and
+targets at a random distance from the pointer are rejection-sampled from the annulus.
+"""
+import math
+import random
+from bisect import bisect_right
+
+# Distance kept from every monitor edge (pixels)
+DEFAULT_MARGIN = 50
+# Side of the square excluded at each monitor corner (hot corners, pyautogui failsafe)
+DEFAULT_CORNER_SIZE = 100
+# Direct annulus draws tried before falling back to area-weighted sampling of the clipped region
+DIRECT_ATTEMPTS = 8
+CLIPPED_ATTEMPTS = 64
+
+
+def parse_rect(text):
+    """
+    Parse an 'x,y,width,height' rectangle (e.g. from the command line)
+    :param text: Rectangle string
+    :return: Tuple (x, y, width, height)
+    :raises ValueError: If the string is not four integers or the size is not positive
+    """
+    parts = text.split(',')
+    if len(parts) != 4:
+        raise ValueError(f"'{text}' is not x,y,width,height")
+    x, y, width, height = (int(part) for part in parts)
+    if width <= 0 or height <= 0:
+        raise ValueError(f"'{text}': width and height must be greater than 0")
+    return (x, y, width, height)
+
+
+def corner_exclusions(monitors, corner_size=DEFAULT_CORNER_SIZE):
+    """
+    Squares at the four corners of every monitor
+    :param monitors: List of (x, y, width, height) monitor rectangles
+    :param corner_size: Side of each square in pixels (0 = none)
+    :return: List of (x, y, width, height) rectangles
+    """
+    if corner_size <= 0:
+        return []
+    zones = []
+    for x, y, width, height in monitors:
+        right, bottom = x + width - corner_size, y + height - corner_size
+        zones.extend([(x, y, corner_size, corner_size), (right, y, corner_size, corner_size),
+                      (x, bottom, corner_size, corner_size), (right, bottom, corner_size, corner_size)])
+    return zones
+
+
+def build_alias_table(weights):
+    """
+    Vose alias table for O(1) weighted choice
+    :param weights: Non-negative weights (at least one positive)
+    :return: Tuple (probabilities, aliases)
+    """
+    n = len(weights)
+    total = float(sum(weights))
+    scaled = [w * n / total for w in weights]
+    probabilities = [1.0] * n
+    aliases = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        probabilities[s] = scaled[s]
+        aliases[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return probabilities, aliases
+
+
+class ScreenGeometry:
+    """Valid target area of a monitor layout"""
+
+    def __init__(self, monitors, exclusions=(), margin=DEFAULT_MARGIN, corner_size=DEFAULT_CORNER_SIZE):
+        """
+        Build the index
+        :param monitors: List of (x, y, width, height) monitor rectangles in global coordinates
+        :param exclusions: (x, y, width, height) rectangles targets must avoid (e.g. taskbars)
+        :param margin: Distance kept from every monitor edge
+        :param corner_size: Side of the square excluded at each monitor corner (0 = none)
+        :raises ValueError: If no valid area is left
+        """
+        if not monitors:
+            raise ValueError("Screen geometry needs at least one monitor")
+        self.monitors = list(monitors)
+        self.exclusions = list(exclusions) + corner_exclusions(self.monitors, corner_size)
+        self.margin = margin
+        self.corner_size = corner_size
+        self.bounds = (min(x for x, _, _, _ in self.monitors), min(y for _, y, _, _ in self.monitors),
+                       max(x + w for x, _, w, _ in self.monitors), max(y + h for _, y, _, h in self.monitors))
+
+        # Half-open (left, top, right, bottom) boxes
+        allowed = [(x + margin, y + margin, x + w - margin, y + h - margin) for x, y, w, h in self.monitors]
+        allowed = [box for box in allowed if box[0] < box[2] and box[1] < box[3]]
+        blocked = [(x, y, x + w, y + h) for x, y, w, h in self.exclusions]
+
+        # Compressed grid: every box edge is a breakpoint, so each cell is wholly valid or invalid
+        self._xs = sorted({edge for box in allowed + blocked for edge in (box[0], box[2])})
+        self._ys = sorted({edge for box in allowed + blocked for edge in (box[1], box[3])})
+        columns = max(0, len(self._xs) - 1)
+        self._columns = columns
+        self._valid = bytearray(columns * max(0, len(self._ys) - 1))
+        self.rects = []
+        for j in range(len(self._ys) - 1):
+            cy = (self._ys[j] + self._ys[j + 1]) / 2
+            run_start = None
+            for i in range(columns + 1):
+                valid = False
+                if i < columns:
+                    cx = (self._xs[i] + self._xs[i + 1]) / 2
+                    valid = (any(l <= cx < r and t <= cy < b for l, t, r, b in allowed) and
+                             not any(l <= cx < r and t <= cy < b for l, t, r, b in blocked))
+                    self._valid[j * columns + i] = valid
+                # Merge runs of valid cells in a row into one rectangle
+                if valid and run_start is None:
+                    run_start = i
+                elif not valid and run_start is not None:
+                    self.rects.append((self._xs[run_start], self._ys[j], self._xs[i], self._ys[j + 1]))
+                    run_start = None
+        if not self.rects:
+            raise ValueError("No valid target area left after margins and exclusions")
+
+        self.areas = [(r - l) * (b - t) for l, t, r, b in self.rects]
+        self.area = sum(self.areas)
+        self._probabilities, self._aliases = build_alias_table(self.areas)
+
+    @property
+    def size(self):
+        """Width and height of the bounding box of all monitors"""
+        left, top, right, bottom = self.bounds
+        return (right - left, bottom - top)
+
+    def contains(self, x, y):
+        """
+        Check if a point is a valid target
+        :param x: X coordinate
+        :param y: Y coordinate
+        :return: True if the point lies in the valid area
+        """
+        i = bisect_right(self._xs, x) - 1
+        j = bisect_right(self._ys, y) - 1
+        if i < 0 or j < 0 or i >= self._columns or j >= len(self._ys) - 1:
+            return False
+        return bool(self._valid[j * self._columns + i])
+
+    def _point_in(self, rect, rng):
+        left, top, right, bottom = rect
+        return (rng.randrange(left, right), rng.randrange(top, bottom))
+
+    def sample(self, rng=None):
+        """
+        Uniformly random valid point
+        :param rng: random.Random (default: the random module)
+        :return: Tuple (x, y)
+        """
+        rng = rng if rng is not None else random
+        i = int(rng.random() * len(self.rects))
+        if rng.random() >= self._probabilities[i]:
+            i = self._aliases[i]
+        return self._point_in(self.rects[i], rng)
+
+    def sample_annulus(self, center_x, center_y, min_distance, max_distance, rng=None):
+        """
+        Uniformly random valid point between min_distance and max_distance from a center.
+        Falls back to any valid point if the annulus does not reach the valid area.
+        :param center_x: X coordinate of the center (usually the pointer)
+        :param center_y: Y coordinate of the center
+        :param min_distance: Inner radius
+        :param max_distance: Outer radius
+        :param rng: random.Random (default: the random module)
+        :return: Tuple (x, y)
+        """
+        rng = rng if rng is not None else random
+        inner, outer = min_distance * min_distance, max_distance * max_distance
+
+        # Fast path: uniform by area over the annulus, keep the first draw that lands in the valid area
+        for _ in range(DIRECT_ATTEMPTS):
+            angle = rng.uniform(0, 2 * math.pi)
+            distance = math.sqrt(rng.uniform(inner, outer))
+            x = math.floor(center_x + distance * math.cos(angle))
+            y = math.floor(center_y + distance * math.sin(angle))
+            if self.contains(x, y):
+                return (x, y)
+
+        # Mostly off-screen annulus (pointer near an edge or exclusion): draw from the valid
+        # rectangles clipped to the annulus bounding box, weighted by clipped area
+        box_left, box_top = center_x - max_distance, center_y - max_distance
+        box_right, box_bottom = center_x + max_distance + 1, center_y + max_distance + 1
+        clipped = []
+        cumulative = []
+        total = 0
+        for left, top, right, bottom in self.rects:
+            rect = (max(left, math.floor(box_left)), max(top, math.floor(box_top)),
+                    min(right, math.ceil(box_right)), min(bottom, math.ceil(box_bottom)))
+            if rect[0] < rect[2] and rect[1] < rect[3]:
+                total += (rect[2] - rect[0]) * (rect[3] - rect[1])
+                clipped.append(rect)
+                cumulative.append(total)
+        if clipped:
+            for _ in range(CLIPPED_ATTEMPTS):
+                rect = clipped[bisect_right(cumulative, rng.random() * total)]
+                x, y = self._point_in(rect, rng)
+                if inner <= (x - center_x) ** 2 + (y - center_y) ** 2 <= outer:
+                    return (x, y)
+        return self.sample(rng)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Simulation Module
+Drives AutoMouseMover and its AlarmManager on a virtual clock through scripted manual/idle
+activity, so check, auto-move, alarm and ding policies can be followed over days of simulated
+time in milliseconds of real time.
+
+A schedule is a list of (activity, seconds) phases repeated until the simulated duration is
+reached. During 'manual' phases a simulated user moves the virtual pointer every few seconds;
+during 'idle' phases nobody touches it.
+"""
+import json
+import random
+import sys
+import time
+from adaptive_cadence import AdaptiveCadence
+from auto_mouse_mover import AutoMouseMover
+from clock import VirtualClock
+from metrics import REGISTRY
+from pointer_backend import VirtualPointerBackend
+from scheduler import Scheduler
+
+ACTIVITIES = ('manual', 'idle')
+# Seconds between simulated manual pointer movements
+DEFAULT_MANUAL_STEP_SECONDS = 10.0
+# Moves kept in the virtual pointer's history (the timeline is the record of a simulation)
+HISTORY_SIZE = 1000
+
+
+def parse_schedule(text):
+    """
+    Parse a schedule such as 'manual:60,idle:45' (durations in minutes)
+    :param text: Comma-separated activity:minutes phases
+    :return: List of (activity, seconds) tuples
+    :raises ValueError: If a phase is malformed
+    """
+    schedule = []
+    for part in text.split(','):
+        activity, sep, minutes = part.strip().partition(':')
+        if not sep:
+            raise ValueError(f"'{part}' is not activity:minutes")
+        try:
+            seconds = float(minutes) * 60
+        except ValueError:
+            raise ValueError(f"'{part}': '{minutes}' is not a number of minutes")
+        schedule.append((activity, seconds))
+    return validate_schedule(schedule)
+
+
+def validate_schedule(schedule):
+    """
+    Check a schedule
+    :param schedule: List of (activity, seconds) tuples
+    :return: The schedule as a list
+    :raises ValueError: If it is empty, names an unknown activity or has a non-positive duration
+    """
+    schedule = list(schedule)
+    if not schedule:
+        raise ValueError("Schedule needs at least one phase")
+    for activity, seconds in schedule:
+        if activity not in ACTIVITIES:
+            raise ValueError(f"Unknown activity '{activity}' (available: {', '.join(ACTIVITIES)})")
+        if seconds <= 0:
+            raise ValueError(f"Phase '{activity}' must last longer than 0 seconds")
+    return schedule
+
+
+def format_offset(seconds):
+    """
+    Format simulated time as day and time of day
+    :param seconds: Seconds since the start of the simulation
+    :return: String such as 'd1 03:25:00'
+    """
+    whole = int(seconds)
+    days, rest = divmod(whole, 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"d{days} {hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class _SimulatedMover(AutoMouseMover):
+    """AutoMouseMover that records checks, auto-moves, alarms and dings instead of playing sounds"""
+
+    def __init__(self, timeline, **kwargs):
+        super().__init__(install_signal_handlers=False, **kwargs)
+        self.timeline = timeline
+
+    def _record(self, event, **fields):
+        record = {'time': self.clock.monotonic(), 'event': event}
+        record.update(fields)
+        self.timeline.append(record)
+
+    def _record_alarm_changes(self, last_alarm_time, consecutive_auto_moves):
+        """Record an alarm and/or ding cycle that happened since the given alarm manager state"""
+        alarm = self.alarm_manager
+        if alarm.last_alarm_time is not None and alarm.last_alarm_time != last_alarm_time:
+            self._record('alarm', idle_seconds=round(alarm.last_alarm_time - alarm.last_manual_movement_time, 3))
+        if alarm.consecutive_auto_move_count > consecutive_auto_moves:
+            self._record('dings', count=min(alarm.consecutive_auto_move_count, alarm.max_ding_count),
+                         cycle=alarm.consecutive_auto_move_count)
+
+    def run_check(self, current_pos, scheduler=None):
+        moved = super().run_check(current_pos, scheduler)
+        self._record('check', check=self.check_count, moved=moved)
+        return moved
+
+    def _finish_auto_move(self):
+        alarm = self.alarm_manager
+        last_alarm_time, consecutive_auto_moves = alarm.last_alarm_time, alarm.consecutive_auto_move_count
+        super()._finish_auto_move()
+        self._record('auto_move', position=self.previous_pos)
+        self._record_alarm_changes(last_alarm_time, consecutive_auto_moves)
+
+    def _alarm_tick(self):
+        alarm = self.alarm_manager
+        last_alarm_time, consecutive_auto_moves = alarm.last_alarm_time, alarm.consecutive_auto_move_count
+        super()._alarm_tick()
+        self._record_alarm_changes(last_alarm_time, consecutive_auto_moves)
+
+    def _schedule_dings(self, count):
+        # Sounds are represented by the 'alarm' and 'dings' timeline records
+        pass
+
+
+class SimulationResult:
+    """Timeline and totals of one simulation run"""
+
+    def __init__(self, timeline, simulated_seconds, elapsed_seconds, samples):
+        """
+        :param timeline: List of record dictionaries ('time' in simulated seconds, 'event', fields)
+        :param simulated_seconds: Simulated duration
+        :param elapsed_seconds: Real time the run took
+        :param samples: Position samples taken
+        """
+        self.timeline = timeline
+        self.simulated_seconds = simulated_seconds
+        self.elapsed_seconds = elapsed_seconds
+        self.samples = samples
+
+    def events(self, *names):
+        """
+        Timeline records of the given event types
+        :param names: Event names ('phase', 'check', 'auto_move', 'alarm', 'dings')
+        :return: List of record dictionaries
+        """
+        return [record for record in self.timeline if record['event'] in names]
+
+    def totals(self):
+        """
+        Count what happened
+        :return: Dictionary of totals
+        """
+        checks = self.events('check')
+        dings = self.events('dings')
+        return {
+            'checks': len(checks),
+            'manual_checks': sum(1 for record in checks if record['moved']),
+            'auto_moves': len(self.events('auto_move')),
+            'alarms': len(self.events('alarm')),
+            'ding_cycles': len(dings),
+            'dings': sum(record['count'] for record in dings),
+            'max_dings': max((record['count'] for record in dings), default=0),
+            'samples': self.samples,
+        }
+
+    def summary(self):
+        """Short human readable summary"""
+        totals = self.totals()
+        speedup = self.simulated_seconds / self.elapsed_seconds if self.elapsed_seconds > 0 else float('inf')
+        return (f"Simulated {self.simulated_seconds / 3600:g}h in {self.elapsed_seconds * 1000:.1f}ms "
+                f"({speedup:,.0f}x): {totals['checks']} checks ({totals['manual_checks']} manual), "
+                f"{totals['auto_moves']} auto-moves, {totals['alarms']} alarms, "
+                f"{totals['dings']} dings in {totals['ding_cycles']} cycles (max {totals['max_dings']}), "
+                f"{totals['samples']} samples")
+
+
+class Simulation:
+    """Runs one AutoMouseMover through a scripted activity schedule on a virtual clock"""
+
+    def __init__(self, schedule, duration_seconds, check_interval_seconds=300, timeout_seconds=1800,
+                 delta_threshold=10, sample_rate=2.0, manual_step_seconds=DEFAULT_MANUAL_STEP_SECONDS,
+                 adaptive=False, seed=None):
+        """
+        Initialize the simulation
+        :param schedule: List of (activity, seconds) phases, repeated until duration_seconds
+        :param duration_seconds: Simulated time to run for
+        :param check_interval_seconds: Mover check interval
+        :param timeout_seconds: Alarm timeout
+        :param delta_threshold: Mover movement threshold in pixels
+        :param sample_rate: Position samples per second between checks
+        :param manual_step_seconds: Seconds between simulated pointer movements during 'manual' phases
+        :param adaptive: Run the mover with the default AdaptiveCadence
+        :param seed: Seed for the simulated user's movements
+        :raises ValueError: If the schedule or a duration is invalid
+        """
+        if duration_seconds <= 0:
+            raise ValueError("Simulation duration must be greater than 0")
+        if manual_step_seconds <= 0:
+            raise ValueError("Manual step must be greater than 0 seconds")
+        self.schedule = validate_schedule(schedule)
+        self.duration_seconds = duration_seconds
+        self.manual_step_seconds = manual_step_seconds
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock()
+        self.backend = VirtualPointerBackend(clock=self.clock, max_history=HISTORY_SIZE)
+        self.timeline = []
+        self.mover = _SimulatedMover(
+            self.timeline,
+            check_interval_seconds=check_interval_seconds,
+            delta_threshold=delta_threshold,
+            timeout_seconds=timeout_seconds,
+            backend=self.backend,
+            sample_rate=sample_rate,
+            name='simulation',
+            adaptive=AdaptiveCadence.for_mover(check_interval_seconds, sample_rate) if adaptive else None,
+            clock=self.clock
+        )
+        self.scheduler = Scheduler(self.clock)
+        self._step = max(1, delta_threshold * 3)
+
+    def _start_phase(self, activity, end):
+        self.timeline.append({'time': self.clock.monotonic(), 'event': 'phase', 'activity': activity,
+                              'seconds': end - self.clock.monotonic()})
+        if activity == 'manual':
+            self._manual_step(end)
+
+    def _manual_step(self, end):
+        """Move the virtual pointer like a user would and schedule the next movement of the phase"""
+        x, y = self.backend.position()
+        width, height = self.backend.size()
+        step = self._step
+        # Every movement covers at least step pixels; bounce off the screen edges
+        dx = self.rng.choice((-step, step))
+        if not 0 <= x + dx < width:
+            dx = -dx
+        dy = self.rng.randint(-step, step)
+        self.backend.move_to(x + dx, min(height - 1, max(0, y + dy)))
+        next_step = self.clock.monotonic() + self.manual_step_seconds
+        if next_step < end:
+            self.scheduler.call_at(next_step, self._manual_step, end)
+
+    def run(self):
+        """
+        Run the whole simulation
+        :return: SimulationResult
+        """
+        scheduler = self.scheduler
+        start = self.clock.monotonic()
+        end = start + self.duration_seconds
+        phase_start = start
+        while phase_start < end:
+            for activity, seconds in self.schedule:
+                if phase_start >= end:
+                    break
+                phase_end = min(end, phase_start + seconds)
+                scheduler.call_at(phase_start, self._start_phase, activity, phase_end)
+                phase_start = phase_end
+        scheduler.call_at(end, scheduler.stop)
+
+        mover = self.mover
+        started = time.perf_counter()
+        mover.begin_monitoring()
+        mover.attach(scheduler, None)
+        try:
+            scheduler.run()
+        finally:
+            mover.running = False
+            REGISTRY.unregister_collector(mover.status_metrics)
+        elapsed = time.perf_counter() - started
+        timeline = [dict(record, time=record['time'] - start) for record in self.timeline]
+        return SimulationResult(timeline, self.clock.monotonic() - start, elapsed, mover.sampler.total_samples)
+
+
+def main():
+    """Command line interface"""
+    import argparse
+    import event_log
+
+    parser = argparse.ArgumentParser(
+        description='Simulate the auto mouse mover on a virtual clock through scripted activity',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  # One working day: 2h active, 45 min away, repeated; alarms and dings shown
+  python simulation.py --schedule manual:120,idle:45 --hours 24
+
+  # A week with a 10-minute alarm timeout and 1-minute checks, every check and move listed
+  python simulation.py --schedule manual:30,idle:90 --days 7 --interval 1 --timeout 10 --show all
+
+  # Write the timeline as JSON lines for further analysis
+  python simulation.py --schedule manual:60,idle:60 --days 2 --jsonl timeline.jsonl --show none
+        '''
+    )
+    parser.add_argument('--schedule', '-s', default='manual:120,idle:60',
+                        help='Comma-separated activity:minutes phases (manual or idle), repeated '
+                             '(default: manual:120,idle:60)')
+    parser.add_argument('--hours', type=float, default=None, help='Simulated hours (default: 24)')
+    parser.add_argument('--days', type=float, default=None, help='Simulated days (alternative to --hours)')
+    parser.add_argument('--interval', '-i', type=float, default=5.0, help='Check interval in minutes (default: 5.0)')
+    parser.add_argument('--timeout', '-to', type=float, default=30.0, help='Alarm timeout in minutes (default: 30.0)')
+    parser.add_argument('--threshold', '-t', type=int, default=10, help='Movement threshold in pixels (default: 10)')
+    parser.add_argument('--sample-rate', '-sr', type=float, default=2.0,
+                        help='Position samples per second between checks (default: 2.0)')
+    parser.add_argument('--manual-step', type=float, default=DEFAULT_MANUAL_STEP_SECONDS,
+                        help=f'Seconds between simulated movements in manual phases '
+                             f'(default: {DEFAULT_MANUAL_STEP_SECONDS:g})')
+    parser.add_argument('--adaptive', action='store_true', help='Simulate the adaptive check/sample cadence')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for the simulated user movements')
+    parser.add_argument('--show', choices=('alarms', 'all', 'none'), default='alarms',
+                        help='Timeline records to print: phases/alarms/dings, everything, or only the summary '
+                             '(default: alarms)')
+    parser.add_argument('--jsonl', default=None, help='Write the full timeline to this JSONL file')
+    args = parser.parse_args()
+
+    if args.hours is not None and args.days is not None:
+        print("Error: Use either --hours or --days")
+        sys.exit(1)
+    hours = args.days * 24 if args.days is not None else (args.hours if args.hours is not None else 24.0)
+    if args.sample_rate <= 0:
+        print("Error: Sample rate must be greater than 0")
+        sys.exit(1)
+    if args.interval <= 0 or args.timeout <= 0:
+        print("Error: Interval and timeout must be greater than 0")
+        sys.exit(1)
+
+    try:
+        simulation = Simulation(parse_schedule(args.schedule), hours * 3600,
+                                check_interval_seconds=args.interval * 60, timeout_seconds=args.timeout * 60,
+                                delta_threshold=args.threshold, sample_rate=args.sample_rate,
+                                manual_step_seconds=args.manual_step, adaptive=args.adaptive, seed=args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # The timeline is the report; keep the mover's own check/move messages off the console
+    event_log.configure(console=False)
+    result = simulation.run()
+
+    shown = {'alarms': ('phase', 'alarm', 'dings'), 'all': ('phase', 'check', 'auto_move', 'alarm', 'dings'),
+             'none': ()}[args.show]
+    for record in result.timeline:
+        if record['event'] not in shown:
+            continue
+        if record['event'] == 'phase':
+            detail = f"{record['activity']} for {record['seconds'] / 60:g} min"
+        elif record['event'] == 'check':
+            detail = f"#{record['check']} {'manual movement' if record['moved'] else 'idle'}"
+        elif record['event'] == 'auto_move':
+            detail = f"to ({record['position'][0]}, {record['position'][1]})"
+        elif record['event'] == 'alarm':
+            detail = f"after {record['idle_seconds'] / 60:.1f} min without manual movement"
+        else:
+            detail = f"{record['count']} ding(s), cycle #{record['cycle']}"
+        print(f"{format_offset(record['time'])}  {record['event']:<9} {detail}")
+
+    if args.jsonl is not None:
+        try:
+            with open(args.jsonl, 'w', encoding='utf-8') as f:
+                for record in result.timeline:
+                    f.write(json.dumps(record) + '\n')
+        except OSError as e:
+            print(f"Error: Could not write timeline: {e}")
+            sys.exit(1)
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,83 +3,377 @@
 Sound Notification Module
 Cross-platform sound notification functionality
 """
-import sys
+import atexit
+import io
+import math
+import os
 import platform
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+from array import array
+import event_log
+from metrics import SOUND_FAILURES, SOUND_LATENCY
+
+# Format of the in-process ding tone
+SAMPLE_RATE = 11025
+DING_FREQUENCY = 880
+DING_SECONDS = 0.25
+
+# Seconds a backend that failed is skipped before it is probed again
+FAILED_BACKEND_RETRY_SECONDS = 60
+
+
+def render_ding_pcm(sample_rate=SAMPLE_RATE, frequency=DING_FREQUENCY, seconds=DING_SECONDS):
+    """
+    Render a short decaying sine ding
+    :param sample_rate: Samples per second
+    :param frequency: Tone frequency in Hz
+    :param seconds: Length of the tone in seconds
+    :return: Raw PCM bytes (signed 16-bit little endian, mono)
+    """
+    count = int(sample_rate * seconds)
+    step = 2 * math.pi * frequency / sample_rate
+    samples = array('h', (int(20000 * math.exp(-6.0 * i / count) * math.sin(step * i)) for i in range(count)))
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def pcm_to_wav(pcm, sample_rate=SAMPLE_RATE):
+    """
+    Wrap raw PCM in a WAV container
+    :param pcm: Raw PCM bytes (signed 16-bit little endian, mono)
+    :param sample_rate: Samples per second
+    :return: WAV file bytes
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class _PipePlayer:
+    """Long-lived player process fed raw PCM over stdin (one pipe write per sound)"""
+
+    plays_buffers = True
+
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+        self._process = None
+
+    def available(self):
+        return shutil.which(self.command[0]) is not None
+
+    def open(self):
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE,
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Players without a usable audio device exit right away
+        time.sleep(0.1)
+        if self._process.poll() is not None:
+            raise RuntimeError(f"{self.command[0]} exited with code {self._process.returncode}")
+
+    def play(self, pcm, wav):
+        if self._process is None or self._process.poll() is not None:
+            raise RuntimeError(f"{self.command[0]} is not running")
+        self._process.stdin.write(pcm)
+        self._process.stdin.flush()
+
+    def close(self):
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self._process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+
+
+class _CommandPlayer:
+    """One-shot command per sound (fallback when no streaming player works)"""
+
+    plays_buffers = False
+
+    def __init__(self, name, command):
+        self.name = name
+        self.command = command
+
+    def available(self):
+        if shutil.which(self.command[0]) is None:
+            return False
+        # Commands playing a system sound file need that file
+        return all(os.path.exists(arg) for arg in self.command[1:] if arg.startswith('/'))
+
+    def open(self):
+        pass
+
+    def play(self, pcm, wav):
+        subprocess.run(self.command, check=True, timeout=2,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def close(self):
+        pass
+
+
+class _WinsoundPlayer:
+    """In-process playback of the WAV buffer through winsound"""
+
+    name = 'winsound'
+    plays_buffers = True
+
+    def __init__(self):
+        self._winsound = None
+
+    def available(self):
+        try:
+            import winsound
+        except ImportError:
+            return False
+        self._winsound = winsound
+        return True
+
+    def open(self):
+        pass
+
+    def play(self, pcm, wav):
+        self._winsound.PlaySound(wav, self._winsound.SND_MEMORY)
+
+    def close(self):
+        pass
+
+
+class _BellPlayer:
+    """Last resort: ASCII bell on the terminal"""
+
+    name = 'bell'
+    plays_buffers = False
+
+    def available(self):
+        return True
+
+    def open(self):
+        pass
+
+    def play(self, pcm, wav):
+        print('\a', end='', flush=True)
+
+    def close(self):
+        pass
+
+
+def render_ding_sequence_pcm(ding_pcm, count, gap_seconds, sample_rate=SAMPLE_RATE):
+    """
+    Mix count dings into one PCM buffer, each ding starting gap_seconds after the previous one
+    :param ding_pcm: Raw PCM of a single ding
+    :param count: Number of dings
+    :param gap_seconds: Seconds between the starts of consecutive dings
+    :param sample_rate: Samples per second
+    :return: Raw PCM bytes
+    """
+    if count <= 0:
+        return b''
+    slot_bytes = 2 * int(sample_rate * gap_seconds)
+    silence = bytes(max(0, slot_bytes - len(ding_pcm)))
+    ding = ding_pcm[:slot_bytes] if slot_bytes else ding_pcm
+    return (ding + silence) * (count - 1) + ding_pcm
+
 
 class SoundNotifier:
     """Cross-platform sound notification"""
-    
-    def __init__(self):
+
+    def __init__(self, max_sequence_count=20):
+        """
+        Initialize the notifier
+        :param max_sequence_count: Largest ding count whose pre-mixed sequence is memoized
+        """
         self.platform = platform.system()
-    
+        self.max_sequence_count = max_sequence_count
+        self._player = None
+        self._failed_players = {}
+        self._pcm = render_ding_pcm()
+        self._wav = pcm_to_wav(self._pcm)
+        self._sequences = {}
+        atexit.register(self.close)
+
+    def _candidate_players(self):
+        """Players to try for this platform, best first"""
+        if self.platform == 'Windows':
+            return [_WinsoundPlayer(), _BellPlayer()]
+        if self.platform == 'Darwin':  # macOS
+            return [
+                _CommandPlayer('afplay', ['afplay', '/System/Library/Sounds/Glass.aiff']),
+                _CommandPlayer('say', ['say', '-v', 'Samantha', 'beep']),
+                _BellPlayer(),
+            ]
+        # Linux and other Unix-like systems
+        return [
+            _PipePlayer('aplay-stream', ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE',
+                                         '-r', str(SAMPLE_RATE), '-c', '1', '-']),
+            _PipePlayer('pacat-stream', ['pacat', '--playback', '--raw', '--format=s16le',
+                                         f'--rate={SAMPLE_RATE}', '--channels=1']),
+            _CommandPlayer('aplay', ['aplay', '/usr/share/sounds/alsa/Front_Left.wav']),
+            _CommandPlayer('paplay', ['paplay', '/usr/share/sounds/freedesktop/stereo/message.oga']),
+            _CommandPlayer('beep', ['beep']),  # Requires beep package
+            _BellPlayer(),
+        ]
+
+    def probe(self):
+        """
+        Select the first working sound backend and keep it for later notifications
+        :return: Name of the selected backend, or None if no backend is usable right now
+        """
+        if self._player is not None:
+            return self._player.name
+
+        now = time.monotonic()
+        for candidate in self._candidate_players():
+            failed_at = self._failed_players.get(candidate.name)
+            if failed_at is not None and now - failed_at < FAILED_BACKEND_RETRY_SECONDS:
+                continue
+            if not candidate.available():
+                continue
+            try:
+                candidate.open()
+            except Exception:
+                candidate.close()
+                self._failed_players[candidate.name] = now
+                continue
+            self._player = candidate
+            return candidate.name
+
+    @property
+    def backend_name(self):
+        """Name of the selected sound backend (None until probed)"""
+        return self._player.name if self._player is not None else None
+
     def play_notification(self):
         """
         Play a notification sound
         Returns True if sound was played successfully, False otherwise
         """
+        if self.probe() is None:
+            SOUND_FAILURES.inc()
+            return False
+        started = time.perf_counter()
         try:
-            if self.platform == 'Windows':
-                self._play_windows_sound()
-            elif self.platform == 'Darwin':  # macOS
-                self._play_macos_sound()
-            else:  # Linux and other Unix-like systems
-                self._play_linux_sound()
+            self._player.play(self._pcm, self._wav)
+            SOUND_LATENCY.observe(time.perf_counter() - started)
             return True
         except Exception as e:
-            print(f"Warning: Could not play sound: {e}")
+            SOUND_FAILURES.inc()
+            self._drop_player(e)
             return False
-    
-    def _play_windows_sound(self):
-        """Play sound on Windows"""
-        try:
-            import winsound
-            # Play system default beep
-            winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-        except (ImportError, AttributeError):
-            try:
-                # Fallback: try system beep
-                import winsound
-                winsound.Beep(1000, 500)  # Frequency 1000Hz, duration 500ms
-            except (ImportError, Exception):
-                # Last resort: ASCII bell
-                print('\a', end='', flush=True)
-    
-    def _play_macos_sound(self):
-        """Play sound on macOS"""
-        import subprocess
+
+    def render_ding_sequence(self, count, gap_seconds=1.0):
+        """
+        Get a pre-mixed ding sequence (memoized for counts up to max_sequence_count)
+        :param count: Number of dings
+        :param gap_seconds: Seconds between the starts of consecutive dings
+        :return: Tuple (pcm_bytes, wav_bytes)
+        """
+        key = (count, gap_seconds)
+        sequence = self._sequences.get(key)
+        if sequence is None:
+            pcm = render_ding_sequence_pcm(self._pcm, count, gap_seconds)
+            sequence = (pcm, pcm_to_wav(pcm))
+            if count <= self.max_sequence_count:
+                self._sequences[key] = sequence
+        return sequence
+
+    def play_ding_sequence(self, count, gap_seconds=1.0):
+        """
+        Play count dings spaced gap_seconds apart as a single playback
+        :param count: Number of dings
+        :param gap_seconds: Seconds between the starts of consecutive dings
+        :return: True if the sequence was played successfully, False otherwise
+        """
+        if count <= 0:
+            return True
+        if self.probe() is None:
+            SOUND_FAILURES.inc()
+            return False
+        player = self._player
+        started = time.perf_counter()
         try:
-            # Try using afplay with system sound
-            subprocess.run(['afplay', '/System/Library/Sounds/Glass.aiff'], 
-                         check=True, timeout=2, capture_output=True)
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            try:
-                # Fallback: use say command to make a beep sound
-                subprocess.run(['say', '-v', 'Samantha', 'beep'], 
-                             check=True, timeout=2, capture_output=True)
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                # Last resort: system beep
-                print('\a', end='', flush=True)  # ASCII bell character
-    
-    def _play_linux_sound(self):
-        """Play sound on Linux"""
-        import subprocess
-        import os
-        
-        # Try different sound commands
-        commands = [
-            ['aplay', '/usr/share/sounds/alsa/Front_Left.wav'],
-            ['paplay', '/usr/share/sounds/freedesktop/stereo/message.oga'],
-            ['beep'],  # Requires beep package
-        ]
-        
-        # Also try using Python's print bell as fallback
-        for cmd in commands:
-            try:
-                subprocess.run(cmd, check=True, timeout=2, 
-                             capture_output=True, stderr=subprocess.DEVNULL)
+            if player.plays_buffers:
+                pcm, wav = self.render_ding_sequence(count, gap_seconds)
+                player.play(pcm, wav)
+                SOUND_LATENCY.observe(time.perf_counter() - started)
+            else:
+                # Backend can only trigger single sounds - space them out here
+                for i in range(count):
+                    if i > 0:
+                        time.sleep(gap_seconds)
+                    player.play(self._pcm, self._wav)
+                    if i == 0:
+                        SOUND_LATENCY.observe(time.perf_counter() - started)
+            return True
+        except Exception as e:
+            SOUND_FAILURES.inc()
+            self._drop_player(e)
+            return False
+
+    def _drop_player(self, error):
+        """Forget a backend that failed; the next notification re-probes"""
+        if self._player is None:
+            return
+        event_log.emit('sound.error', f"Warning: Could not play sound ({self._player.name}): {error}",
+                       backend=self._player.name, error=str(error))
+        self._failed_players[self._player.name] = time.monotonic()
+        self._player.close()
+        self._player = None
+
+    def close(self):
+        """Stop any long-lived player process"""
+        if self._player is not None:
+            self._player.close()
+            self._player = None
+
+
+class SoundPlayerThread:
+    """Plays ding cycles on a background thread so schedulers never block on audio"""
+
+    def __init__(self, notifier):
+        """
+        Initialize the player thread
+        :param notifier: SoundNotifier to play through
+        """
+        self.notifier = notifier
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='sound-player', daemon=True)
+        self._thread.start()
+
+    def play(self, count, gap_seconds=1.0, session=None):
+        """
+        Queue a ding cycle
+        :param count: Number of dings
+        :param gap_seconds: Seconds between the starts of consecutive dings
+        :param session: Optional name of the session the cycle belongs to (for failure events)
+        """
+        self._requests.put((count, gap_seconds, session))
+
+    def stop(self):
+        """Stop the thread after queued cycles"""
+        self._requests.put(None)
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
                 return
-            except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                continue
-        
-        # Last resort: ASCII bell
-        print('\a', end='', flush=True)
+            count, gap_seconds, session = request
+            if not self.notifier.play_ding_sequence(count, gap_seconds):
+                prefix = f"[{session}] " if session else ""
+                event_log.emit('ding.failed', f"{prefix}   ✗ Failed to play {count} ding(s)",
+                               session=session, count=count)
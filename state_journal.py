@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+State Journal Module
+Append-only JSONL journal of small state records with batched fsync and compaction.
+
+Only the newest record matters, so restoring reads the tail of the file (constant time), a torn
+last line from a crash is skipped, and the file is compacted down to its newest record on open
+and every compact_after appends.
+"""
+import json
+import os
+import time
+
+DEFAULT_FSYNC_INTERVAL = 5.0
+DEFAULT_COMPACT_AFTER = 1000
+# Tail read size when looking for the newest complete record
+TAIL_BLOCK_SIZE = 4096
+
+
+def read_last_record(path):
+    """
+    Read the newest complete record of a journal
+    :param path: Journal file
+    :return: Record dictionary, or None if the file is missing or holds no complete record
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        tail = b''
+        while position > 0:
+            position = max(0, position - TAIL_BLOCK_SIZE)
+            f.seek(position)
+            tail = f.read(end - position)
+            # Skip the (possibly torn) text after the last newline, then try lines from the newest back
+            lines = tail.split(b'\n')
+            complete = lines[1:-1] if position > 0 else lines[:-1]
+            for line in reversed(complete):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    return record
+    return None
+
+
+class StateJournal:
+    """Append-only journal whose newest record is the current state"""
+
+    def __init__(self, path, fsync_interval=DEFAULT_FSYNC_INTERVAL, compact_after=DEFAULT_COMPACT_AFTER):
+        """
+        Open (or create) a journal
+        :param path: Journal file
+        :param fsync_interval: Longest time in seconds an appended record may wait for fsync (0 = every append)
+        :param compact_after: Appends between compactions
+        :raises OSError: If the file cannot be opened
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.compact_after = compact_after
+        self.last_record = read_last_record(path)
+        self.appends = 0
+        self.syncs = 0
+        self._file = None
+        self._dirty = False
+        self._last_sync = time.monotonic()
+        if self.last_record is not None:
+            self.compact()
+        else:
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def append(self, record):
+        """
+        Append a record (written to the OS right away, fsynced at most every fsync_interval seconds)
+        :param record: JSON-serializable dictionary
+        """
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.last_record = record
+        self.appends += 1
+        self._dirty = True
+        if time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        if self.appends % self.compact_after == 0:
+            self.compact()
+
+    def sync(self):
+        """Flush appended records to stable storage"""
+        if self._dirty:
+            os.fsync(self._file.fileno())
+            self.syncs += 1
+            self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def compact(self):
+        """Replace the journal with a file holding only the newest record (atomic rename)"""
+        if self._file is not None:
+            self._file.close()
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            if self.last_record is not None:
+                f.write(json.dumps(self.last_record, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        _sync_directory(os.path.dirname(os.path.abspath(self.path)))
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the journal"""
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+
+
+def _sync_directory(path):
+    """Persist a rename in a directory (not supported on every platform)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
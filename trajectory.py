@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Human-like Trajectory Module
+Origin-relative curved paths: cubic Bezier curves with randomized control points, a
+minimum-jerk velocity profile and a small overshoot that is corrected at the end.
+
+The Bezier basis weights for a step count are computed once and shared by every path
+with that step count, so building a path is three multiply-adds per point and a batch
+of thousands of paths reuses the same tables.
+"""
+import random
+from patterns import EASINGS, line_profile
+
+# Defaults for the shape of generated paths
+DEFAULT_CURVATURE = 0.25
+DEFAULT_OVERSHOOT = 0.04
+# Share of the steps spent correcting an overshoot
+CORRECTION_SHARE = 0.15
+
+
+def bezier_basis(steps):
+    """
+    Cubic Bezier weights of the three non-origin control points, sampled at minimum-jerk progress
+    :param steps: Number of steps along the curve
+    :return: List of steps + 1 (w1, w2, w3) tuples
+    """
+    minimum_jerk = EASINGS['minimum_jerk']
+    basis = []
+    for i in range(steps + 1):
+        s = minimum_jerk(i / steps)
+        u = 1 - s
+        basis.append((3 * u * u * s, 3 * u * s * s, s * s * s))
+    return basis
+
+
+def split_steps(steps, overshoot):
+    """
+    Split a step count between the main curve and the overshoot correction
+    :param steps: Total number of steps
+    :param overshoot: Overshoot fraction (0 = no correction)
+    :return: Tuple (curve_steps, correction_steps)
+    """
+    if overshoot <= 0 or steps < 8:
+        return steps, 0
+    correction_steps = max(2, int(steps * CORRECTION_SHARE))
+    return steps - correction_steps, correction_steps
+
+
+def random_controls(delta_x, delta_y, rng, curvature=DEFAULT_CURVATURE, overshoot=DEFAULT_OVERSHOOT):
+    """
+    Randomized control points of a curve from the origin to (delta_x, delta_y)
+    :param delta_x: X offset of the target
+    :param delta_y: Y offset of the target
+    :param rng: random.Random (or the random module)
+    :param curvature: Largest sideways control point offset as a fraction of the distance
+    :param overshoot: Largest overshoot past the target as a fraction of the distance
+    :return: Tuple (c1, c2, end) of (x, y) points; end is past the target when overshooting
+    """
+    # Unit perpendicular scaled by the distance is just the rotated delta
+    perp_x, perp_y = -delta_y, delta_x
+    c1_along = rng.uniform(0.2, 0.4)
+    c2_along = rng.uniform(0.6, 0.8)
+    c1_side = rng.uniform(-curvature, curvature)
+    c2_side = rng.uniform(-curvature, curvature)
+    c1 = (delta_x * c1_along + perp_x * c1_side, delta_y * c1_along + perp_y * c1_side)
+    c2 = (delta_x * c2_along + perp_x * c2_side, delta_y * c2_along + perp_y * c2_side)
+    if overshoot > 0:
+        past = 1 + rng.uniform(0.3, 1.0) * overshoot
+        side = rng.uniform(-0.5, 0.5) * overshoot
+        end = (delta_x * past + perp_x * side, delta_y * past + perp_y * side)
+    else:
+        end = (delta_x, delta_y)
+    return c1, c2, end
+
+
+def curve_offsets(basis, correction_profile, c1, c2, end, delta_x, delta_y):
+    """
+    Evaluate a curve (and its overshoot correction) from precomputed tables
+    :param basis: Table from bezier_basis
+    :param correction_profile: Progress fractions of the correction (empty for none)
+    :param c1: First control point
+    :param c2: Second control point
+    :param end: End point of the curve
+    :param delta_x: X offset of the target
+    :param delta_y: Y offset of the target
+    :return: List of (dx, dy) offsets ending exactly at the target
+    """
+    x1, y1 = c1
+    x2, y2 = c2
+    x3, y3 = end
+    offsets = [(int(w1 * x1 + w2 * x2 + w3 * x3), int(w1 * y1 + w2 * y2 + w3 * y3)) for w1, w2, w3 in basis]
+    if correction_profile:
+        back_x, back_y = delta_x - x3, delta_y - y3
+        offsets.extend((int(x3 + back_x * f), int(y3 + back_y * f)) for f in correction_profile[1:])
+    offsets[-1] = (int(delta_x), int(delta_y))
+    return offsets
+
+
+def human_offsets(delta_x, delta_y, steps=50, rng=None, curvature=DEFAULT_CURVATURE, overshoot=DEFAULT_OVERSHOOT,
+                  basis=None, correction_profile=None):
+    """
+    Human-like path from the origin to (delta_x, delta_y)
+    :param delta_x: X offset of the target
+    :param delta_y: Y offset of the target
+    :param steps: Number of steps along the path
+    :param rng: random.Random for reproducible paths (default: the random module)
+    :param curvature: Largest sideways bend as a fraction of the distance
+    :param overshoot: Largest overshoot past the target as a fraction of the distance (0 = none)
+    :param basis: Precomputed bezier_basis table for the curve steps (see split_steps)
+    :param correction_profile: Precomputed minimum-jerk profile for the correction steps
+    :return: List of steps + 1 (dx, dy) offsets
+    """
+    rng = rng if rng is not None else random
+    curve_steps, correction_steps = split_steps(steps, overshoot)
+    if basis is None:
+        basis = bezier_basis(curve_steps)
+    if correction_profile is None:
+        correction_profile = line_profile(correction_steps, 'minimum_jerk') if correction_steps else ()
+    c1, c2, end = random_controls(delta_x, delta_y, rng, curvature, overshoot if correction_steps else 0)
+    return curve_offsets(basis, correction_profile, c1, c2, end, delta_x, delta_y)
+
+
+def human_offsets_batch(deltas, steps=50, rng=None, curvature=DEFAULT_CURVATURE, overshoot=DEFAULT_OVERSHOOT):
+    """
+    Many human-like paths with the same step count; the basis tables are built once for the batch
+    :param deltas: Iterable of (delta_x, delta_y) targets
+    :param steps: Number of steps along each path
+    :param rng: random.Random for reproducible paths (default: the random module)
+    :param curvature: Largest sideways bend as a fraction of the distance
+    :param overshoot: Largest overshoot past the target as a fraction of the distance (0 = none)
+    :return: List of paths, each a list of steps + 1 (dx, dy) offsets
+    """
+    rng = rng if rng is not None else random
+    curve_steps, correction_steps = split_steps(steps, overshoot)
+    basis = bezier_basis(curve_steps)
+    correction_profile = line_profile(correction_steps, 'minimum_jerk') if correction_steps else ()
+    effective_overshoot = overshoot if correction_steps else 0
+    paths = []
+    for delta_x, delta_y in deltas:
+        c1, c2, end = random_controls(delta_x, delta_y, rng, curvature, effective_overshoot)
+        paths.append(curve_offsets(basis, correction_profile, c1, c2, end, delta_x, delta_y))
+    return paths
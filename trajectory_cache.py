@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Trajectory Cache Module
+Bounded LRU cache of origin-relative pattern paths
+"""
+from collections import OrderedDict
+from patterns import circle_offsets, figure_eight_offsets, line_profile, scale_profile, square_offsets
+from trajectory import DEFAULT_CURVATURE, DEFAULT_OVERSHOOT, bezier_basis, human_offsets, split_steps
+
+
+class TrajectoryCache:
+    """LRU cache of origin-relative paths keyed by pattern parameters"""
+
+    def __init__(self, maxsize=128):
+        """
+        Initialize the cache
+        :param maxsize: Maximum number of cached paths
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory):
+        """
+        Get a cached path, computing it on a miss
+        :param key: Hashable pattern key, e.g. ('circle', radius, steps)
+        :param factory: Callable returning the path when it is not cached
+        :return: Tuple of (dx, dy) offsets
+        """
+        entries = self._entries
+        try:
+            path = entries[key]
+        except KeyError:
+            self.misses += 1
+            path = tuple(factory())
+            entries[key] = path
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self.evictions += 1
+            return path
+        self.hits += 1
+        entries.move_to_end(key)
+        return path
+
+    def circle(self, radius, steps=36):
+        """
+        Cached circle_offsets
+        :param radius: Radius of the circle
+        :param steps: Number of steps to complete the circle
+        :return: Tuple of (dx, dy) offsets
+        """
+        return self.get(('circle', radius, steps), lambda: circle_offsets(radius, steps))
+
+    def square(self, side_length, steps_per_side=1):
+        """
+        Cached square_offsets
+        :param side_length: Length of each side
+        :param steps_per_side: Number of steps along each side
+        :return: Tuple of (dx, dy) offsets
+        """
+        return self.get(('square', side_length, steps_per_side),
+                        lambda: square_offsets(side_length, steps_per_side))
+
+    def figure_eight(self, radius, steps_per_half=36):
+        """
+        Cached figure_eight_offsets
+        :param radius: Radius of each half circle
+        :param steps_per_half: Number of steps for each half circle
+        :return: Tuple of (dx, dy) offsets
+        """
+        return self.get(('figure_eight', radius, steps_per_half),
+                        lambda: figure_eight_offsets(radius, steps_per_half))
+
+    def line(self, delta_x, delta_y, steps=50, easing='linear'):
+        """
+        Line offsets built from a cached progress profile. Only the profile is
+        cached because line end points (e.g. random auto-move targets) rarely repeat.
+        :param delta_x: X offset of the end point
+        :param delta_y: Y offset of the end point
+        :param steps: Number of steps along the line
+        :param easing: Name of the easing function
+        :return: List of (dx, dy) offsets
+        """
+        profile = self.get(('line', steps, easing), lambda: line_profile(steps, easing))
+        return scale_profile(profile, delta_x, delta_y)
+
+    def human(self, delta_x, delta_y, steps=50, rng=None, curvature=DEFAULT_CURVATURE, overshoot=DEFAULT_OVERSHOOT):
+        """
+        Human-like curved path built from cached basis tables. Like lines, only the
+        tables are cached; every call draws new random control points.
+        :param delta_x: X offset of the end point
+        :param delta_y: Y offset of the end point
+        :param steps: Number of steps along the path
+        :param rng: random.Random for reproducible paths (default: the random module)
+        :param curvature: Largest sideways bend as a fraction of the distance
+        :param overshoot: Largest overshoot past the target as a fraction of the distance
+        :return: List of (dx, dy) offsets
+        """
+        curve_steps, correction_steps = split_steps(steps, overshoot)
+        basis = self.get(('bezier_basis', curve_steps), lambda: bezier_basis(curve_steps))
+        correction_profile = (self.get(('line', correction_steps, 'minimum_jerk'),
+                                       lambda: line_profile(correction_steps, 'minimum_jerk'))
+                              if correction_steps else ())
+        return human_offsets(delta_x, delta_y, steps, rng, curvature, overshoot, basis, correction_profile)
+
+    def clear(self):
+        """Drop all cached paths (counters are kept)"""
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Get cache counters
+        :return: Dictionary with cache statistics
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Cache shared by every mover in the process unless one is passed explicitly
+default_cache = TrajectoryCache()